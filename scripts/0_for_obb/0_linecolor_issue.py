@@ -1,8 +1,14 @@
 # input: 2_raw_json
 # output: 3_new_raw_json
 import os
+import sys
 import json
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dataset_manifest import DatasetManifest, manifest_path_for
+from labelme_io import load_labelme
+from labelme_transforms import strip_colors
+
 # JSON 파일이 저장된 디렉터리 경로
 json_dir = '../dataset2/2_raw_json'
 
@@ -10,31 +16,35 @@ json_dir = '../dataset2/2_raw_json'
 output_dir = '../dataset2/2_raw_json'
 os.makedirs(output_dir, exist_ok=True)
 
+# 변경된 파일만 다시 처리하기 위한 매니페스트 (False면 매번 전체 처리)
+INCREMENTAL = True
+manifest = DatasetManifest(manifest_path_for(output_dir), params={"step": "0_linecolor_issue"}) if INCREMENTAL else None
+
 # 변환된 파일 수 카운트
 converted_count = 0
+skipped_count = 0
+
+json_files = [f for f in os.listdir(json_dir) if f.endswith('.json')]
 
-for filename in os.listdir(json_dir):
+for filename in json_files:
     if filename.endswith('.json'):
         filepath = os.path.join(json_dir, filename)
+        output_filepath = os.path.join(output_dir, filename)
+        if manifest and manifest.is_fresh(filename, [filepath], [output_filepath]):
+            skipped_count += 1
+            continue
         try:
-            with open(filepath, 'r', encoding='utf-8') as file:
-                data = json.load(file)
+            # imageData는 스트리밍 리더가 디코딩 없이 건너뛰므로 결과에 포함되지 않는다
+            data = load_labelme(filepath)
             
-            # 불필요한 필드 제거
-            data.pop('lineColor', None)
-            data.pop('fillColor', None)
-            data.pop('imageData', None)  # 필요에 따라 제거
-            
-            # 'shapes' 내의 각 객체에서 불필요한 필드 제거
-            for shape in data.get('shapes', []):
-                shape.pop('lineColor', None)
-                shape.pop('fillColor', None)
-                shape.pop('flags', None)  # 필요에 따라 제거
+            # 불필요한 필드 제거 (최상위 및 'shapes' 내의 각 객체)
+            strip_colors(data)
             
             # 변환된 JSON 파일 저장
-            output_filepath = os.path.join(output_dir, filename)
             with open(output_filepath, 'w', encoding='utf-8') as file:
                 json.dump(data, file, indent=4)
+            if manifest:
+                manifest.record(filename, [filepath], [output_filepath])
             
             print(f"✅ {filename} 변환 완료")
             converted_count += 1
@@ -44,4 +54,9 @@ for filename in os.listdir(json_dir):
         except Exception as e:
             print(f"❌ 오류 발생: {filename} - {e}")
 
+if manifest:
+    removed = manifest.prune(json_files)
+    manifest.save()
+    print(f"\nℹ️ 변경 없음 {skipped_count}개 건너뜀, 삭제된 입력 {len(removed)}개 정리")
+
 print(f"\n✅ 총 {converted_count}개의 JSON 파일이 변환되었습니다.")
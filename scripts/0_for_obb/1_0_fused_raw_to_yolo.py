@@ -0,0 +1,147 @@
+# input: 2_raw_json / 1_images
+# output: 1_2_800images, 4_800labels (중간 JSON은 INTERMEDIATE_JSON_DIR를 지정한 경우에만)
+# 0_linecolor_issue → 1_1_convert_to_one_class → (t1_poly_to_rect) → 1_2_convert_json_to_yolo 를
+# JSON 한 번 파싱한 데이터에 메모리 내 변환으로 이어서 적용하는 통합 실행 스크립트
+import os
+import sys
+import json
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from batch_runner import find_image_file, select_pending, run_tasks, report_failures
+from dataset_manifest import DatasetManifest, manifest_path_for
+from image_resize import open_resized
+from labelme_io import load_labelme
+from labelme_transforms import (
+    COMPONENT_CLASSES, COMPONENT_CLASS_NAME, strip_colors, to_one_class, polygons_to_rectangles
+)
+from yolo_labels import write_obb_labels
+
+# 원본 해상도 (JSON에 imageWidth/imageHeight가 없을 때 사용)
+ORIGINAL_WIDTH = 3904
+ORIGINAL_HEIGHT = 3904
+
+# 목표 해상도
+TARGET_WIDTH = 800
+TARGET_HEIGHT = 800
+
+# 빠른 축소 모드 (1_2_convert_json_to_yolo 와 동일한 의미)
+FAST_DOWNSCALE = False
+DOWNSCALE_OVERSAMPLE = 1
+
+# 클래스 설정
+CLASSES_TO_KEEP = COMPONENT_CLASSES
+NEW_CLASS_NAME = COMPONENT_CLASS_NAME
+CLASS_NAMES = {
+    NEW_CLASS_NAME: 0,
+}
+
+# polygon → rectangle 변환 (t1_poly_to_rect) 적용 여부
+POLY_TO_RECT = False
+
+# 디렉토리 설정
+RAW_JSON_DIR = '/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset2/2_raw_json'
+IMAGE_INPUT_DIR = '/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset2/1_images'
+IMAGE_OUTPUT_DIR = '/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset2/1_2_800images'
+LABEL_OUTPUT_DIR = '/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset2/4_800labels'
+
+# 변환을 마친 labelme JSON을 저장할 디렉토리 (None이면 저장하지 않음, 기존 3_new_raw_json에 해당)
+INTERMEDIATE_JSON_DIR = None
+
+# 병렬 처리 워커 수 / 증분 빌드
+NUM_WORKERS = os.cpu_count() or 1
+INCREMENTAL = True
+MANIFEST_PATH = manifest_path_for(LABEL_OUTPUT_DIR) + '.fused'
+
+os.makedirs(IMAGE_OUTPUT_DIR, exist_ok=True)
+os.makedirs(LABEL_OUTPUT_DIR, exist_ok=True)
+if INTERMEDIATE_JSON_DIR:
+    os.makedirs(INTERMEDIATE_JSON_DIR, exist_ok=True)
+
+def output_paths(base_name, image_file):
+    outputs = [
+        os.path.join(IMAGE_OUTPUT_DIR, os.path.basename(image_file)),
+        os.path.join(LABEL_OUTPUT_DIR, base_name + ".txt"),
+    ]
+    if INTERMEDIATE_JSON_DIR:
+        outputs.append(os.path.join(INTERMEDIATE_JSON_DIR, base_name + ".json"))
+    return outputs
+
+def pipeline_params():
+    return {
+        "ORIGINAL_WIDTH": ORIGINAL_WIDTH,
+        "ORIGINAL_HEIGHT": ORIGINAL_HEIGHT,
+        "TARGET_WIDTH": TARGET_WIDTH,
+        "TARGET_HEIGHT": TARGET_HEIGHT,
+        "FAST_DOWNSCALE": FAST_DOWNSCALE,
+        "DOWNSCALE_OVERSAMPLE": DOWNSCALE_OVERSAMPLE,
+        "CLASSES_TO_KEEP": CLASSES_TO_KEEP,
+        "NEW_CLASS_NAME": NEW_CLASS_NAME,
+        "CLASS_NAMES": CLASS_NAMES,
+        "POLY_TO_RECT": POLY_TO_RECT,
+        "INTERMEDIATE_JSON_DIR": INTERMEDIATE_JSON_DIR,
+    }
+
+def transform(data):
+    """원본 labelme dict에 각 단계 변환을 순서대로 적용한다."""
+    strip_colors(data)
+    to_one_class(data, CLASSES_TO_KEEP, NEW_CLASS_NAME)
+    if POLY_TO_RECT:
+        polygons_to_rectangles(data)
+    return data
+
+def process(json_path):
+    base_name = os.path.splitext(os.path.basename(json_path))[0]
+    image_file = find_image_file(IMAGE_INPUT_DIR, base_name)
+    if not image_file:
+        print(f"⚠️ 이미지가 없습니다: {base_name}")
+        return False
+
+    # 한 번만 파싱 (imageData는 읽지 않음)
+    data = transform(load_labelme(json_path))
+    resized_image_path, label_path = output_paths(base_name, image_file)[:2]
+
+    try:
+        img_resized = open_resized(
+            image_file, (TARGET_WIDTH, TARGET_HEIGHT),
+            fast=FAST_DOWNSCALE, oversample=DOWNSCALE_OVERSAMPLE
+        )
+    except Exception as e:
+        print(f"❌ 이미지 리사이즈 실패: {image_file}\n{e}")
+        return False
+    img_resized.save(resized_image_path)
+
+    # 중간 JSON은 리사이즈가 성공한 뒤에만 남긴다 (실패한 쌍의 JSON이 남지 않게)
+    if INTERMEDIATE_JSON_DIR:
+        with open(os.path.join(INTERMEDIATE_JSON_DIR, base_name + ".json"), 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+
+    image_width = data.get('imageWidth', ORIGINAL_WIDTH)
+    image_height = data.get('imageHeight', ORIGINAL_HEIGHT)
+    write_obb_labels(label_path, data.get('shapes', []), CLASS_NAMES, image_width, image_height, source=json_path)
+
+    print(f"✅ 변환 완료: {json_path} → {label_path}, 이미지 리사이즈 완료")
+    return True
+
+def main(num_workers=NUM_WORKERS, incremental=INCREMENTAL):
+    json_paths = [os.path.join(RAW_JSON_DIR, f) for f in os.listdir(RAW_JSON_DIR) if f.endswith(".json")]
+    if not json_paths:
+        print("❗ JSON 파일이 없습니다.")
+        return
+
+    manifest = DatasetManifest(MANIFEST_PATH, params=pipeline_params()) if incremental else None
+    records = None
+    if manifest:
+        json_paths, pairs = select_pending(json_paths, IMAGE_INPUT_DIR, manifest, output_paths)
+        records = [
+            [(manifest, pairs[p][0], [p, pairs[p][1]], output_paths(*pairs[p]))] if p in pairs else []
+            for p in json_paths
+        ]
+
+    print(f"🚀 {len(json_paths)}개 파일 처리 시작 (워커 {max(num_workers, 1)}개)")
+    failures = run_tasks(process, json_paths, num_workers, records, [manifest] if manifest else ())
+    report_failures([{"json": f["task"], "error": f["error"]} for f in failures])
+
+    print("✅ 통합 변환을 완료했습니다.")
+
+if __name__ == "__main__":
+    main()
@@ -1,42 +1,57 @@
 # input: 2_raw_json
 # output: 3_new_raw_json
 import os
+import sys
 import json
 
-def process_json_files(input_folder, output_folder, classes_to_keep, new_class_name):
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dataset_manifest import DatasetManifest, manifest_path_for
+from labelme_io import load_labelme
+from labelme_transforms import COMPONENT_CLASSES, COMPONENT_CLASS_NAME, to_one_class
+
+def process_json_files(input_folder, output_folder, classes_to_keep, new_class_name, incremental=True):
     if not os.path.exists(output_folder):
         os.makedirs(output_folder)
 
-    for filename in os.listdir(input_folder):
+    # 클래스 설정이 바뀌면 매니페스트가 무효화되어 전체를 다시 처리한다
+    manifest = None
+    if incremental:
+        manifest = DatasetManifest(
+            manifest_path_for(output_folder),
+            params={"classes_to_keep": classes_to_keep, "new_class_name": new_class_name},
+        )
+
+    json_files = [f for f in os.listdir(input_folder) if f.endswith(".json")]
+    skipped_count = 0
+
+    for filename in json_files:
         if filename.endswith(".json"):
             file_path = os.path.join(input_folder, filename)
-            with open(file_path, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-            
-            new_shapes = []
-            for shape in data.get("shapes", []):
-                label = shape["label"]
-                
-                # 원하는 클래스만 남기기
-                if label in classes_to_keep:
-                    # 모든 남은 클래스의 이름을 하나로 변경
-                    shape["label"] = new_class_name
-                    new_shapes.append(shape)
+            output_file_path = os.path.join(output_folder, filename)
+            if manifest and manifest.is_fresh(filename, [file_path], [output_file_path]):
+                skipped_count += 1
+                continue
+            # imageData(base64)는 읽지 않는다 (0_linecolor_issue 단계에서 이미 제거됨)
+            data = load_labelme(file_path)
             
-            data["shapes"] = new_shapes
+            # 원하는 클래스만 남기고, 모든 남은 클래스의 이름을 하나로 변경
+            to_one_class(data, classes_to_keep, new_class_name)
 
             # 변경된 JSON을 출력 폴더에 저장
-            output_file_path = os.path.join(output_folder, filename)
             with open(output_file_path, 'w', encoding='utf-8') as output_file:
                 json.dump(data, output_file, indent=4, ensure_ascii=False)
+            if manifest:
+                manifest.record(filename, [file_path], [output_file_path])
+
+    if manifest:
+        removed = manifest.prune(json_files)
+        manifest.save()
+        print(f"ℹ️ 변경 없음 {skipped_count}개 건너뜀, 삭제된 입력 {len(removed)}개 정리")
 
 # 사용 예제
 input_folder = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset2/2_raw_json"  # JSON 파일들이 담긴 폴더 경로
 output_folder = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset2/3_new_raw_json"  # 수정된 JSON 파일들을 저장할 폴더 경로
-classes_to_keep = {"AL-Capacitor", "BGA", "C-chip", "Crystal", "DPAK", "Inductor",
-    "L-chip", "LED", "MELF", "PLCC(Square)", "QFN(Rectangular)", "QFN(Square)",
-    "QFP(Square)", "R-chip", "ResistorsChipArray", "SOD", "SOIC", "SON", "SOP",
-    "SOT", "TSOP", "Tantalum", "CMounting","Chip","Array","4sideIC","2sideIC","Circle"}  # 남기고 싶은 클래스들
-new_class_name = "component"
+classes_to_keep = COMPONENT_CLASSES  # 남기고 싶은 클래스들
+new_class_name = COMPONENT_CLASS_NAME
 
 process_json_files(input_folder, output_folder, classes_to_keep, new_class_name)
@@ -1,8 +1,14 @@
 # input: 3_new_raw_json / 1_images
 # output: 1_2_800images, 4_800labels
 import os
-import json
-from PIL import Image
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from batch_runner import find_image_file, select_pending, run_tasks, report_failures
+from dataset_manifest import DatasetManifest, manifest_path_for
+from image_resize import open_resized
+from labelme_io import load_labelme, SHAPE_FIELDS
+from yolo_labels import write_obb_labels
 
 # 원본 해상도
 ORIGINAL_WIDTH = 3904
@@ -12,6 +18,12 @@ ORIGINAL_HEIGHT = 3904
 TARGET_WIDTH = 800
 TARGET_HEIGHT = 800
 
+# 빠른 축소 모드: JPEG를 DCT 축소(1/2, 1/4) 디코딩한 뒤 LANCZOS로 마무리
+# False이면 기존처럼 전체 해상도를 디코딩한다 (결과 이미지가 기존과 바이트 단위로 동일)
+FAST_DOWNSCALE = False
+# DCT 축소 후 남겨 둘 최소 배율 (1: 3904→976(1/4), 2: 3904→1952(1/2))
+DOWNSCALE_OVERSAMPLE = 1
+
 # 클래스 매핑 (YOLO 형식은 숫자 클래스 ID를 사용함)
 CLASS_NAMES = {
     'component': 0,
@@ -23,35 +35,60 @@ IMAGE_INPUT_DIR = '/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset2/1_images'
 IMAGE_OUTPUT_DIR = '/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset2/1_2_800images'
 LABEL_OUTPUT_DIR = '/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset2/4_800labels'
 
+# 병렬 처리 워커 수 (1 이하이면 기존처럼 한 파일씩 순차 처리)
+NUM_WORKERS = os.cpu_count() or 1
+
+# 파일별 오류 리포트(JSON) 저장 경로 (None이면 화면에만 출력)
+ERROR_REPORT_PATH = None
+
+# 증분 빌드: 바뀐 JSON/이미지 쌍만 다시 변환하고, 사라진 쌍의 산출물은 삭제한다
+INCREMENTAL = True
+MANIFEST_PATH = manifest_path_for(LABEL_OUTPUT_DIR)
+
 # 출력 디렉토리 생성
 os.makedirs(IMAGE_OUTPUT_DIR, exist_ok=True)
 os.makedirs(LABEL_OUTPUT_DIR, exist_ok=True)
 
+def output_paths(base_name, image_file):
+    """리사이즈 이미지와 라벨 파일의 출력 경로"""
+    return [
+        os.path.join(IMAGE_OUTPUT_DIR, os.path.basename(image_file)),
+        os.path.join(LABEL_OUTPUT_DIR, base_name + ".txt"),
+    ]
+
+def conversion_params():
+    # 이 값들이 바뀌면 모든 산출물이 달라지므로 매니페스트가 무효화된다
+    return {
+        "ORIGINAL_WIDTH": ORIGINAL_WIDTH,
+        "ORIGINAL_HEIGHT": ORIGINAL_HEIGHT,
+        "TARGET_WIDTH": TARGET_WIDTH,
+        "TARGET_HEIGHT": TARGET_HEIGHT,
+        "CLASS_NAMES": CLASS_NAMES,
+        "FAST_DOWNSCALE": FAST_DOWNSCALE,
+        "DOWNSCALE_OVERSAMPLE": DOWNSCALE_OVERSAMPLE,
+    }
+
 def convert_and_resize(json_path):
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # 라벨 변환에는 shapes와 원본 크기만 필요하다 (imageData는 건너뜀)
+    data = load_labelme(json_path, fields=SHAPE_FIELDS)
     
     # JSON 파일명으로부터 이미지명 추론
     base_name = os.path.splitext(os.path.basename(json_path))[0]
-    # 확장자는 사용자가 jpg, png 등 다양할 수 있으므로 뒤에서 찾는다
-    image_file = None
-    for ext in ['.jpg', '.png', '.jpeg']:
-        candidate = os.path.join(IMAGE_INPUT_DIR, base_name + ext)
-        if os.path.exists(candidate):
-            image_file = candidate
-            break
+    image_file = find_image_file(IMAGE_INPUT_DIR, base_name)
     
     if not image_file:
         print(f"⚠️ 이미지가 없습니다: {base_name}")
-        return
+        return False
     
     # 이미지 로드 후 리사이즈
     try:
-        img = Image.open(image_file)
-        img_resized = img.resize((TARGET_WIDTH, TARGET_HEIGHT), Image.LANCZOS)
+        img_resized = open_resized(
+            image_file, (TARGET_WIDTH, TARGET_HEIGHT),
+            fast=FAST_DOWNSCALE, oversample=DOWNSCALE_OVERSAMPLE
+        )
     except Exception as e:
         print(f"❌ 이미지 리사이즈 실패: {image_file}\n{e}")
-        return
+        return False
     
     # 리사이즈된 이미지 저장 (이름은 원본과 동일, 경로만 변경)
     resized_image_path = os.path.join(IMAGE_OUTPUT_DIR, os.path.basename(image_file))
@@ -65,53 +102,35 @@ def convert_and_resize(json_path):
     image_height = data.get('imageHeight', ORIGINAL_HEIGHT)
     
     # 라벨 파일 생성
-    with open(label_path, 'w', encoding='utf-8') as out_f:
-        for shape in data.get('shapes', []):
-            label = shape.get('label', 'unknown')
-            points = shape.get('points', [])
-
-            if label not in CLASS_NAMES:
-                print(f"⚠️ 알 수 없는 라벨: '{label}' → {json_path}, 스킵")
-                continue
-            class_id = CLASS_NAMES[label]
-
-            # 좌표 정규화 (0..1)
-            if len(points) == 4:  # 꼭짓점 4개 → OBB
-                x_coords = [p[0] / image_width for p in points]
-                y_coords = [p[1] / image_height for p in points]
-                out_f.write(
-                    f"{class_id} " +
-                    " ".join([f"{x:.6f} {y:.6f}" for x, y in zip(x_coords, y_coords)]) + "\n"
-                )
-            elif len(points) == 2:  # 두 점만 있는 경우 → 사각형
-                x1, y1 = points[0]
-                x2, y2 = points[1]
-                rect_points = [
-                    [x1 / image_width, y1 / image_height],  # 좌상단
-                    [x2 / image_width, y1 / image_height],  # 우상단
-                    [x2 / image_width, y2 / image_height],  # 우하단
-                    [x1 / image_width, y2 / image_height],  # 좌하단
-                ]
-                out_f.write(
-                    f"{class_id} " +
-                    " ".join([f"{p[0]:.6f} {p[1]:.6f}" for p in rect_points]) + "\n"
-                )
-            else:
-                print(f"❌ 지원하지 않는 도형 (points = {len(points)}개): {json_path}, 스킵")
-                continue
+    write_obb_labels(label_path, data.get('shapes', []), CLASS_NAMES, image_width, image_height, source=json_path)
     
     print(f"✅ 변환 완료: {json_path} → {label_path}, 이미지 리사이즈 완료")
+    return True
 
-def main():
+def main(num_workers=NUM_WORKERS, incremental=INCREMENTAL):
     # 모든 JSON 파일 순회
     json_files = [f for f in os.listdir(JSON_INPUT_DIR) if f.endswith(".json")]
     if not json_files:
         print("❗ JSON 파일이 없습니다.")
         return
     
-    for json_file in json_files:
-        json_path = os.path.join(JSON_INPUT_DIR, json_file)
-        convert_and_resize(json_path)
+    json_paths = [os.path.join(JSON_INPUT_DIR, f) for f in json_files]
+
+    # 매니페스트와 비교해 바뀌었거나 새로 생긴 쌍만 남긴다
+    manifest = DatasetManifest(MANIFEST_PATH, params=conversion_params()) if incremental else None
+    records = None
+    if manifest:
+        json_paths, pairs = select_pending(json_paths, IMAGE_INPUT_DIR, manifest, output_paths)
+        records = [
+            [(manifest, pairs[p][0], [p, pairs[p][1]], output_paths(*pairs[p]))] if p in pairs else []
+            for p in json_paths
+        ]
+
+    print(f"🚀 {len(json_paths)}개 파일 변환 시작 (워커 {max(num_workers, 1)}개)")
+    failures = run_tasks(convert_and_resize, json_paths, num_workers, records, [manifest] if manifest else ())
+
+    # 파일별 오류 리포트
+    report_failures([{"json": f["task"], "error": f["error"]} for f in failures], ERROR_REPORT_PATH)
 
     print("✅ 모든 변환 및 리사이즈를 완료했습니다.")
 
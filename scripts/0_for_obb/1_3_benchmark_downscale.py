@@ -0,0 +1,78 @@
+# input: 1_images (원본 3904 JPEG)
+# output: 이미지별 시간 / 최대 메모리 / 기존 방식 대비 픽셀 차이 표
+# 전체 디코딩 + LANCZOS(기존) 와 DCT 축소 디코딩 + LANCZOS(FAST_DOWNSCALE) 비교
+import os
+import sys
+import time
+import resource
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from image_resize import open_resized
+
+IMAGE_DIR = '/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset2/1_images'
+TARGET_SIZE = (800, 800)
+NUM_IMAGES = 20  # 측정할 이미지 수 (None이면 전체)
+
+# (이름, fast, oversample) - 첫 항목이 기준(기존 방식)
+MODES = [
+    ("full", False, 1),
+    ("draft 1/2", True, 2),
+    ("draft 1/4", True, 1),
+]
+
+def _measure(image_path, fast, oversample):
+    """
+    새 프로세스에서 한 장을 리사이즈하고 (소요 시간, 최대 RSS MB, 디코딩 중 RSS 증가량 MB, 결과 배열)을 반환한다.
+    spawn + max_tasks_per_child=1로 돌리므로 부모나 이전 이미지의 메모리 사용량이 섞이지 않는다.
+    """
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    img = open_resized(image_path, TARGET_SIZE, fast=fast, oversample=oversample)
+    pixels = np.asarray(img.convert("RGB"))
+    elapsed = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss는 KB 단위(Linux)
+    return elapsed, rss_after / 1024, (rss_after - rss_before) / 1024, pixels
+
+def _psnr(a, b):
+    mse = np.mean((a.astype(np.float64) - b.astype(np.float64)) ** 2)
+    return float("inf") if mse == 0 else 10 * np.log10(255.0 ** 2 / mse)
+
+def main():
+    image_files = sorted(f for f in os.listdir(IMAGE_DIR) if f.lower().endswith(('.jpg', '.jpeg')))
+    if NUM_IMAGES:
+        image_files = image_files[:NUM_IMAGES]
+    if not image_files:
+        print("❗ JPEG 이미지가 없습니다.")
+        return
+
+    summary = {name: [] for name, _, _ in MODES}
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context, max_tasks_per_child=1) as executor:
+        for image_file in image_files:
+            image_path = os.path.join(IMAGE_DIR, image_file)
+            reference = None
+            print(f"\n📷 {image_file}")
+            for name, fast, oversample in MODES:
+                elapsed, peak_mb, delta_mb, pixels = executor.submit(_measure, image_path, fast, oversample).result()
+                if reference is None:
+                    reference = pixels
+                diff = np.abs(pixels.astype(np.int16) - reference.astype(np.int16))
+                psnr = _psnr(pixels, reference)
+                summary[name].append((elapsed, peak_mb, delta_mb, diff.mean(), diff.max(), psnr))
+                print(f"  {name:<10} {elapsed * 1000:8.1f} ms  peak {peak_mb:7.1f} MB (+{delta_mb:6.1f})  "
+                      f"|diff| mean {diff.mean():.3f} max {diff.max():3d}  PSNR {psnr:.2f} dB")
+
+    print(f"\n===== 평균 ({len(image_files)}장, 목표 {TARGET_SIZE[0]}x{TARGET_SIZE[1]}) =====")
+    base_time = np.mean([r[0] for r in summary[MODES[0][0]]])
+    for name, rows in summary.items():
+        rows = np.array(rows, dtype=np.float64)
+        print(f"  {name:<10} {rows[:, 0].mean() * 1000:8.1f} ms (x{base_time / rows[:, 0].mean():.1f})  "
+              f"peak {rows[:, 1].max():7.1f} MB (+{rows[:, 2].max():6.1f})  |diff| mean {rows[:, 3].mean():.3f} "
+              f"max {rows[:, 4].max():3.0f}  PSNR {rows[:, 5].min():.2f} dB (최소)")
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,33 @@
 # input: 1_2_800images, 4_800labels
-# output: ✅ 모든 이미지와 라벨 파일이 정확히 일치합니다.
+# output: ✅ 모든 이미지와 라벨 파일이 정확히 일치하고 라벨 행에 문제가 없습니다. (또는 문제 행 목록)
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dataset_checker import check_dataset, print_report, write_report
 
 # 경로 설정
 IMAGES_DIR = '/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset2/1_2_800images'
 LABELS_DIR = '/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset2/4_800labels'
 
-# 지원하는 이미지 확장자
-IMAGE_EXTENSIONS = ['.jpg', '.png', '.jpeg']
+# 패킹 라벨 저장소 경로 (None이면 LABELS_DIR의 txt 파일 목록 사용)
+LABEL_STORE = None
+
+# 라벨 형식: 줄마다 클래스 id + 좌표 8개 (OBB 4점), 허용하는 클래스 id는 0 ~ NUM_CLASSES-1
+NUM_COORDS = 8
+NUM_CLASSES = 1
+
+# 검사 결과(문제 행 전체)를 JSON으로 저장할 경로 (None이면 저장하지 않음)
+REPORT_PATH = None
 
 def check_image_label_matching():
-    # 이미지 파일 이름 (확장자 제거)
-    image_files = {os.path.splitext(f)[0] for f in os.listdir(IMAGES_DIR) if os.path.splitext(f)[1] in IMAGE_EXTENSIONS}
-    
-    # 라벨 파일 이름 (.txt 제거)
-    label_files = {os.path.splitext(f)[0] for f in os.listdir(LABELS_DIR) if f.endswith('.txt')}
-    
-    # 일치하지 않는 이미지 및 라벨 확인
-    unmatched_images = image_files - label_files
-    unmatched_labels = label_files - image_files
-    
-    print(f"🔍 총 이미지 파일 수: {len(image_files)}")
-    print(f"🔍 총 라벨 파일 수: {len(label_files)}")
-    
-    if unmatched_images:
-        print(f"⚠️ 매칭되지 않은 이미지 파일: {len(unmatched_images)}")
-        for img in unmatched_images:
-            print(f" - {img}")
-    
-    if unmatched_labels:
-        print(f"⚠️ 매칭되지 않은 라벨 파일: {len(unmatched_labels)}")
-        for lbl in unmatched_labels:
-            print(f" - {lbl}")
-    
-    if not unmatched_images and not unmatched_labels:
-        print("✅ 모든 이미지와 라벨 파일이 정확히 일치합니다.")
+    # 이미지/라벨 디렉터리를 한 번씩만 훑고, 라벨 행은 한꺼번에 배열로 읽어 검사한다
+    report = check_dataset(IMAGES_DIR, LABELS_DIR, NUM_COORDS, NUM_CLASSES, LABEL_STORE)
+    print_report(report)
+    if REPORT_PATH:
+        write_report(report, REPORT_PATH)
+        print(f"📝 검사 결과 저장: {REPORT_PATH}")
+    return report
 
 if __name__ == '__main__':
     check_image_label_matching()
@@ -1,7 +1,9 @@
 import os
-import shutil
-import random
-from PIL import Image
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dataset_manifest import DatasetManifest
+from dataset_split import train_val_split, incremental_split, write_split, write_kfold
 
 # 디버깅 모드 활성화
 DEBUG = True
@@ -12,23 +14,25 @@ IMAGES_DIR = os.path.join(DATASET_DIR, "1_2_800images")
 LABELS_DIR = os.path.join(DATASET_DIR, "4_800labels")
 OUTPUT_DIR = DATASET_DIR
 
-# YOLO 요구 구조
-TRAIN_DIR = os.path.join(OUTPUT_DIR, "train")
-VAL_DIR = os.path.join(OUTPUT_DIR, "val")
-
-TRAIN_IMAGES = os.path.join(TRAIN_DIR, "images")
-TRAIN_LABELS = os.path.join(TRAIN_DIR, "labels")
-VAL_IMAGES = os.path.join(VAL_DIR, "images")
-VAL_LABELS = os.path.join(VAL_DIR, "labels")
+# YOLO 요구 구조: OUTPUT_DIR/{train,val}/{images,labels} (dataset_split.write_split이 만든다)
 
 # ⚖️ 데이터 분할 비율
 TRAIN_RATIO = 0.8
+# 🎲 분할 seed (같은 파일 목록이면 항상 같은 분할)
+SEED = 0
 
-# 📂 디렉터리 생성
-for dir_path in [TRAIN_IMAGES, TRAIN_LABELS, VAL_IMAGES, VAL_LABELS]:
-    os.makedirs(dir_path, exist_ok=True)
-    if DEBUG:
-        print(f"[DEBUG] 생성된 디렉터리: {dir_path}")
+# 📦 분할 방식: "copy"(복사), "hardlink", "symlink", "list"(ultralytics 이미지 목록 txt만 작성, 파일 복사 없음)
+SPLIT_MODE = "copy"
+# "list" 방식 / k-fold 결과 위치 (각 위치에 data.yaml 이 생긴다)
+SPLITS_DIR = os.path.join(OUTPUT_DIR, "splits")
+FOLDS_DIR = os.path.join(OUTPUT_DIR, "folds")
+# 교차 검증 fold 수 (0이면 train/val 한 번만 나눈다)
+KFOLDS = 0
+CLASS_NAMES = ['component']
+
+# 🧾 증분 분할: 기존 파일의 train/val 배정은 유지하고, 바뀐 파일만 다시 복사한다
+INCREMENTAL = True
+MANIFEST_PATH = os.path.join(OUTPUT_DIR, "split.manifest.json")
 
 # 🔄 이미지와 라벨 매칭
 allowed_img_exts = (".jpg",)
@@ -43,31 +47,48 @@ if DEBUG:
 if not matched_files:
     raise ValueError("⚠️ 이미지와 라벨이 매칭된 파일이 없습니다. 파일 이름을 확인하세요.")
 
+if KFOLDS:
+    # 🔁 교차 검증: fold마다 FOLDS_DIR/fold_<i>/data.yaml
+    yaml_paths = write_kfold(matched_files, IMAGES_DIR, LABELS_DIR, FOLDS_DIR, KFOLDS, SPLIT_MODE, CLASS_NAMES, SEED)
+    print(f"✅ {KFOLDS}-fold 분할 완료 ({SPLIT_MODE})")
+    for yaml_path in yaml_paths:
+        print(f" - {yaml_path}")
+    sys.exit(0)
+
+if SPLIT_MODE == "list":
+    # 📝 파일을 옮기지 않고 목록만 작성
+    train_files, val_files = train_val_split(matched_files, TRAIN_RATIO, SEED)
+    yaml_path = write_split(train_files, val_files, IMAGES_DIR, LABELS_DIR, SPLITS_DIR, SPLIT_MODE, CLASS_NAMES)
+    print(f"✅ 데이터셋 분할 완료 ({yaml_path})")
+    print(f" - 학습 데이터: {len(train_files)}개")
+    print(f" - 검증 데이터: {len(val_files)}개")
+    sys.exit(0)
+
+manifest = DatasetManifest(MANIFEST_PATH, params={
+    "TRAIN_RATIO": TRAIN_RATIO, "SEED": SEED, "SPLIT_MODE": SPLIT_MODE,
+}) if INCREMENTAL else None
+
 # 🔄 데이터 분할
-random.shuffle(matched_files)
-train_count = int(len(matched_files) * TRAIN_RATIO)
-train_files = matched_files[:train_count]
-val_files = matched_files[train_count:]
+if manifest:
+    # 이전에 배정된 파일은 그대로 두고, 새 파일만 비율이 맞도록 나눈다
+    train_files, val_files, new_files = incremental_split(matched_files, manifest, TRAIN_RATIO, SEED)
+
+    # 사라진 파일은 train/val에서 삭제
+    removed = manifest.prune(matched_files)
+    if DEBUG:
+        print(f"[DEBUG] 새 파일: {len(new_files)}, 삭제된 파일: {len(removed)}")
+else:
+    train_files, val_files = train_val_split(matched_files, TRAIN_RATIO, SEED)
 
 if DEBUG:
     print(f"[DEBUG] 학습 데이터: {len(train_files)}, 검증 데이터: {len(val_files)}")
 
-# 📥 파일 복사 함수
-def copy_files(files, image_dst, label_dst):
-    for file in files:
-        image_src = os.path.join(IMAGES_DIR, file + ".jpg")
-        label_src = os.path.join(LABELS_DIR, file + ".txt")
-        
-        if os.path.exists(image_src) and os.path.exists(label_src):
-            shutil.copy2(image_src, os.path.join(image_dst, file + ".jpg"))
-            shutil.copy2(label_src, os.path.join(label_dst, file + ".txt"))
-        else:
-            print(f"⚠️ 누락된 파일: {file}")
-
-# 🚀 파일 복사 실행
-copy_files(train_files, TRAIN_IMAGES, TRAIN_LABELS)
-copy_files(val_files, VAL_IMAGES, VAL_LABELS)
-
-print("✅ 데이터셋 분할 완료")
+# 🚀 파일 배치 실행 (SPLIT_MODE에 따라 복사 또는 링크, 다른 분할로 옮겨 간 파일은 이전 위치에서 지운다)
+yaml_path = write_split(train_files, val_files, IMAGES_DIR, LABELS_DIR, OUTPUT_DIR, SPLIT_MODE, CLASS_NAMES,
+                        manifest=manifest)
+if manifest:
+    manifest.save()
+
+print(f"✅ 데이터셋 분할 완료 ({yaml_path})")
 print(f" - 학습 데이터: {len(train_files)}개")
 print(f" - 검증 데이터: {len(val_files)}개")
@@ -0,0 +1,73 @@
+# input: 3_new_raw_json / 1_images
+# output: 5_pyramid/<해상도>/{images,labels}, 5_pyramid/<해상도>/data.yaml
+# 원본을 한 번만 디코딩해 PYRAMID_SIZES 해상도의 이미지/라벨을 한 번에 만든다.
+# 해상도 실험은 1_2의 TARGET_WIDTH를 바꿔 다시 변환하는 대신 5_pyramid/<해상도>/data.yaml을 학습에 넘기면 된다.
+# 이미 만든 해상도는 매니페스트로 건너뛰므로 다시 실행해도 바뀐 파일/새 해상도만 처리한다.
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from batch_runner import report_failures
+from image_pyramid import build_pyramid, level_dirs
+from dataset_split import train_val_split, write_split
+
+# 원본 해상도 (JSON에 imageWidth/imageHeight가 없을 때 사용)
+ORIGINAL_WIDTH = 3904
+ORIGINAL_HEIGHT = 3904
+
+# 만들 해상도 (정사각형, 목록에 추가하면 그 해상도만 새로 만든다)
+PYRAMID_SIZES = (640, 800, 1280, 1952)
+
+# 빠른 축소 모드: 가장 큰 해상도 × DOWNSCALE_OVERSAMPLE 이상인 DCT 축소 해상도로만 디코딩
+# False이면 전체 해상도를 디코딩한다 (해상도마다 1_2로 변환한 결과와 바이트 단위로 동일)
+FAST_DOWNSCALE = False
+DOWNSCALE_OVERSAMPLE = 1
+
+# 클래스 매핑 (YOLO 형식은 숫자 클래스 ID를 사용함)
+CLASS_NAMES = {
+    'component': 0,
+}
+
+# 디렉토리 설정
+JSON_INPUT_DIR = '/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset2/3_new_raw_json'
+IMAGE_INPUT_DIR = '/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset2/1_images'
+PYRAMID_DIR = '/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset2/5_pyramid'
+
+# 해상도마다 train/val 목록과 data.yaml을 쓴다 (seed가 같으면 모든 해상도의 분할이 같다)
+WRITE_SPLITS = True
+TRAIN_RATIO = 0.8
+SEED = 0
+
+# 병렬 처리 워커 수 (1 이하이면 한 파일씩 순차 처리)
+NUM_WORKERS = os.cpu_count() or 1
+
+
+def main():
+    result = build_pyramid(
+        JSON_INPUT_DIR, IMAGE_INPUT_DIR, PYRAMID_DIR, PYRAMID_SIZES, label_format="obb",
+        class_names=CLASS_NAMES, original_size=(ORIGINAL_WIDTH, ORIGINAL_HEIGHT),
+        fast=FAST_DOWNSCALE, oversample=DOWNSCALE_OVERSAMPLE, num_workers=NUM_WORKERS,
+    )
+
+    report_failures(result["failures"])
+
+    if WRITE_SPLITS and result["names"]:
+        # 이미지 디렉토리 확장자는 원본과 같다 (1_6_split과 같이 .jpg 기준)
+        train_files, val_files = train_val_split(result["names"], TRAIN_RATIO, SEED)
+        class_list = [name for name, _ in sorted(CLASS_NAMES.items(), key=lambda kv: kv[1])]
+
+    print("\n해상도별 결과")
+    for size in sorted(set(PYRAMID_SIZES)):
+        line = f" - {size}: 새로 만듦 {result['built'][size]}개, 건너뜀 {result['skipped'][size]}개"
+        if WRITE_SPLITS and result["names"]:
+            images_dir, labels_dir = level_dirs(PYRAMID_DIR, size)
+            yaml_path = write_split(train_files, val_files, images_dir, labels_dir,
+                                    os.path.dirname(images_dir), "list", class_list)
+            line += f" → {yaml_path}"
+        print(line)
+
+    print("✅ 피라미드 생성을 완료했습니다.")
+
+
+if __name__ == "__main__":
+    main()
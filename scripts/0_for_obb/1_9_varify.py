@@ -1,5 +1,10 @@
 import os
-from PIL import Image
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from label_store import open_label_store
+from dataset_checker import scan_files, scan_stems, IMAGE_EXTENSIONS, LABEL_EXTENSION
+from image_verifier import verify_images, write_report, cache_path_for, NUM_WORKERS
 
 # ======= 데이터셋 경로 설정 =======
 DATASET_DIR = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset2"
@@ -11,21 +16,32 @@ TRAIN_LABELS = os.path.join(TRAIN_DIR, "labels")
 VAL_IMAGES = os.path.join(VAL_DIR, "images")
 VAL_LABELS = os.path.join(VAL_DIR, "labels")
 
-def check_integrity(image_dir, label_dir):
+# ======= 이미지 검사 설정 =======
+# "header": 헤더 + 파일 끝 마커(JPEG EOI / PNG IEND)만 확인 (빠름), "full": 전체 디코딩
+VERIFY_LEVEL = "full"
+# 바뀌지 않은 이미지는 이전 판정을 재사용한다 (<이미지 디렉터리>.verify.json)
+USE_CACHE = True
+# 손상 파일 목록을 JSON으로 저장할 위치
+REPORT_DIR = DATASET_DIR
+
+def check_integrity(image_dir, label_dir, label_store=None, level=VERIFY_LEVEL, report_path=None,
+                    use_cache=USE_CACHE, num_workers=NUM_WORKERS):
     """
     1. 이미지와 라벨 디렉터리 내의 파일 이름(확장자 제거)이 올바르게 대응하는지 확인합니다.
-    2. 각 이미지 파일을 Pillow의 load()를 통해 메모리로 완전히 로드할 수 있는지(손상 여부)를 체크합니다.
+    2. 각 이미지 파일이 손상되지 않았는지 프로세스 풀에서 검사합니다.
+       level="full"이면 Pillow의 load()로 전체를 디코딩하고, "header"이면 헤더와 파일 끝 마커만 확인합니다.
+    label_store(패킹 라벨 저장소 경로)를 주면 라벨 목록을 txt 파일 대신 저장소에서 가져옵니다.
+    report_path를 주면 검사 결과(손상 파일 목록 포함)를 JSON으로 저장합니다.
     """
-    allowed_img_exts = ('.jpg', '.jpeg', '.png')
-    
-    # 이미지와 라벨 파일 목록 수집
-    image_list = [f for f in os.listdir(image_dir) if f.lower().endswith(allowed_img_exts)]
-    label_list = [f for f in os.listdir(label_dir) if f.lower().endswith('.txt')]
-    
+    # 이미지와 라벨 파일 목록 수집 (디렉터리마다 os.scandir 한 번)
+    image_list = scan_files(image_dir, IMAGE_EXTENSIONS)
+    store = open_label_store(label_store)
+    label_list = list(store.names) if store is not None else list(scan_stems(label_dir, (LABEL_EXTENSION,)))
+
     # 기본 이름(확장자 제거) 추출
-    image_basenames = {os.path.splitext(f)[0] for f in image_list}
-    label_basenames = {os.path.splitext(f)[0] for f in label_list}
-    
+    image_basenames = {os.path.splitext(os.path.basename(f))[0] for f in image_list}
+    label_basenames = set(label_list)
+
     print(f">> 검증 중: {image_dir} 와 {label_dir}")
     print(f" - 이미지 파일 수: {len(image_list)} (기본 이름: {len(image_basenames)}개)")
     print(f" - 라벨 파일 수: {len(label_list)} (기본 이름: {len(label_basenames)}개)")
@@ -46,27 +62,26 @@ def check_integrity(image_dir, label_dir):
         print("✅ 이미지와 라벨의 파일 이름 매칭이 정확합니다.")
     
     # 이미지 무결성 체크
-    integrity_errors = []
-    for image_file in image_list:
-        image_path = os.path.join(image_dir, image_file)
-        try:
-            with Image.open(image_path) as img:
-                img.load()
-        except Exception as e:
-            integrity_errors.append(f"이미지 로드 실패: {image_path} (에러: {e})")
-    
-    if integrity_errors:
+    report = verify_images(image_list, level,
+                           cache_path_for(image_dir) if use_cache else None, num_workers)
+    print(f" - 이미지 검사({level}): {report['checked']}개 검사, 변경 없음 {report['cached']}개 건너뜀")
+    if report_path:
+        write_report(report, report_path)
+        print(f" - 검사 결과 저장: {report_path}")
+
+    if report["corrupt"]:
         print("‼️ 이미지 무결성 오류 발생:")
-        for err in integrity_errors:
-            print("  -", err)
+        for item in report["corrupt"]:
+            print(f"  - 이미지 로드 실패: {item['path']} (에러: {item['error']})")
     else:
         print("✅ 모든 이미지가 정상적으로 로드됩니다.")
+    return report
 
 def main():
     print("===== Train 데이터셋 검증 =====")
-    check_integrity(TRAIN_IMAGES, TRAIN_LABELS)
+    check_integrity(TRAIN_IMAGES, TRAIN_LABELS, report_path=os.path.join(REPORT_DIR, "verify_report_train.json"))
     print("\n===== Validation 데이터셋 검증 =====")
-    check_integrity(VAL_IMAGES, VAL_LABELS)
+    check_integrity(VAL_IMAGES, VAL_LABELS, report_path=os.path.join(REPORT_DIR, "verify_report_val.json"))
     
 if __name__ == "__main__":
     main()
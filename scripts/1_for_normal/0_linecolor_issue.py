@@ -1,8 +1,12 @@
 # input: 2_raw_json
 # output: 3_new_raw_json
 import os
+import sys
 import json
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from labelme_io import load_labelme
+
 # JSON 파일이 저장된 디렉터리 경로
 json_dir = '../dataset/2_raw_json'
 
@@ -17,13 +21,12 @@ for filename in os.listdir(json_dir):
     if filename.endswith('.json'):
         filepath = os.path.join(json_dir, filename)
         try:
-            with open(filepath, 'r', encoding='utf-8') as file:
-                data = json.load(file)
+            # imageData는 스트리밍 리더가 디코딩 없이 건너뛰므로 결과에 포함되지 않는다
+            data = load_labelme(filepath)
             
             # 불필요한 필드 제거
             data.pop('lineColor', None)
             data.pop('fillColor', None)
-            data.pop('imageData', None)  # 필요에 따라 제거
             
             # 'shapes' 내의 각 객체에서 불필요한 필드 제거
             for shape in data.get('shapes', []):
@@ -1,8 +1,12 @@
 # input: 2_raw_json
 # output: 3_new_raw_json
 import os
+import sys
 import json
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from labelme_io import load_labelme
+
 def process_json_files(input_folder, output_folder, classes_to_keep, new_class_name):
     if not os.path.exists(output_folder):
         os.makedirs(output_folder)
@@ -10,8 +14,8 @@ def process_json_files(input_folder, output_folder, classes_to_keep, new_class_n
     for filename in os.listdir(input_folder):
         if filename.endswith(".json"):
             file_path = os.path.join(input_folder, filename)
-            with open(file_path, 'r', encoding='utf-8') as file:
-                data = json.load(file)
+            # imageData(base64)는 읽지 않는다 (0_linecolor_issue 단계에서 이미 제거됨)
+            data = load_labelme(file_path)
             
             new_shapes = []
             for shape in data.get("shapes", []):
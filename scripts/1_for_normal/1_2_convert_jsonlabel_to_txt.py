@@ -1,5 +1,9 @@
 import os
-import json
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from labelme_io import load_labelme, SHAPE_FIELDS
+from yolo_labels import write_aabb_labels
 
 # 원본 해상도 (원본은 3904, 변환된 해상도는 800)
 ORIGINAL_WIDTH = 3904
@@ -20,49 +24,18 @@ LABEL_OUTPUT_DIR = '/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset2/4_800size_txt_
 os.makedirs(LABEL_OUTPUT_DIR, exist_ok=True)
 
 def convert_labels(json_path):
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # 라벨 변환에는 shapes만 필요하다 (imageData는 건너뜀)
+    data = load_labelme(json_path, fields=SHAPE_FIELDS)
     
     # JSON 파일명으로부터 라벨명 추론
     base_name = os.path.splitext(os.path.basename(json_path))[0]
     label_path = os.path.join(LABEL_OUTPUT_DIR, base_name + ".txt")
     
-    # 라벨 파일 생성 (YOLO 형식 적용)
-    with open(label_path, 'w', encoding='utf-8') as out_f:
-        for shape in data.get('shapes', []):
-            label = shape.get('label', 'unknown')
-            points = shape.get('points', [])
-
-            if label not in CLASS_NAMES:
-                print(f"⚠️ 알 수 없는 라벨: '{label}' → {json_path}, 스킵")
-                continue
-            class_id = CLASS_NAMES[label]
-
-            if len(points) == 2:  # 기존: YOLO 좌표 변환 (중심점 + 너비/높이)
-                x1, y1 = points[0]
-                x2, y2 = points[1]
-            elif len(points) == 4:  # 새 처리: 네 개의 점을 축 방향 AABB로 변환
-                x_coords = [p[0] for p in points]
-                y_coords = [p[1] for p in points]
-                x1, x2 = min(x_coords), max(x_coords)
-                y1, y2 = min(y_coords), max(y_coords)
-            else:
-                print(f"❌ 지원하지 않는 도형 (points = {len(points)}개): {json_path}, 스킵")
-                continue
-
-            # 해상도 조정 (3904 -> 800 기준 변환)
-            x1 = (x1 / ORIGINAL_WIDTH) * TARGET_WIDTH
-            y1 = (y1 / ORIGINAL_HEIGHT) * TARGET_HEIGHT
-            x2 = (x2 / ORIGINAL_WIDTH) * TARGET_WIDTH
-            y2 = (y2 / ORIGINAL_HEIGHT) * TARGET_HEIGHT
-            
-            # 중심 좌표 및 너비/높이 계산 (YOLO 형식으로 변환)
-            x_center = ((x1 + x2) / 2) / TARGET_WIDTH
-            y_center = ((y1 + y2) / 2) / TARGET_HEIGHT
-            width = abs(x2 - x1) / TARGET_WIDTH
-            height = abs(y2 - y1) / TARGET_HEIGHT
-            
-            out_f.write(f"{class_id} {x_center:.6f} {y_center:.6f} {width:.6f} {height:.6f}\n")
+    # 라벨 파일 생성 (YOLO 형식 적용, 3904 -> 800 기준 변환)
+    write_aabb_labels(
+        label_path, data.get('shapes', []), CLASS_NAMES,
+        (ORIGINAL_WIDTH, ORIGINAL_HEIGHT), (TARGET_WIDTH, TARGET_HEIGHT), source=json_path
+    )
     
     print(f"✅ 변환 완료: {json_path} → {label_path}")
 
@@ -2,94 +2,67 @@
 # output: 6_lets_visualize_coco
 # 색상별 바운딩 박스 시각화
 import os
+import sys
 import cv2
 import numpy as np
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from render_engine import (
+    render_labels, label_polygons, draw_polygon_groups, text_mask,
+    NUM_WORKERS, JPEG_QUALITY, OUTPUT_SCALE,
+)
+from size_buckets import size_index
+
 # 예시 클래스 매핑 (추가 가능)
 
 CLASS_NAMES = {
     0: "component"
 }
 
-def get_coco_size_label(w, h):
-    """COCO 기준 (면적 기반)으로 Small/Medium/Large 분류"""
-    area = w * h
-    if area < 32**2:  # 1024 미만
-        return "Small"
-    elif 32**2 <= area < 96**2:  # 1024 이상, 9216 미만
-        return "Medium"
-    else:  # 9216 이상
-        return "Large"
-
-def visualize_labels(label_dir, image_dir, output_dir):
-    # output 폴더 생성
-    os.makedirs(output_dir, exist_ok=True)
-
-    for label_file in os.listdir(label_dir):
-        if label_file.endswith('.txt'):
-            base_name = os.path.splitext(label_file)[0]
-            label_path = os.path.join(label_dir, label_file)
-
-            # 이미지 파일 검색
-            for ext in ['.jpg', '.png', '.jpeg']:
-                image_path = os.path.join(image_dir, base_name + ext)
-                if os.path.exists(image_path):
-                    break
-            else:
-                print(f"이미지가 없습니다: {base_name}")
-                continue
-
-            # 이미지 로드
-            image = cv2.imread(image_path)
-            if image is None:
-                print(f"이미지를 불러올 수 없습니다: {image_path}")
-                continue
-
-            # 라벨 파일 읽기
-            with open(label_path, 'r') as f:
-                labels = f.readlines()
-
-            for label in labels:
-                parts = label.strip().split()
-                class_id = int(parts[0])
-                class_name = CLASS_NAMES.get(class_id, f"cls_{class_id}")
-
-                # YOLO (x_center, y_center, width, height) 정규화
-                x_center, y_center, w, h = map(float, parts[1:])
-                iw, ih = image.shape[1], image.shape[0]
-                x_center *= iw
-                y_center *= ih
-                w *= iw
-                h *= ih
-
-                x1 = int(x_center - w / 2)
-                y1 = int(y_center - h / 2)
-                x2 = int(x_center + w / 2)
-                y2 = int(y_center + h / 2)
-
-                size_label = get_coco_size_label(w, h)
-                if size_label == "Small":
-                    color = (0, 0, 255)
-                elif size_label == "Medium":
-                    color = (255, 0, 0)
-                else:
-                    color = (0, 255, 255)
-
-                # 테두리 사각형
-                cv2.rectangle(image, (x1, y1), (x2, y2), color, 2)
-
-                # 정보 표시
-                area_px = int(w * h)
-                text = f"{class_name} {int(w)}x{int(h)} : {area_px}"
-                cv2.putText(
-                    image, text, (x1, y1 - 5),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.4, color, 1
-                )
-
-            # 결과 저장
-            output_path = os.path.join(output_dir, f"{base_name}_visualized.jpg")
-            cv2.imwrite(output_path, image)
-            print(f"시각화된 이미지 저장 완료: {output_path}")
+# 크기 구간별 테두리 색상 (BGR): Small=빨강, Medium=파랑, Large=노랑 (COCO 면적 기준, size_buckets.size_index)
+SIZE_COLORS = [(0, 0, 255), (255, 0, 0), (0, 255, 255)]
+
+# 텍스트 한 줄이 차지하는 크기 (밀도에 맞춘 텍스트 표시의 격자 칸 크기로 쓴다)
+TEXT_SIZE = cv2.getTextSize("component 000x000 : 00000", cv2.FONT_HERSHEY_SIMPLEX, 0.4, 1)[0]
+
+def draw_labels(image, class_ids, coords, text="auto"):
+    """
+    이미지 한 장에 라벨을 그린다 (render_engine에서 워커마다 호출).
+    크기 구간은 한 번에 분류하고, 같은 색 테두리는 polylines 한 번으로 그린다.
+    text: "auto"(겹치지 않는 위치만), "all", "none"
+    """
+    if len(class_ids) == 0:
+        return image
+    height, width = image.shape[:2]
+    # YOLO (x_center, y_center, width, height) 정규화 → 픽셀 사각형
+    rects = label_polygons(coords, width, height, is_obb=False)
+    w = np.asarray(coords)[:, 2] * width
+    h = np.asarray(coords)[:, 3] * height
+    sizes = size_index(w * h)
+
+    # 테두리 사각형 (크기 구간별 한 번씩)
+    draw_polygon_groups(image, rects, sizes, SIZE_COLORS, thickness=2)
+
+    # 정보 표시
+    anchors = rects[:, 0] - [0, 5]
+    for i in np.flatnonzero(text_mask(anchors, TEXT_SIZE, text)):
+        class_id = int(class_ids[i])
+        class_name = CLASS_NAMES.get(class_id, f"cls_{class_id}")
+        label = f"{class_name} {int(w[i])}x{int(h[i])} : {int(w[i] * h[i])}"
+        cv2.putText(
+            image, label, (int(anchors[i, 0]), int(anchors[i, 1])),
+            cv2.FONT_HERSHEY_SIMPLEX, 0.4, SIZE_COLORS[sizes[i]], 1
+        )
+    return image
+
+def visualize_labels(label_dir, image_dir, output_dir, label_store=None, num_workers=NUM_WORKERS,
+                     incremental=True, quality=JPEG_QUALITY, scale=OUTPUT_SCALE, text="auto"):
+    # 이미지 한 장씩 프로세스 풀에서 그리고, 이미지와 라벨이 그대로인 항목은 건너뛴다 (render_engine)
+    # 패킹 라벨 저장소(label_store)가 있으면 txt 파일 대신 저장소에서 읽는다
+    return render_labels(
+        label_dir, image_dir, output_dir, draw_labels, {"text": text}, label_store=label_store,
+        num_workers=num_workers, incremental=incremental, quality=quality, scale=scale
+    )
 
 
 if __name__ == "__main__":
@@ -98,4 +71,3 @@ if __name__ == "__main__":
         image_dir="/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset/1_1_800images",  # 이미지 디렉토리
         output_dir="/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset/5_lets_visualize_coco"  # 결과 저장 디렉토리
     )
-
@@ -4,11 +4,20 @@
 import os
 import json
 import numpy as np
+from label_store import open_label_store, label_names, load_labels
+from obb_geometry import polygon_area
+from coco_results import coco_from_dict, yolo_predictions_to_coco, yolo_predictions_to_array, write_results
+from obb_eval import OBB_KEY, obb_coco_evaluation
+from fast_coco_eval import MAX_DETS, DENSE_MAX_DETS, fast_coco_evaluation
+from eval_cache import cached_coco_evaluation
 from pycocotools.coco import COCO
 from pycocotools.cocoeval import COCOeval
 
 # 1. YOLO OBB 라벨 -> COCO GT 변환 (픽셀 좌표 사용)
-def convert_yolo_obb_to_coco(labels_dir, coco_output_file, image_dir, class_names, img_width, img_height):
+# label_store(패킹 라벨 저장소 경로)를 주면 txt 파일 대신 저장소에서 라벨을 읽는다.
+# obb=True이면 4점 polygon을 "obb"로 함께 저장하고, area는 polygon 면적을 사용한다 (OBB 평가용).
+# build_gt_coco는 COCO dict를 메모리에 만들어 반환하고, convert_yolo_obb_to_coco는 그것을 파일로 저장한다.
+def build_gt_coco(labels_dir, image_dir, class_names, img_width, img_height, label_store=None, obb=False):
     coco_data = {
         "images": [],
         "annotations": [],
@@ -17,10 +26,10 @@ def convert_yolo_obb_to_coco(labels_dir, coco_output_file, image_dir, class_name
     annotation_id = 1
     image_id = 1
 
-    for label_file in sorted(os.listdir(labels_dir)):
-        if not label_file.endswith(".txt"):
-            continue
-        img_name = label_file.replace(".txt", ".jpg")
+    store = open_label_store(label_store)
+    for base_name in sorted(label_names(labels_dir, store)):
+        label_file = base_name + ".txt"
+        img_name = base_name + ".jpg"
         img_path = os.path.join(image_dir, img_name)
         if not os.path.exists(img_path):
             print(f"⚠ Warning: 이미지 {img_path} 없음. 건너뜀.")
@@ -31,13 +40,10 @@ def convert_yolo_obb_to_coco(labels_dir, coco_output_file, image_dir, class_name
             "width": img_width,
             "height": img_height
         })
-        with open(os.path.join(labels_dir, label_file), "r") as f:
-            lines = f.readlines()
-        for line in lines:
-            parts = line.strip().split()
-            cls_id = int(parts[0]) + 1
-            coords = list(map(float, parts[1:]))
-
+        # txt에서 읽을 때는 좌표 개수가 8개가 아닌 줄을 경고 후 건너뛴다 (저장소는 아래에서 확인)
+        class_ids, coords_all = load_labels(labels_dir, base_name, store, num_coords=8)
+        for cls_id, coords in zip(class_ids.tolist(), coords_all.tolist()):
+            cls_id = cls_id + 1
             if len(coords) != 8:
                 print(f"⚠ Warning: {label_file} 라벨 데이터 오류 (좌표 개수 불일치). 건너뜀.")
                 continue
@@ -57,104 +63,84 @@ def convert_yolo_obb_to_coco(labels_dir, coco_output_file, image_dir, class_name
             height = y_max - y_min
 
             bbox = [x_min, y_min, width, height]
-            coco_data["annotations"].append({
+            annotation = {
                 "id": annotation_id,
                 "image_id": image_id,
                 "category_id": cls_id,
                 "bbox": bbox,
                 "area": width * height,
                 "iscrowd": 0
-            })
+            }
+            if obb:
+                polygon = [x1, y1, x2, y2, x3, y3, x4, y4]
+                annotation[OBB_KEY] = polygon
+                annotation["area"] = float(polygon_area(polygon)[0])
+            coco_data["annotations"].append(annotation)
             annotation_id += 1
         image_id += 1
+    return coco_data
 
+def convert_yolo_obb_to_coco(labels_dir, coco_output_file, image_dir, class_names, img_width, img_height, label_store=None, obb=False):
+    coco_data = build_gt_coco(labels_dir, image_dir, class_names, img_width, img_height, label_store, obb)
     with open(coco_output_file, "w") as f:
-        json.dump(coco_data, f, indent=4)
+        json.dump(coco_data, f)
     print(f"✅ GT COCO JSON 변환 완료: {coco_output_file}")
-
-# 2. YOLO 예측(rbox) -> COCO 예측(픽셀 좌표) 변환
-def convert_yolo_pred_to_coco(yolo_pred_file, coco_output_file, img_width, img_height):
-    with open(yolo_pred_file, "r") as f:
-        yolo_preds = json.load(f)
-    coco_results = []
-    for pred in yolo_preds:
-        # pred["image_id"]가 이미지 파일 이름이라고 가정
-        file_name = pred["image_id"]
-        category_id = pred["category_id"] + 1
-        score = pred["score"]
-        # rbox = [x_center, y_center, w, h, theta]
-        rbox = pred["rbox"]
-        x_center, y_center, w, h, _ = rbox
-        x = x_center - (w / 2)
-        y = y_center - (h / 2)
-        # 픽셀 단위로 변환
-        x *= img_width
-        y *= img_height
-        w *= img_width
-        h *= img_height
-        coco_results.append({
-            "image_id": file_name,
-            "category_id": category_id,
-            "bbox": [x, y, w, h],
-            "score": score
-        })
-    with open(coco_output_file, "w") as f:
-        json.dump(coco_results, f, indent=4)
-    print(f"✅ 예측 COCO JSON 변환 완료: {coco_output_file}")
-
-# 3. image_id를 숫자로 매핑 (GT에 맞춤)
-def fix_image_id(gt_file, pred_file, output_file):
-    with open(gt_file, "r") as f:
-        gt_data = json.load(f)
-    # 확장자 제외한 파일이름 -> image_id
-    image_id_map = {}
-    for img in gt_data["images"]:
-        file_stem = os.path.splitext(img["file_name"])[0]
-        image_id_map[file_stem] = img["id"]
-    with open(pred_file, "r") as f:
-        pred_data = json.load(f)
-    fixed_preds = []
-    for pred in pred_data:
-        file_stem = os.path.splitext(str(pred["image_id"]))[0]
-        if file_stem in image_id_map:
-            new_pred = dict(pred)
-            new_pred["image_id"] = image_id_map[file_stem]
-            fixed_preds.append(new_pred)
-        else:
-            print(f"⚠ Warning: {file_stem}이(가) GT에 없음. 제거.")
-    with open(output_file, "w") as f:
-        json.dump(fixed_preds, f, indent=4)
-    print(f"✅ image_id 매핑 완료: {output_file}")
-
-# 4. category_id를 GT에 맞춰 통일 (단순화 버전)
-def fix_category_id(gt_file, pred_file, output_file):
-    with open(gt_file, "r") as f:
-        gt_data = json.load(f)
-    if not gt_data["categories"]:
-        print("⚠ Warning: GT에 categories 정보가 없음.")
-        return
-    # 보통 첫 번째 카테고리 id를 그대로 사용
-    gt_category_id = gt_data["categories"][0]["id"]
-    with open(pred_file, "r") as f:
-        pred_data = json.load(f)
-    for pred in pred_data:
-        pred["category_id"] = gt_category_id
-    with open(output_file, "w") as f:
-        json.dump(pred_data, f, indent=4)
-    print(f"✅ category_id 통일 완료: {output_file}")
-
-# 5. COCO AP/AR 평가
-def coco_evaluation(gt_file, dt_file):
-    coco_gt = COCO(gt_file)
+    return coco_data
+
+# 2. YOLO 예측(rbox) -> 평가용 COCO 예측(픽셀 좌표) 변환
+# image_id(파일 이름 → GT 정수 id), category_id(GT에 맞춤), 픽셀 박스를 한 번에 만들어 파일 하나로 저장한다.
+# obb=True이면 theta를 버리지 않고 회전 박스 4점 polygon을 "obb"로 함께 저장한다.
+def convert_yolo_pred_to_coco(yolo_pred_file, coco_output_file, gt_file, img_width, img_height, obb=False):
+    coco_results = yolo_predictions_to_coco(yolo_pred_file, gt_file, img_width, img_height, obb=obb)
+    write_results(coco_results, coco_output_file)
+    print(f"✅ 예측 COCO JSON 변환 완료: {coco_output_file} ({len(coco_results)}개)")
+
+# 3. COCO AP/AR 평가
+# obb=True이면 "obb" polygon끼리의 회전 박스 IoU로 평가한다 (요약 형식은 동일).
+# fast=True이면 단일 클래스 고속 평가기(fast_coco_eval)를 max_dets로 사용한다.
+# cache_dir를 주면 이미지별 매칭 결과를 캐시해 바뀐 이미지만 다시 매칭한다 (fast=True일 때).
+# prune_cache=True이면 이번 평가에 쓰지 않은 캐시 파일은 지운다 (cache_dir를 여러 평가가 함께 쓰면 False).
+# gt_file은 경로 또는 메모리의 COCO dict, dt_file은 경로, 결과 dict 목록 또는 Nx7 배열(bbox 평가만)이다.
+def coco_evaluation(gt_file, dt_file, obb=False, fast=False, max_dets=MAX_DETS, cache_dir=None, prune_cache=True):
+    if fast and cache_dir:
+        return cached_coco_evaluation(gt_file, dt_file, cache_dir, max_dets, obb=obb, prune=prune_cache)
+    if fast:
+        return fast_coco_evaluation(gt_file, dt_file, max_dets, obb=obb)
+    coco_gt = coco_from_dict(gt_file) if isinstance(gt_file, dict) else COCO(gt_file)
+    if obb:
+        return obb_coco_evaluation(coco_gt, dt_file, max_dets)
     coco_dt = coco_gt.loadRes(dt_file)
     coco_eval = COCOeval(coco_gt, coco_dt, "bbox")
     coco_eval.params.iouThrs = np.linspace(0.5, 0.95, 10)
+    coco_eval.params.maxDets = list(max_dets)
     coco_eval.evaluate()
     coco_eval.accumulate()
     coco_eval.summarize()
     return coco_eval.stats
 
-# 6. 메인 실행부
+# 4. 메모리 안에서 한 번에 평가 (중간 JSON 없음)
+# GT dict와 예측(bbox 평가는 Nx7 배열, obb/fast 평가는 결과 dict 목록)을 메모리에서 만들어 바로 평가한다.
+# gt_output/dt_output을 주면 그 파일들도 저장한다 (선택).
+def evaluate_in_memory(labels_dir, image_dir, class_names, img_width, img_height, yolo_pred_file,
+                       obb=False, fast=False, max_dets=MAX_DETS, cache_dir=None, label_store=None,
+                       gt_output=None, dt_output=None, prune_cache=True):
+    coco_data = build_gt_coco(labels_dir, image_dir, class_names, img_width, img_height, label_store, obb)
+    with open(yolo_pred_file, "r") as f:
+        yolo_preds = json.load(f)
+    if obb or fast or dt_output:
+        detections = yolo_predictions_to_coco(yolo_preds, coco_data, img_width, img_height, obb=obb)
+    else:
+        detections = yolo_predictions_to_array(yolo_preds, coco_data, img_width, img_height)
+
+    if gt_output:
+        with open(gt_output, "w") as f:
+            json.dump(coco_data, f)
+    if dt_output:
+        write_results(detections, dt_output)
+    return coco_evaluation(coco_data, detections, obb=obb, fast=fast, max_dets=max_dets, cache_dir=cache_dir,
+                           prune_cache=prune_cache)
+
+# 5. 메인 실행부
 if __name__ == "__main__":
     # 경로와 파라미터는 필요에 맞게 수정한다.
     yolo_labels_dir = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset/labels/val"
@@ -162,23 +148,22 @@ if __name__ == "__main__":
     class_names = ["component"] 
     img_width = 3904
     img_height = 3904
+    # True이면 외접 사각형 대신 회전 박스(OBB) polygon IoU로 평가한다
+    use_obb = False
+    # True이면 고속 단일 클래스 평가기를 DENSE_MAX_DETS로 사용한다
+    use_fast_eval = False
 
-    # GT 출력
-    gt_file_pixel = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset/ground_truth_pixel.json"
-    convert_yolo_obb_to_coco(yolo_labels_dir, gt_file_pixel, image_dir, class_names, img_width, img_height)
+    # True이면 평가에 쓴 GT/예측 COCO JSON도 저장한다 (평가 자체는 파일 없이 메모리에서 한다)
+    save_artifacts = False
 
-    # 예측 변환
     yolo_pred_file = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/scripts/runs/obb/val/predictions.json"
-    coco_pred_file_raw = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/outputs_for_exper/run/coco_predictions_pixel_raw.json"
-    convert_yolo_pred_to_coco(yolo_pred_file, coco_pred_file_raw, img_width, img_height)
-
-    # image_id & category_id 수정
-    coco_pred_file_fixed = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/outputs_for_exper/run/coco_predictions_pixel_fixed.json"
-    fix_image_id(gt_file_pixel, coco_pred_file_raw, coco_pred_file_fixed)
-
-    coco_pred_file_final = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/outputs_for_exper/run/coco_predictions_pixel_final.json"
-    fix_category_id(gt_file_pixel, coco_pred_file_fixed, coco_pred_file_final)
-
-    # 최종 평가
-    results = coco_evaluation(gt_file_pixel, coco_pred_file_final)
+    gt_file_pixel = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset/ground_truth_pixel.json"
+    coco_pred_file = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/outputs_for_exper/run/coco_predictions_pixel.json"
+
+    results = evaluate_in_memory(
+        yolo_labels_dir, image_dir, class_names, img_width, img_height, yolo_pred_file,
+        obb=use_obb, fast=use_fast_eval, max_dets=DENSE_MAX_DETS if use_fast_eval else MAX_DETS,
+        gt_output=gt_file_pixel if save_artifacts else None,
+        dt_output=coco_pred_file if save_artifacts else None,
+    )
     print("COCO Evaluation Results:", results)
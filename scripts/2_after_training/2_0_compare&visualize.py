@@ -3,58 +3,63 @@
 
 import json
 import os
+import sys
 import cv2
-import matplotlib.pyplot as plt
 import random
 
-def calculate_iou(boxA, boxB):
-    xA = max(boxA[0], boxB[0])
-    yA = max(boxA[1], boxB[1])
-    xB = min(boxA[0] + boxA[2], boxB[0] + boxB[2])
-    yB = min(boxA[1] + boxA[3], boxB[1] + boxB[3])
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from box_matching import group_by_image, empty_group, match_summary
+from eval_gallery import comparison_entries, render_gallery, NUM_WORKERS
 
-    interArea = max(0, xB - xA) * max(0, yB - yA)
-    boxAArea = boxA[2] * boxA[3]
-    boxBArea = boxB[2] * boxB[3]
-    
-    iou = interArea / float(boxAArea + boxBArea - interArea) if (boxAArea + boxBArea - interArea) > 0 else 0
-    return iou
+# 1:1 매칭으로 인정할 최소 IoU
+IOU_THRESHOLD = 0.5
+
+# True이면 창을 띄우지 않고 전체 이미지를 overlay/contact sheet/HTML 갤러리로 저장한다 (평가 서버용)
+HEADLESS = False
+GALLERY_DIR = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/outputs_for_exper/run/gallery"
+# HEADLESS에서 저장할 이미지 수 (None이면 전체)
+GALLERY_SAMPLES = None
+# 창으로 볼 때 임의로 뽑을 이미지 수
+NUM_SAMPLES = 5
 
 # 데이터 로드
 gt_file = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset/ground_truth.json"
 pred_file = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/outputs_for_exper/run/coco_predictions_final_normalized.json"
 image_dir = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset/images/val"  
 
-with open(gt_file, "r") as f:
-    gt_data = json.load(f)
 
-with open(pred_file, "r") as f:
-    pred_data = json.load(f)
+def show_samples(gt_data, pred_data, num_samples):
+    # GT에서 image_id와 file_name 매핑
+    image_id_to_filename = {img["id"]: img["file_name"] for img in gt_data["images"]}
+
+    # GT와 Prediction을 image_id별로 한 번만 묶어 둔다
+    gt_by_image = group_by_image(gt_data["annotations"])
+    pred_by_image = group_by_image(pred_data)
+
+    # 랜덤한 이미지 선택 (최대 num_samples개)
+    sample_images = random.sample(list(image_id_to_filename.keys()), min(num_samples, len(image_id_to_filename)))
 
-# GT에서 image_id와 file_name 매핑
-image_id_to_filename = {img["id"]: img["file_name"] for img in gt_data["images"]}
+    for image_id in sample_images:
+        _show_image(image_id_to_filename[image_id], gt_by_image.get(image_id, empty_group())["boxes"],
+                    pred_by_image.get(image_id, empty_group())["boxes"])
 
-# 랜덤한 이미지 선택 (최대 5개)
-sample_images = random.sample(list(image_id_to_filename.keys()), min(5, len(image_id_to_filename)))
 
-for image_id in sample_images:
-    image_name = image_id_to_filename[image_id]
+def _show_image(image_name, gt_bboxes, pred_bboxes):
+    # 창으로 볼 때만 matplotlib이 필요하다 (평가 서버에는 없어도 된다)
+    import matplotlib.pyplot as plt
+
     image_path = os.path.join(image_dir, image_name)
 
     # 이미지 로드
     img = cv2.imread(image_path)
     if img is None:
         print(f"⚠ Warning: {image_path} 로드 실패. 스킵합니다.")
-        continue
+        return
 
     # OpenCV -> matplotlib 순서 변환
     img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
     img_h, img_w, _ = img.shape
 
-    # GT와 Prediction BBox 찾기
-    gt_bboxes = [ann["bbox"] for ann in gt_data["annotations"] if ann["image_id"] == image_id]
-    pred_bboxes = [pred["bbox"] for pred in pred_data if pred["image_id"] == image_id]
-
     plt.figure(figsize=(10, 10))
     plt.imshow(img)
 
@@ -84,13 +89,34 @@ for image_id in sample_images:
         )
 
     # IoU 계산 (IoU는 픽셀 단위로 해석하는 게 일반적)
-    # GT도 픽셀 단위 변환한 뒤 IoU 계산하는 편이 좋다.
-    gt_bboxes_pixel = [(box[0]*img_w, box[1]*img_h, box[2]*img_w, box[3]*img_h) for box in gt_bboxes]
-    pred_bboxes_pixel = [(box[0]*img_w, box[1]*img_h, box[2]*img_w, box[3]*img_h) for box in pred_bboxes]
-    iou_scores = [calculate_iou(gtb, pb) for gtb in gt_bboxes_pixel for pb in pred_bboxes_pixel]
-    avg_iou = sum(iou_scores) / len(iou_scores) if iou_scores else 0
-
-    plt.title(f"{image_name}\nAvg IoU: {avg_iou:.2f}")
+    # GT도 픽셀 단위 변환한 뒤, GT×예측 IoU 행렬에서 1:1 매칭된 쌍의 평균 IoU를 계산한다.
+    scale = [img_w, img_h, img_w, img_h]
+    summary = match_summary(gt_bboxes * scale, pred_bboxes * scale, IOU_THRESHOLD)
+
+    plt.title(
+        f"{image_name}\nMatched IoU: {summary['mean_iou']:.2f} "
+        f"(matched {summary['matched']}, missed GT {summary['missed_gt']}, false pred {summary['false_pred']})"
+    )
     # 범례 중복 추가 방지를 위해 별도 legend는 생략하거나 필요시 그리기
     plt.axis("off")
     plt.show()
+    # 창을 닫은 뒤 figure를 정리해 이미지마다 메모리가 쌓이지 않게 한다
+    plt.close()
+
+
+if __name__ == "__main__":
+    with open(gt_file, "r") as f:
+        gt_data = json.load(f)
+
+    with open(pred_file, "r") as f:
+        pred_data = json.load(f)
+
+    if HEADLESS:
+        image_ids = None
+        if GALLERY_SAMPLES:
+            all_ids = [img["id"] for img in gt_data["images"]]
+            image_ids = random.sample(all_ids, min(GALLERY_SAMPLES, len(all_ids)))
+        entries = comparison_entries(gt_data, pred_data, image_dir, image_ids, IOU_THRESHOLD, normalized=True)
+        render_gallery(entries, GALLERY_DIR, num_workers=NUM_WORKERS)
+    else:
+        show_samples(gt_data, pred_data, NUM_SAMPLES)
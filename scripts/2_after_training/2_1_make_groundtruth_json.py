@@ -1,16 +1,23 @@
 import os
+import sys
 import json
 from PIL import Image
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from label_store import open_label_store, load_labels
+
 def create_ground_truth_json(
     image_dir = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset/val/images",
     label_dir = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset/val/labels",
-    output_json = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset/ground_truth.json"
+    output_json = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset/ground_truth.json",
+    label_store = None
 ):
     """
     YOLO 라벨(txt) 파일을 COCO 형식의 ground_truth.json으로 변환한다.
     이미지 해상도가 800×800이라고 가정하고, 라벨에 있는 x_center, y_center, w, h는 (0~1) 정규화된 좌표라고 가정한다.
+    label_store(패킹 라벨 저장소 경로)를 주면 txt 파일 대신 저장소에서 라벨을 읽는다.
     """
+    store = open_label_store(label_store)
 
     image_files = sorted([
         f for f in os.listdir(image_dir)
@@ -36,26 +43,13 @@ def create_ground_truth_json(
         })
 
         base_name, _ = os.path.splitext(img_file)
-        label_file = os.path.join(label_dir, base_name + ".txt")
-        if not os.path.exists(label_file):
+        labels = load_labels(label_dir, base_name, store)
+        if labels is None:
             image_id += 1
             continue
 
-        with open(label_file, "r") as lf:
-            lines = lf.readlines()
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-
-            parts = line.split()
-            class_id = int(parts[0])
-            x_center = float(parts[1])
-            y_center = float(parts[2])
-            w = float(parts[3])
-            h = float(parts[4])
-
+        class_ids, coords = labels
+        for class_id, (x_center, y_center, w, h) in zip(class_ids.tolist(), coords[:, :4].tolist()):
             x_center_abs = x_center * width
             y_center_abs = y_center * height
             w_abs = w * width
@@ -1,53 +1,22 @@
 import json
 import os
+import sys
 import cv2
-import matplotlib.pyplot as plt
 import random
 
-def calculate_iou(boxA, boxB):
-    """
-    두 박스(boxA, boxB)는 (x, y, w, h)의 픽셀 좌표이다.
-    두 박스의 IoU(교집합 비율)를 계산한다.
-    """
-    xA = max(boxA[0], boxB[0])
-    yA = max(boxA[1], boxB[1])
-    xB = min(boxA[0] + boxA[2], boxB[0] + boxB[2])
-    yB = min(boxA[1] + boxA[3], boxB[1] + boxB[3])
-
-    interW = max(0, xB - xA)
-    interH = max(0, yB - yA)
-    interArea = interW * interH
-
-    boxAArea = boxA[2] * boxA[3]
-    boxBArea = boxB[2] * boxB[3]
-
-    unionArea = float(boxAArea + boxBArea - interArea)
-    if unionArea <= 0:
-        return 0.0
-
-    iou = interArea / unionArea
-    return iou
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from box_matching import group_by_image, empty_group, match_summary
+from eval_gallery import comparison_entries, render_gallery, NUM_WORKERS
+from size_buckets import size_index, SIZE_NAMES
 
-def get_size_category(w, h):
-    """
-    COCO에서 small, medium, large를 면적 기준으로 구분한다.
-    small: area < 32*32
-    medium: 32*32 <= area < 96*96
-    large: area >= 96*96
-    """
-    area = w * h
-    if area < 32 * 32:
-        return "small"
-    elif area < 96 * 96:
-        return "medium"
-    else:
-        return "large"
-
-def visualize_and_iou(gt_file, pred_file, image_dir, num_samples=5):
+def visualize_and_iou(gt_file, pred_file, image_dir, num_samples=5, iou_threshold=0.5,
+                      headless=False, output_dir=None, num_workers=NUM_WORKERS):
     """
     GT와 예측을 로드해, 임의의 이미지를 뽑아 바운딩 박스를 시각화한다.
     정규화된 bbox는 이미지 폭, 높이를 곱해 픽셀 단위로 변환한다.
-    IoU를 간단히 계산하고, 평균값을 표시한다.
+    GT×예측 IoU 행렬에서 1:1 매칭(iou_threshold 이상)된 쌍의 평균 IoU를 표시한다.
+    headless=True이면 창을 띄우지 않고 output_dir에 overlay/contact sheet/HTML 갤러리를 병렬로 저장한다
+    (num_samples가 None이면 전체 이미지).
     """
     with open(gt_file, "r") as f:
         gt_data = json.load(f)
@@ -60,12 +29,28 @@ def visualize_and_iou(gt_file, pred_file, image_dir, num_samples=5):
     for img_info in gt_data["images"]:
         image_id_to_file[img_info["id"]] = img_info["file_name"]
 
+    # GT와 예측을 image_id별로 한 번만 묶어 둔다
+    gt_by_image = group_by_image(gt_data["annotations"])
+    pred_by_image = group_by_image(pred_data)
+
     # 랜덤으로 보여줄 이미지 ID 샘플
     all_ids = list(image_id_to_file.keys())
     if not all_ids:
         print("이미지가 없습니다.")
         return
-    sample_ids = random.sample(all_ids, min(num_samples, len(all_ids)))
+    if num_samples is None:
+        sample_ids = all_ids
+    else:
+        sample_ids = random.sample(all_ids, min(num_samples, len(all_ids)))
+
+    if headless:
+        if output_dir is None:
+            raise ValueError("headless 모드에는 output_dir이 필요합니다.")
+        entries = comparison_entries(gt_data, pred_data, image_dir, sample_ids, iou_threshold, pred_sizes=True)
+        return render_gallery(entries, output_dir, num_workers=num_workers)
+
+    # 창으로 볼 때만 matplotlib이 필요하다 (평가 서버에는 없어도 된다)
+    import matplotlib.pyplot as plt
 
     for image_id in sample_ids:
         img_file = image_id_to_file[image_id]
@@ -79,9 +64,9 @@ def visualize_and_iou(gt_file, pred_file, image_dir, num_samples=5):
         h_img, w_img, _ = img.shape
 
         # GT bboxes
-        gt_bboxes = [ann["bbox"] for ann in gt_data["annotations"] if ann["image_id"] == image_id]
+        gt_bboxes = gt_by_image.get(image_id, empty_group())["boxes"]
         # 예측 bboxes
-        pred_bboxes = [dt["bbox"] for dt in pred_data if dt["image_id"] == image_id]
+        pred_bboxes = pred_by_image.get(image_id, empty_group())["boxes"]
 
         plt.figure(figsize=(10, 10))
         plt.imshow(img)
@@ -102,48 +87,41 @@ def visualize_and_iou(gt_file, pred_file, image_dir, num_samples=5):
             )
 
         # 빨간색: 예측 바운딩박스
-        for bbox in pred_bboxes:
+        # COCO 면적 구간 (small < 32² ≤ medium < 96² ≤ large)을 한 번에 분류
+        size_cats = [SIZE_NAMES[i] for i in size_index(pred_bboxes[:, 2] * pred_bboxes[:, 3])]
+        for bbox, size_cat in zip(pred_bboxes, size_cats):
             px, py, pw, ph = bbox
             # 만약 정규화면
             # px, py, pw, ph = px*w_img, py*h_img, pw*w_img, ph*h_img
 
-            size_cat = get_size_category(pw, ph)
             plt.gca().add_patch(
                 plt.Rectangle((px, py), pw, ph, edgecolor='red', linewidth=1, fill=False)
             )
             plt.text(px+1, py+10, f"pred: {size_cat}", color="red", fontsize=7)
 
-        # IoU 간단 계산
-        gt_pixels = []
-        for bbox in gt_bboxes:
-            gx, gy, gw, gh = bbox
-            # 정규화 되어 있다면 곱해야 함
-            # gx, gy, gw, gh = gx*w_img, gy*h_img, gw*w_img, gh*h_img
-            gt_pixels.append((gx, gy, gw, gh))
-
-        pred_pixels = []
-        for bbox in pred_bboxes:
-            px, py, pw, ph = bbox
-            # 정규화 되어 있다면 곱해야 함
-            # px, py, pw, ph = px*w_img, py*h_img, pw*w_img, ph*h_img
-            pred_pixels.append((px, py, pw, ph))
-
-        iou_scores = []
-        for gbox in gt_pixels:
-            for pbox in pred_pixels:
-                iou_val = calculate_iou(gbox, pbox)
-                iou_scores.append(iou_val)
-
-        avg_iou = sum(iou_scores) / len(iou_scores) if iou_scores else 0
-        plt.title(f"{img_file} - 평균 IoU: {avg_iou:.3f}", fontsize=11)
+        # IoU 계산 (bbox가 정규화되어 있다면 w_img, h_img를 곱한 뒤 넘겨야 함)
+        summary = match_summary(gt_bboxes, pred_bboxes, iou_threshold)
+        plt.title(
+            f"{img_file} - 매칭 IoU: {summary['mean_iou']:.3f} "
+            f"(매칭 {summary['matched']}, 미검출 {summary['missed_gt']}, 오검출 {summary['false_pred']})",
+            fontsize=11
+        )
         plt.axis("off")
         plt.show()
+        # 창을 닫은 뒤 figure를 정리해 이미지마다 메모리가 쌓이지 않게 한다
+        plt.close()
 
 if __name__ == "__main__":
     # 사용자가 원하는 경로
     gt_file = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset/ground_truth.json"
     pred_file = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/outputs_800yolo/run3/coco_predictions.json"
     image_dir = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset/val/images"
+    # True이면 평가 서버에서 창 없이 전체 이미지를 갤러리로 저장한다
+    headless = False
+    gallery_dir = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/outputs_800yolo/run3/gallery"
 
     # 시각화 함수 실행
-    visualize_and_iou(gt_file, pred_file, image_dir, num_samples=5)
+    if headless:
+        visualize_and_iou(gt_file, pred_file, image_dir, num_samples=None, headless=True, output_dir=gallery_dir)
+    else:
+        visualize_and_iou(gt_file, pred_file, image_dir, num_samples=5)
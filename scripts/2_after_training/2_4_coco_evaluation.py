@@ -1,18 +1,33 @@
+import os
+import sys
 import numpy as np
 from pycocotools.coco import COCO
 from pycocotools.cocoeval import COCOeval
 
-def coco_evaluation(gt_file, dt_file):
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fast_coco_eval import MAX_DETS, DENSE_MAX_DETS, fast_coco_evaluation
+from eval_cache import cached_coco_evaluation
+
+def coco_evaluation(gt_file, dt_file, fast=False, max_dets=MAX_DETS, cache_dir=None, prune_cache=True):
     """
     COCO AP/AR 평가를 COCO 공식 기준(IoU 0.50~0.95, 0.05 간격)으로 수행한다.
     gt_file과 dt_file은 모두 COCO 형식을 따르는 JSON 경로이다.
     bbox는 [x_min, y_min, width, height] 픽셀 좌표라고 가정한다.
+    fast=True이면 단일 클래스 고속 평가기(fast_coco_eval)를 max_dets로 사용한다.
+    cache_dir를 주면 이미지별 매칭 결과를 캐시해 바뀐 이미지만 다시 매칭한다 (fast=True일 때).
+    prune_cache=True이면 이번 평가에 쓰지 않은 캐시 파일은 지운다.
     """
+    if fast and cache_dir:
+        return cached_coco_evaluation(gt_file, dt_file, cache_dir, max_dets, prune=prune_cache)
+    if fast:
+        return fast_coco_evaluation(gt_file, dt_file, max_dets)
+
     coco_gt = COCO(gt_file)
     coco_dt = coco_gt.loadRes(dt_file)
 
     coco_eval = COCOeval(coco_gt, coco_dt, "bbox")
     coco_eval.params.iouThrs = np.linspace(0.5, 0.95, 10)
+    coco_eval.params.maxDets = list(max_dets)
 
     coco_eval.evaluate()
     coco_eval.accumulate()
@@ -23,6 +38,9 @@ def coco_evaluation(gt_file, dt_file):
 if __name__ == "__main__":
     gt_path = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset/ground_truth.json"
     dt_path = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/outputs_800yolo/run3/coco_predictions.json"
+    # 이미지별 매칭 캐시 (None이면 캐시하지 않음)
+    cache_path = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/outputs_800yolo/run3/eval_cache"
 
-    results = coco_evaluation(gt_path, dt_path)
+    # 부품이 많은 보드는 고속 평가기 + 큰 maxDets로 평가한다
+    results = coco_evaluation(gt_path, dt_path, fast=True, max_dets=DENSE_MAX_DETS, cache_dir=cache_path)
     print("COCO Evaluation Results:", results)
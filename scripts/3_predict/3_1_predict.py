@@ -1,15 +1,57 @@
-from ultralytics import YOLO
+import os
+import sys
 
-# 모델 로드
-model = YOLO('/home/a/A_2024_selfcode/PCB/scripts/runs/obb/train24/weights/best.pt')
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from inference_backends import load_model
+from inference_runner import run_inference
+from tiled_inference import TILE_SIZE, TILE_OVERLAP, MERGE_IOU
+
+MODEL_PATH = '/home/a/A_2024_selfcode/PCB/scripts/runs/obb/train24/weights/best.pt'
+SOURCE_DIR = '/home/a/A_2024_selfcode/PCB/dataset/test/images'
+CONF = 0.1
+# 추론 백엔드: "pytorch" / "torchscript" / "onnx" / "openvino" (3_4_benchmark_backends.py로 비교)
+BACKEND = "pytorch"
 
+# True: 배치 추론 실행기 (검출 결과를 JSONL 하나로 저장, 렌더링 끔)
+# False: 기존 방식 (이미지마다 결과 이미지 + txt 저장)
+USE_BATCH_RUNNER = True
+OUTPUT_PATH = '/home/a/A_2024_selfcode/PCB/scripts/runs/obb/predict_batch/detections.jsonl'
+BATCH_SIZE = 8
+DECODE_WORKERS = 4
+TORCH_THREADS = os.cpu_count()
+# 결과 이미지를 그려 저장할 디렉토리 (None이면 그리지 않음)
+RENDER_DIR = None
+# GT COCO JSON을 주면 평가용 COCO 결과(GT image_id/category_id, 픽셀 박스)를 COCO_OUTPUT_PATH에 함께 저장한다
+GT_FILE = None
+COCO_OUTPUT_PATH = '/home/a/A_2024_selfcode/PCB/scripts/runs/obb/predict_batch/coco_predictions.json'
+# True이면 COCO 결과에 회전 박스 polygon("obb")도 넣는다 (222.py coco_evaluation(obb=True)용)
+COCO_OBB = False
 
-# 모델 추론 실행 
-results = model.predict(
-    source='/home/a/A_2024_selfcode/PCB/dataset/test/images',
-    save=True,        # 이미지만 저장
-    save_txt=True,    # 라벨 텍스트 파일도 저장
-    conf=0.1
-)
+# 타일 추론: SOURCE_DIR이 원본 해상도(3904px) 이미지일 때 모델 입력 크기 타일로 잘라 추론한다
+TILED = False
+TILING = {
+    "tile_size": TILE_SIZE,
+    "overlap": TILE_OVERLAP,
+    "batch_size": BATCH_SIZE,
+    "merge_iou": MERGE_IOU,
+}
 
+# 모델 로드
+model = load_model(MODEL_PATH, BACKEND, batch=BATCH_SIZE)
 
+if USE_BATCH_RUNNER:
+    run_inference(
+        model, SOURCE_DIR, OUTPUT_PATH,
+        batch_size=BATCH_SIZE, decode_workers=DECODE_WORKERS,
+        torch_threads=TORCH_THREADS, render_dir=RENDER_DIR,
+        tiling=TILING if TILED else None,
+        coco_gt=GT_FILE, coco_output=COCO_OUTPUT_PATH, coco_obb=COCO_OBB, conf=CONF
+    )
+else:
+    # 모델 추론 실행
+    results = model.predict(
+        source=SOURCE_DIR,
+        save=True,        # 이미지만 저장
+        save_txt=True,    # 라벨 텍스트 파일도 저장
+        conf=CONF
+    )
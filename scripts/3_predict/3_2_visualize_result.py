@@ -1,101 +1,68 @@
 import os
+import sys
 import cv2
 import numpy as np
 
-def visualize_labels(label_dir, image_dir, output_dir, is_obb=True, alpha=0.5):
-    # output 폴더 생성
-    os.makedirs(output_dir, exist_ok=True)
-
-    # 모든 라벨 파일 처리
-    for label_file in os.listdir(label_dir):
-        if label_file.endswith('.txt'):
-            base_name = os.path.splitext(label_file)[0]
-            label_path = os.path.join(label_dir, label_file)
-
-            # 이미지 파일 경로 검색
-            for ext in ['.jpg', '.png', '.jpeg']:
-                image_path = os.path.join(image_dir, base_name + ext)
-                if os.path.exists(image_path):
-                    break
-            else:
-                print(f"이미지가 없습니다: {base_name}")
-                continue
-
-            # 이미지 로드
-            image = cv2.imread(image_path)
-            if image is None:
-                print(f"이미지를 불러올 수 없습니다: {image_path}")
-                continue
-
-            # 복사본 생성 (투명도 적용용)
-            overlay = image.copy()
-
-            # 라벨 파일 읽기
-            with open(label_path, 'r') as f:
-                labels = f.readlines()
-
-            # 라벨에 대한 색상 매핑 (랜덤 색상)
-            label_colors = {}
-
-            # 라벨 데이터 시각화
-            for label in labels:
-                parts = label.strip().split()
-                class_id = int(parts[0])
-
-                # 클래스에 색상이 없으면 생성
-                if class_id not in label_colors:
-                    label_colors[class_id] = tuple(np.random.randint(0, 255, 3).tolist())
-
-                if is_obb:
-                    # OBB (Oriented Bounding Box)
-                    points = np.array(list(map(float, parts[1:])), dtype=np.float32).reshape(-1, 2)
-                    points[:, 0] *= image.shape[1]  # 가로 방향 정규화 해제
-                    points[:, 1] *= image.shape[0]  # 세로 방향 정규화 해제
-                    points = points.astype(np.int32)
-                    cv2.fillPoly(overlay, [points], color=label_colors[class_id])  # 영역을 색칠
-                    x, y = points[0]  # 첫 번째 꼭짓점 기준으로 텍스트 위치
-
-                    # 면적 계산
-                    x_coords = points[:, 0]
-                    y_coords = points[:, 1]
-                    area_px = (max(x_coords) - min(x_coords)) * (max(y_coords) - min(y_coords))
-                else:
-                    # YOLO 형식 (x_center, y_center, width, height)
-                    x_center, y_center, width, height = map(float, parts[1:])
-                    x_center *= image.shape[1]
-                    y_center *= image.shape[0]
-                    width *= image.shape[1]
-                    height *= image.shape[0]
-
-                    x1 = int(x_center - width / 2)
-                    y1 = int(y_center - height / 2)
-                    x2 = int(x_center + width / 2)
-                    y2 = int(y_center + height / 2)
-
-                    rect_points = np.array([[x1, y1], [x2, y1], [x2, y2], [x1, y2]])
-                    cv2.fillPoly(overlay, [rect_points], color=label_colors[class_id])  # 영역을 색칠
-                    x, y = x1, y1  # 좌상단 기준으로 텍스트 위치
-
-                    # 면적 계산
-                    area_px = (x2 - x1) * (y2 - y1)
-
-                # 클래스 ID와 픽셀 값 텍스트 추가
-                cv2.putText(
-                    image, f"Class {class_id}", (x, y - 20),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, label_colors[class_id], 2
-                )
-                cv2.putText(
-                    image, f"{int(area_px)} px²", (x, y - 5),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.4, label_colors[class_id], 2
-                )
-
-            # 투명도 적용
-            cv2.addWeighted(overlay, alpha, image, 1 - alpha, 0, image)
-
-            # 시각화된 이미지를 저장
-            output_path = os.path.join(output_dir, f"{base_name}_visualized.jpg")
-            cv2.imwrite(output_path, image)
-            print(f"시각화된 이미지 저장 완료: {output_path}")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from render_engine import (
+    render_labels, label_polygons, polygon_extent, draw_polygon_groups, text_mask,
+    NUM_WORKERS, JPEG_QUALITY, OUTPUT_SCALE,
+)
+
+# 텍스트 두 줄(클래스, 면적)이 차지하는 크기 (밀도에 맞춘 텍스트 표시의 격자 칸 크기로 쓴다)
+TEXT_SIZE = (cv2.getTextSize("Class 00", cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2)[0][0], 30)
+
+def draw_labels(image, class_ids, coords, is_obb=True, alpha=0.5, text="auto"):
+    """
+    이미지 한 장에 라벨 영역을 반투명하게 칠한다 (render_engine에서 워커마다 호출).
+    같은 클래스 영역은 fillPoly 한 번으로 칠한다. text: "auto"(겹치지 않는 위치만), "all", "none"
+    """
+    if len(class_ids) == 0:
+        return image
+    # 복사본 생성 (투명도 적용용)
+    overlay = image.copy()
+
+    # 라벨 좌표 → 픽셀 polygon (OBB 4점 또는 YOLO 사각형)
+    height, width = image.shape[:2]
+    points = label_polygons(coords, width, height, is_obb)
+    class_ids = np.asarray(class_ids)
+
+    # 라벨에 대한 색상 매핑 (랜덤 색상)
+    label_colors = {int(class_id): tuple(np.random.randint(0, 255, 3).tolist()) for class_id in np.unique(class_ids)}
+
+    # 영역을 색칠 (클래스별 한 번씩)
+    draw_polygon_groups(overlay, points, class_ids, label_colors, fill=True)
+
+    # 면적 계산 (외접 사각형)
+    w, h = polygon_extent(points)
+    area_px = w * h
+
+    # 클래스 ID와 픽셀 값 텍스트 추가 (첫 번째 꼭짓점 기준)
+    anchors = points[:, 0]
+    for i in np.flatnonzero(text_mask(anchors - [0, 20], TEXT_SIZE, text)):
+        x, y = int(anchors[i, 0]), int(anchors[i, 1])
+        color = label_colors[int(class_ids[i])]
+        cv2.putText(
+            image, f"Class {class_ids[i]}", (x, y - 20),
+            cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2
+        )
+        cv2.putText(
+            image, f"{int(area_px[i])} px²", (x, y - 5),
+            cv2.FONT_HERSHEY_SIMPLEX, 0.4, color, 2
+        )
+
+    # 투명도 적용
+    cv2.addWeighted(overlay, alpha, image, 1 - alpha, 0, image)
+    return image
+
+def visualize_labels(label_dir, image_dir, output_dir, is_obb=True, alpha=0.5, label_store=None,
+                     num_workers=NUM_WORKERS, incremental=True, quality=JPEG_QUALITY, scale=OUTPUT_SCALE, text="auto"):
+    # 이미지 한 장씩 프로세스 풀에서 그리고, 이미지와 라벨이 그대로인 항목은 건너뛴다 (render_engine)
+    # 패킹 라벨 저장소(label_store)가 있으면 txt 파일 대신 저장소에서 읽는다
+    return render_labels(
+        label_dir, image_dir, output_dir, draw_labels, {"is_obb": is_obb, "alpha": alpha, "text": text},
+        label_store=label_store, num_workers=num_workers, incremental=incremental, quality=quality, scale=scale
+    )
 
 if __name__ == "__main__":
     visualize_labels(
@@ -0,0 +1,117 @@
+# input: 원본 해상도 이미지 + YOLO OBB 라벨 (cls x1 y1 ... x4 y4, 정규화 좌표)
+# output: 타일 크기 × 겹침 비율 (× 전체 이미지 추론 병행 여부)별 초당 이미지 수 / 전체 recall /
+#         소형·중형·대형 부품 recall 표
+# 첫 줄은 타일 없이 이미지 전체를 모델 입력 크기로 줄여 추론한 기준값이다.
+# 타일 경계를 가로지르는 큰 부품을 잃지 않는지 보려면 중형/대형 recall을 기준값과 비교한다.
+import os
+import sys
+import time
+import numpy as np
+from ultralytics import YOLO
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from inference_runner import list_images, iter_batches, set_torch_threads
+from tiled_inference import predict_tiled, _result_arrays
+from obb_geometry import coords_to_polygon, polygon_area, polygon_iou_matrix, rbox_to_polygon, xyxy_to_polygon
+from box_matching import match_boxes
+from size_buckets import size_index, SIZE_NAMES
+
+MODEL_PATH = '/home/a/A_2024_selfcode/PCB/scripts/runs/obb/train24/weights/best.pt'
+IMAGE_DIR = '/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset2/1_images'
+LABEL_DIR = '/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset2/1_labels'
+NUM_IMAGES = 10  # 측정할 이미지 수 (None이면 전체)
+CONF = 0.1
+IOU_THRESHOLD = 0.5
+TORCH_THREADS = os.cpu_count()
+
+# 크기 구간은 학습 해상도로 줄였을 때의 면적 기준 (COCO small < 32² ≤ medium < 96² ≤ large)
+TRAIN_SIZE = 800
+
+TILE_SIZES = [640, 800, 1024]
+OVERLAPS = [0.1, 0.2, 0.3]
+# 타일과 함께 이미지 전체도 추론할지 (tiled_inference.FULL_IMAGE_PASS)
+FULL_IMAGE_PASSES = [True, False]
+
+
+def load_gt_polygons(label_path, width, height):
+    """YOLO OBB 라벨 → 원본 픽셀 좌표 polygon (N,4,2)"""
+    if not os.path.exists(label_path):
+        return np.zeros((0, 4, 2))
+    rows = np.loadtxt(label_path, ndmin=2)
+    if rows.size == 0:
+        return np.zeros((0, 4, 2))
+    return coords_to_polygon(rows[:, 1:9] * np.tile([width, height], 4))
+
+
+def detection_polygons(det):
+    return rbox_to_polygon(det["boxes"]) if det["obb"] else xyxy_to_polygon(det["boxes"])
+
+
+def predict_full(model, image, **predict_kwargs):
+    """타일 없이 이미지 전체를 한 번에 추론한다 (기준값)."""
+    result = model.predict(image, imgsz=TRAIN_SIZE, verbose=False, save=False, **predict_kwargs)[0]
+    boxes, _, cls, conf, obb = _result_arrays(result)
+    return {"boxes": boxes, "cls": cls, "conf": conf, "obb": obb}
+
+
+def recall_counts(gt_polygons, det, image_shape):
+    """크기 구간(small, medium, large)별 [[매칭된 GT 수, GT 수], ...] (3,2)"""
+    scale = TRAIN_SIZE / max(image_shape[:2])
+    sizes = size_index(polygon_area(gt_polygons) * scale ** 2)
+    iou = polygon_iou_matrix(gt_polygons, detection_polygons(det))
+    gt_idx, _, _ = match_boxes(iou, IOU_THRESHOLD)
+    matched = np.zeros(len(gt_polygons), dtype=bool)
+    matched[gt_idx] = True
+    return np.stack([
+        np.bincount(sizes[matched], minlength=len(SIZE_NAMES)),
+        np.bincount(sizes, minlength=len(SIZE_NAMES)),
+    ], axis=1)
+
+
+def main():
+    set_torch_threads(TORCH_THREADS)
+    model = YOLO(MODEL_PATH)
+    paths = list_images(IMAGE_DIR)
+    if NUM_IMAGES:
+        paths = paths[:NUM_IMAGES]
+    if not paths:
+        print("❗ 이미지가 없습니다.")
+        return
+
+    modes = [("full", None, None, False)] + [
+        (f"tile {tile_size} / {overlap:.0%}{' +full' if full_pass else ''}", tile_size, overlap, full_pass)
+        for tile_size in TILE_SIZES for overlap in OVERLAPS for full_pass in FULL_IMAGE_PASSES
+    ]
+    # 첫 이미지로 한 번 돌려 모델 초기화 시간을 측정에서 뺀다
+    _, warmup_images = next(iter_batches(paths[:1], 1))
+    predict_full(model, warmup_images[0], conf=CONF)
+
+    print(f"{'mode':<24} {'images/s':>9} {'recall':>8} " + " ".join(f"{name:>8}" for name in SIZE_NAMES)
+          + f" {'dets/img':>9}")
+    for name, tile_size, overlap, full_pass in modes:
+        counts = np.zeros((len(SIZE_NAMES), 2), dtype=np.int64)
+        elapsed = 0.0
+        num_dets = 0
+        for batch_paths, batch_images in iter_batches(paths, 1):
+            path, image = batch_paths[0], batch_images[0]
+            start = time.perf_counter()
+            if tile_size is None:
+                det = predict_full(model, image, conf=CONF)
+            else:
+                det = predict_tiled(model, image, tile_size=tile_size, overlap=overlap,
+                                    full_image_pass=full_pass, conf=CONF)
+            elapsed += time.perf_counter() - start
+            num_dets += len(det["conf"])
+
+            height, width = image.shape[:2]
+            label_path = os.path.join(LABEL_DIR, os.path.splitext(os.path.basename(path))[0] + ".txt")
+            counts += recall_counts(load_gt_polygons(label_path, width, height), det, image.shape)
+
+        recall = counts[:, 0].sum() / max(counts[:, 1].sum(), 1)
+        size_recall = counts[:, 0] / np.maximum(counts[:, 1], 1)
+        print(f"{name:<24} {len(paths) / elapsed:9.2f} {recall:8.3f} " + " ".join(f"{r:8.3f}" for r in size_recall)
+              + f" {num_dets / len(paths):9.1f}")
+
+
+if __name__ == "__main__":
+    main()
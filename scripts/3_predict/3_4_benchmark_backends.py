@@ -0,0 +1,122 @@
+# input: 학습 가중치(.pt) + 고정 이미지 세트
+# output: 백엔드별 cold start / 1장 지연시간 p50, p95 / 배치 처리량 / PyTorch 대비 검출 일치율 표
+# cold start는 새 프로세스에서 모델 로드 + 첫 추론까지의 시간이다 (내보내기 시간은 제외).
+# 모든 백엔드는 동적 배치로 내보내므로 지연시간은 실제 1장 추론, 처리량은 EXPORT_BATCH장 배치 추론 비용이다.
+# 검출 일치율: PyTorch 검출 중 같은 클래스, polygon IoU >= MATCH_IOU 로 1:1 매칭된 비율과 매칭 쌍의 최대 conf 차이
+# PyTorch(기준) 측정이 실패하면 비교 자체가 의미 없으므로 중단한다.
+import os
+import sys
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from inference_backends import BACKENDS, IMGSZ, EXPORT_BATCH, DYNAMIC_BATCH, export_model, load_model
+from inference_runner import list_images, iter_batches, set_torch_threads
+from tiled_inference import _result_arrays
+from obb_geometry import polygon_iou_matrix
+from box_matching import match_boxes
+
+MODEL_PATH = '/home/a/A_2024_selfcode/PCB/scripts/runs/obb/train24/weights/best.pt'
+IMAGE_DIR = '/home/a/A_2024_selfcode/PCB/dataset/test/images'
+NUM_IMAGES = 32  # 측정할 이미지 수 (None이면 전체)
+CONF = 0.1
+TORCH_THREADS = os.cpu_count()
+
+LATENCY_RUNS = 3  # 이미지마다 1장 추론을 반복할 횟수
+MATCH_IOU = 0.9
+# 검출 일치율의 기준 백엔드 (반드시 측정되어야 한다)
+REFERENCE_BACKEND = "pytorch"
+
+
+def _detections(result):
+    _, polygons, cls, conf, _ = _result_arrays(result)
+    return polygons, cls, conf
+
+
+def _cold_start(path, image_path):
+    """새 프로세스에서 모델 로드 + 첫 추론 시간(초)"""
+    start = time.perf_counter()
+    from ultralytics import YOLO
+    model = YOLO(path, task="obb")
+    model.predict(image_path, verbose=False, save=False, conf=CONF)
+    return time.perf_counter() - start
+
+
+def agreement(reference, candidate):
+    """(매칭된 기준 검출 수, 기준 검출 수, 매칭 쌍 최대 conf 차이)"""
+    ref_poly, ref_cls, ref_conf = reference
+    poly, cls, conf = candidate
+    iou = polygon_iou_matrix(ref_poly, poly)
+    iou[ref_cls[:, None] != cls[None, :]] = 0.0
+    ref_idx, idx, _ = match_boxes(iou, MATCH_IOU)
+    conf_diff = float(np.abs(ref_conf[ref_idx] - conf[idx]).max()) if len(idx) else 0.0
+    return len(ref_idx), len(ref_poly), conf_diff
+
+
+def measure_backend(backend, paths, images, context):
+    """백엔드 하나의 (cold start 초, 지연시간 목록, 처리량, 이미지별 검출)"""
+    path = export_model(MODEL_PATH, backend, imgsz=IMGSZ, batch=EXPORT_BATCH, dynamic=DYNAMIC_BATCH)
+
+    with ProcessPoolExecutor(max_workers=1, mp_context=context, max_tasks_per_child=1) as executor:
+        cold = executor.submit(_cold_start, path, paths[0]).result()
+
+    model = load_model(MODEL_PATH, backend, imgsz=IMGSZ, batch=EXPORT_BATCH, dynamic=DYNAMIC_BATCH)
+    model.predict(images[0], verbose=False, save=False, conf=CONF)  # 워밍업
+
+    latencies = []
+    detections = []
+    for image in images:
+        for _ in range(LATENCY_RUNS):
+            start = time.perf_counter()
+            result = model.predict(image, verbose=False, save=False, conf=CONF)[0]
+            latencies.append(time.perf_counter() - start)
+        detections.append(_detections(result))
+
+    # 마지막 배치가 EXPORT_BATCH보다 작아도 동적 배치라 그대로 들어간다
+    start = time.perf_counter()
+    for i in range(0, len(images), EXPORT_BATCH):
+        model.predict(images[i:i + EXPORT_BATCH], verbose=False, save=False, conf=CONF)
+    throughput = len(images) / (time.perf_counter() - start)
+    return cold, latencies, throughput, detections
+
+
+def main():
+    set_torch_threads(TORCH_THREADS)
+    paths = list_images(IMAGE_DIR)
+    if NUM_IMAGES:
+        paths = paths[:NUM_IMAGES]
+    if not paths:
+        print("❗ 이미지가 없습니다.")
+        return
+    images = [image for _, batch in iter_batches(paths, EXPORT_BATCH) for image in batch]
+
+    measured = {}
+    context = multiprocessing.get_context("spawn")
+    # 기준 백엔드를 먼저 측정한다
+    for backend in sorted(BACKENDS, key=lambda b: b != REFERENCE_BACKEND):
+        try:
+            measured[backend] = measure_backend(backend, paths, images, context)
+        except Exception as e:  # 해당 런타임이 설치되지 않은 경우 등
+            if backend == REFERENCE_BACKEND:
+                raise RuntimeError(f"❌ 기준 백엔드 {backend} 측정 실패로 비교를 중단합니다: {e}") from e
+            print(f"⚠️ {backend} 건너뜀: {e}")
+
+    reference = measured[REFERENCE_BACKEND][3]
+    rows = []
+    for backend, (cold, latencies, throughput, detections) in measured.items():
+        counts = np.array([agreement(r, d) for r, d in zip(reference, detections)])
+        matched_rate = counts[:, 0].sum() / max(counts[:, 1].sum(), 1)
+        rows.append((backend, cold, *np.percentile(latencies, [50, 95]) * 1000, throughput,
+                     matched_rate, counts[:, 2].max()))
+
+    print(f"\n===== {len(images)}장, imgsz {IMGSZ}, batch {EXPORT_BATCH} (dynamic={DYNAMIC_BATCH}), "
+          f"기준: {REFERENCE_BACKEND} =====")
+    print(f"{'backend':<12} {'cold(s)':>8} {'p50(ms)':>8} {'p95(ms)':>8} {'images/s':>9} {'match':>7} {'max|dconf|':>10}")
+    for backend, cold, p50, p95, throughput, matched_rate, conf_diff in rows:
+        print(f"{backend:<12} {cold:8.2f} {p50:8.1f} {p95:8.1f} {throughput:9.2f} {matched_rate:7.1%} {conf_diff:10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# scripts/batch_runner.py
+# 파일 단위 작업 공통 실행기 (1_0_fused_raw_to_yolo, 1_2_convert_json_to_yolo, image_pyramid,
+# render_engine, eval_gallery, image_verifier)
+# - 워커 프로세스에서 작업 함수를 실행하고 출력 메시지를 모아 메인 프로세스에서 입력 순서대로 출력한다
+# - 매니페스트와 비교해 바뀐 JSON/이미지 쌍만 남기고, 사라진 쌍의 산출물은 정리한다
+# - 성공한 항목은 매니페스트에 기록, 실패한 항목은 기록을 지우고, 중단되어도 끝난 항목까지는 저장한다
+import os
+import io
+import json
+import contextlib
+import functools
+from concurrent.futures import ProcessPoolExecutor
+
+IMAGE_EXTENSIONS = ('.jpg', '.png', '.jpeg')
+
+
+def find_image_file(image_dir, base_name, extensions=IMAGE_EXTENSIONS):
+    # 확장자는 사용자가 jpg, png 등 다양할 수 있으므로 뒤에서 찾는다
+    for ext in extensions:
+        candidate = os.path.join(image_dir, base_name + ext)
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def capture_output(func, task):
+    """
+    func(task)를 실행하고 (task, ok, result, log, error)를 반환한다.
+    func가 False를 반환하거나 예외를 내면 실패이다. 예외 메시지는 log에도 남기고,
+    예외가 없으면 출력 메시지를 오류 설명으로 쓴다.
+    """
+    log = io.StringIO()
+    result, error = None, None
+    with contextlib.redirect_stdout(log):
+        try:
+            result = func(task)
+            ok = result is not False
+        except Exception as e:
+            ok = False
+            error = f"{type(e).__name__}: {e}"
+            print(f"❌ {error}")
+    log = log.getvalue()
+    if not ok and error is None:
+        error = log.strip()
+    return task, ok, result, log, error
+
+
+def run_ordered(func, tasks, num_workers, chunksize=1, initializer=None):
+    """
+    tasks를 func로 처리한 capture_output 결과를 입력 순서대로 돌려준다 (Executor.map은 순서를 보장함).
+    func와 initializer는 워커에서 불러올 수 있도록 모듈 최상위 함수여야 한다.
+    initializer는 워커 프로세스마다 한 번 실행한다 (순차 실행일 때는 실행하지 않는다).
+    """
+    worker = functools.partial(capture_output, func)
+    if num_workers <= 1:
+        yield from map(worker, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=num_workers, initializer=initializer) as executor:
+        yield from executor.map(worker, tasks, chunksize=chunksize)
+
+
+def select_pending(json_paths, image_dir, manifest, output_paths):
+    """
+    매니페스트와 비교해 다시 처리할 JSON 목록과 {json_path: (base_name, image_file)}를 반환한다.
+    output_paths(base_name, image_file)는 산출물 경로 목록, 이미지가 없는 JSON은 그대로 남겨 실패로 보고된다.
+    목록에 없는 쌍의 산출물은 삭제한다.
+    """
+    pending, pairs = [], {}
+    for json_path in json_paths:
+        base_name = os.path.splitext(os.path.basename(json_path))[0]
+        image_file = find_image_file(image_dir, base_name)
+        if image_file:
+            pairs[json_path] = (base_name, image_file)
+            if manifest.is_fresh(base_name, [json_path, image_file], output_paths(base_name, image_file)):
+                continue
+        pending.append(json_path)
+    removed = manifest.prune(base_name for base_name, _ in pairs.values())
+    print(f"ℹ️ 변경 없음 {len(json_paths) - len(pending)}개 건너뜀, 삭제된 쌍 {len(removed)}개 정리")
+    return pending, pairs
+
+
+def run_tasks(func, tasks, num_workers, records=None, manifests=(), chunksize=1, initializer=None):
+    """
+    tasks를 func로 처리하며 "[i/total] 로그"를 입력 순서대로 출력한다.
+    records: tasks와 같은 길이의 목록, 항목마다 [(manifest, key, inputs, outputs), ...]
+             (성공하면 record, 실패하면 discard)
+    manifests: 끝나거나 중단되었을 때 저장할 매니페스트
+    반환: 실패 목록 [{"index", "task", "error"}]
+    """
+    total = len(tasks)
+    failures = []
+    try:
+        for i, (task, ok, _, log, error) in enumerate(run_ordered(func, tasks, num_workers, chunksize, initializer)):
+            if not ok and not log:
+                log = f"❌ 실패: {error}\n"
+            print(f"[{i + 1}/{total}] {log}", end="" if log.endswith("\n") else "\n")
+            for manifest, key, inputs, outputs in (records[i] if records else ()):
+                if ok:
+                    manifest.record(key, inputs, outputs)
+                else:
+                    manifest.discard(key)
+            if not ok:
+                failures.append({"index": i, "task": task, "error": error})
+    finally:
+        # 중간에 중단되어도 끝난 항목까지는 기록을 남긴다
+        for manifest in manifests:
+            manifest.save()
+    return failures
+
+
+def report_failures(failures, report_path=None):
+    """실패 목록({"json", "error"})을 출력하고 report_path가 있으면 JSON으로 저장한다."""
+    if not failures:
+        return
+    print(f"\n❌ 실패한 파일 {len(failures)}개:")
+    for failure in failures:
+        print(f" - {failure['json']}: {failure['error']}")
+    if report_path:
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(failures, f, indent=4, ensure_ascii=False)
+        print(f"📝 오류 리포트 저장: {report_path}")
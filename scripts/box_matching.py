@@ -0,0 +1,83 @@
+# scripts/box_matching.py
+# GT/예측 bbox 비교 공통 함수
+# - image_id별로 한 번만 묶어 두고 (이미지마다 전체 목록을 훑지 않음)
+# - 이미지 하나의 GT×예측 IoU 행렬을 NumPy 브로드캐스팅으로 계산하고
+# - 1:1 매칭(IoU가 큰 쌍부터 탐욕적으로)으로 매칭된 쌍의 IoU를 보고한다.
+from collections import defaultdict
+import numpy as np
+
+
+def group_by_image(records, key="image_id"):
+    """
+    COCO annotations/예측 목록을 {image_id: {"boxes": (N,4) [x,y,w,h], "scores": (N,)}}로 묶는다.
+    score가 없는 GT는 scores가 1로 채워진다.
+    """
+    boxes = defaultdict(list)
+    scores = defaultdict(list)
+    for record in records:
+        image_id = record[key]
+        boxes[image_id].append(record["bbox"])
+        scores[image_id].append(record.get("score", 1.0))
+    return {
+        image_id: {
+            "boxes": np.asarray(boxes[image_id], dtype=np.float64).reshape(-1, 4),
+            "scores": np.asarray(scores[image_id], dtype=np.float64),
+        }
+        for image_id in boxes
+    }
+
+
+def empty_group():
+    return {"boxes": np.zeros((0, 4), dtype=np.float64), "scores": np.zeros(0, dtype=np.float64)}
+
+
+def iou_matrix(boxes_a, boxes_b):
+    """[x, y, w, h] 박스 (A,4), (B,4) 의 IoU 행렬 (A,B)"""
+    a = np.asarray(boxes_a, dtype=np.float64).reshape(-1, 4)
+    b = np.asarray(boxes_b, dtype=np.float64).reshape(-1, 4)
+    ax1, ay1 = a[:, 0:1], a[:, 1:2]
+    ax2, ay2 = ax1 + a[:, 2:3], ay1 + a[:, 3:4]
+    bx1, by1 = b[:, 0], b[:, 1]
+    bx2, by2 = bx1 + b[:, 2], by1 + b[:, 3]
+
+    inter_w = np.clip(np.minimum(ax2, bx2) - np.maximum(ax1, bx1), 0, None)
+    inter_h = np.clip(np.minimum(ay2, by2) - np.maximum(ay1, by1), 0, None)
+    inter = inter_w * inter_h
+    union = (a[:, 2] * a[:, 3])[:, None] + (b[:, 2] * b[:, 3])[None, :] - inter
+    return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+
+def match_boxes(iou, iou_threshold=0.5):
+    """
+    IoU 행렬 (GT, 예측)에서 1:1 매칭을 구한다. IoU가 큰 쌍부터 골라 이미 쓰인 GT/예측은 제외한다.
+    반환: (gt_idx, pred_idx, matched_iou) 배열
+    """
+    gt_idx, pred_idx = np.nonzero(iou >= iou_threshold)
+    if len(gt_idx) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0, dtype=np.float64)
+
+    order = np.argsort(-iou[gt_idx, pred_idx], kind="stable")
+    used_gt = np.zeros(iou.shape[0], dtype=bool)
+    used_pred = np.zeros(iou.shape[1], dtype=bool)
+    keep = []
+    for k in order:
+        g, p = gt_idx[k], pred_idx[k]
+        if not used_gt[g] and not used_pred[p]:
+            used_gt[g] = used_pred[p] = True
+            keep.append(k)
+    keep = np.asarray(keep, dtype=np.int64)
+    return gt_idx[keep], pred_idx[keep], iou[gt_idx[keep], pred_idx[keep]]
+
+
+def match_summary(gt_boxes, pred_boxes, iou_threshold=0.5):
+    """이미지 하나의 매칭 결과 요약 (매칭 수, 평균 IoU, 미검출 GT 수, 오검출 예측 수)"""
+    iou = iou_matrix(gt_boxes, pred_boxes)
+    _, _, matched_iou = match_boxes(iou, iou_threshold)
+    matched = len(matched_iou)
+    return {
+        "matched": matched,
+        "mean_iou": float(matched_iou.mean()) if matched else 0.0,
+        "missed_gt": len(iou) - matched,
+        "false_pred": iou.shape[1] - matched,
+    }
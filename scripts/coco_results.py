@@ -0,0 +1,168 @@
+# scripts/coco_results.py
+# 예측 → 평가용 COCO 결과 목록 변환 (한 번에)
+# - image_id는 GT 파일의 file_name(확장자 제외) 색인으로 바로 정수로 바꾸고
+# - category_id는 GT categories에 맞추고 (GT가 단일 클래스면 모두 그 id로)
+# - 박스는 픽셀 [x, y, w, h]로, obb=True이면 4점 polygon("obb")도 함께 만든다.
+# 이전에는 변환 → image_id 수정 → category_id 수정을 각각 JSON 파일로 쓰고 다시 읽었다.
+# 메모리 평가용으로 loadRes에 바로 넣을 수 있는 Nx7 배열 [image_id, x, y, w, h, score, category_id]도 만든다.
+import os
+import json
+import numpy as np
+from pycocotools.coco import COCO
+
+from obb_geometry import rbox_to_polygon, xyxy_to_polygon, polygon_bounds
+
+OBB_KEY = "obb"
+
+
+def _load_json(data):
+    if isinstance(data, str):
+        with open(data, "r") as f:
+            return json.load(f)
+    return data
+
+
+def image_id_index(gt):
+    """GT(COCO dict 또는 경로) → {확장자 제외 file_name: image_id}"""
+    gt = _load_json(gt)
+    return {os.path.splitext(img["file_name"])[0]: img["id"] for img in gt["images"]}
+
+
+def category_lookup(gt):
+    """
+    클래스 번호 → GT category_id 배열.
+    GT가 단일 카테고리면 모든 클래스를 그 id로 보낸다 (클래스 수와 무관하게 쓰이도록 길이 1 배열을 반환).
+    """
+    categories = _load_json(gt)["categories"]
+    if not categories:
+        raise ValueError("GT에 categories 정보가 없습니다.")
+    return np.asarray(sorted(c["id"] for c in categories), dtype=np.int64)
+
+
+def map_categories(cls, lookup):
+    cls = np.asarray(cls, dtype=np.int64)
+    if len(lookup) == 1:
+        return np.full(len(cls), lookup[0], dtype=np.int64)
+    return lookup[cls]
+
+
+def coco_from_dict(coco_data):
+    """이미 메모리에 있는 COCO dict로 pycocotools COCO 객체를 만든다 (JSON 파일을 거치지 않음)."""
+    coco = COCO()
+    coco.dataset = coco_data
+    coco.createIndex()
+    return coco
+
+
+def detection_xywh(boxes, rotated):
+    """
+    픽셀 좌표 박스 → COCO bbox [x, y, w, h] (N,4).
+    rotated=True이면 boxes는 rbox [cx, cy, w, h, theta]이며 기존 변환과 같이 theta를 무시한다.
+    """
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 5 if rotated else 4)
+    if rotated:
+        return np.concatenate([boxes[:, :2] - boxes[:, 2:4] / 2, boxes[:, 2:4]], axis=1)
+    return np.concatenate([boxes[:, :2], boxes[:, 2:4] - boxes[:, :2]], axis=1)
+
+
+def detections_to_coco(image_ids, boxes, cls, scores, lookup, rotated, obb=False):
+    """
+    픽셀 좌표 검출 배열을 COCO 결과 dict 목록으로 바꾼다.
+    rotated=True이면 boxes는 rbox [cx, cy, w, h, theta], 아니면 xyxy [x1, y1, x2, y2].
+    obb=True이면 polygon을 "obb"로 넣고 bbox는 polygon의 외접 사각형이다.
+    """
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 5 if rotated else 4)
+    if obb:
+        polygons = rbox_to_polygon(boxes) if rotated else xyxy_to_polygon(boxes)
+        bounds = polygon_bounds(polygons)
+        xywh = np.concatenate([bounds[:, :2], bounds[:, 2:] - bounds[:, :2]], axis=1)
+        obb_coords = polygons.reshape(-1, 8).tolist()
+    else:
+        xywh = detection_xywh(boxes, rotated)
+
+    results = [
+        {"image_id": image_id, "category_id": category_id, "bbox": bbox, "score": score}
+        for image_id, category_id, bbox, score in zip(
+            np.asarray(image_ids).tolist(), map_categories(cls, lookup).tolist(),
+            xywh.tolist(), np.asarray(scores, dtype=np.float64).tolist(),
+        )
+    ]
+    if obb:
+        for result, coords in zip(results, obb_coords):
+            result[OBB_KEY] = coords
+    return results
+
+
+def record_to_coco(record, index, lookup, obb=False):
+    """
+    inference_runner 기록 한 줄(이미지 하나, 픽셀 좌표)을 COCO 결과 목록으로 바꾼다.
+    GT에 없는 이미지는 경고 후 빈 목록을 반환한다.
+    """
+    stem = os.path.splitext(record["image"])[0]
+    if stem not in index:
+        print(f"⚠ Warning: {stem}이(가) GT에 없음. 제거.")
+        return []
+    rotated = "rbox" in record
+    boxes = record["rbox"] if rotated else record["bbox"]
+    return detections_to_coco(
+        np.full(len(boxes), index[stem]), boxes, record["cls"], record["conf"], lookup, rotated, obb
+    )
+
+
+def _parse_yolo_predictions(yolo_preds, gt, img_width, img_height):
+    """YOLO 예측 목록 → (image_ids, 픽셀 박스, cls, scores, rotated, lookup). GT에 없는 이미지는 뺀다."""
+    yolo_preds = _load_json(yolo_preds)
+    index = image_id_index(gt)
+    lookup = category_lookup(gt)
+
+    kept, missing = [], set()
+    for pred in yolo_preds:
+        stem = os.path.splitext(str(pred["image_id"]))[0]
+        if stem in index:
+            kept.append((index[stem], pred))
+        else:
+            missing.add(stem)
+    for stem in sorted(missing):
+        print(f"⚠ Warning: {stem}이(가) GT에 없음. 제거.")
+    if not kept:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, 4)), np.zeros(0, dtype=np.int64), np.zeros(0), False, lookup
+
+    image_ids = [image_id for image_id, _ in kept]
+    cls = [pred["category_id"] for _, pred in kept]
+    scores = [pred["score"] for _, pred in kept]
+    rotated = "rbox" in kept[0][1]
+    if rotated:
+        boxes = np.asarray([pred["rbox"] for _, pred in kept], dtype=np.float64)
+        boxes *= [img_width, img_height, img_width, img_height, 1.0]
+    else:
+        boxes = np.asarray([pred["bbox"] for _, pred in kept], dtype=np.float64)
+        boxes[:, 2:] += boxes[:, :2]
+    return np.asarray(image_ids), boxes, np.asarray(cls), np.asarray(scores, dtype=np.float64), rotated, lookup
+
+
+def yolo_predictions_to_coco(yolo_preds, gt, img_width=1, img_height=1, obb=False):
+    """
+    YOLO val predictions.json(목록 또는 경로, image_id는 파일 이름)을 평가용 COCO 결과로 한 번에 바꾼다.
+    "rbox"가 있으면 [cx, cy, w, h, theta]를 (img_width, img_height)로 픽셀 좌표로 늘리고,
+    없으면 "bbox" [x, y, w, h]가 이미 픽셀 좌표라고 본다. category_id는 0부터 시작하는 클래스 번호로 본다.
+    """
+    image_ids, boxes, cls, scores, rotated, lookup = _parse_yolo_predictions(yolo_preds, gt, img_width, img_height)
+    return detections_to_coco(image_ids, boxes, cls, scores, lookup, rotated, obb)
+
+
+def yolo_predictions_to_array(yolo_preds, gt, img_width=1, img_height=1):
+    """
+    yolo_predictions_to_coco와 같은 변환을 loadRes용 Nx7 배열 [image_id, x, y, w, h, score, category_id]로 반환한다.
+    JSON을 거치지 않고 coco_gt.loadRes(배열)로 바로 넣는다 (외접 사각형 bbox 평가 전용).
+    """
+    image_ids, boxes, cls, scores, rotated, lookup = _parse_yolo_predictions(yolo_preds, gt, img_width, img_height)
+    return np.column_stack([
+        image_ids.astype(np.float64), detection_xywh(boxes, rotated), scores, map_categories(cls, lookup),
+    ])
+
+
+def write_results(results, output_file):
+    """COCO 결과 목록을 (들여쓰기 없이) 저장한다."""
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    with open(output_file, "w") as f:
+        json.dump(results, f)
@@ -1,32 +1,157 @@
 # scripts/custom_obb_validator.py
+# 부품 크기(small/medium/large)별 mAP50, mAP50-95를 함께 내는 OBB 검증기
+# GT와 예측을 OBB 면적(shoelace)으로 한 번만 구간에 나눠 두는데, 맞은 예측(TP)은 매칭된 GT의 구간에,
+# 틀린 예측(FP)은 자기 면적의 구간에 넣는다 (32² 경계에서 small 예측이 medium GT에 맞아도 medium TP로 센다).
+# 검증이 끝나면 예측을 점수순으로 한 번 정렬하고 IoU 임계값마다 (클래스 × 크기 구간) 키별 연속 구간에서 AP를 계산한다.
+# 사용: model.train(data=..., trainer=SizeAwareOBBTrainer) 또는 model.val(validator=SizeAwareOBBValidator)
+import numpy as np
 import torch
-from ultralytics.yolo.engine.validator import BaseValidator
-from ultralytics.yolo.utils.metrics import ap_per_class
+from copy import copy
+from ultralytics.models.yolo.obb import OBBTrainer, OBBValidator
+from ultralytics.utils import LOGGER, ops
+from ultralytics.utils.metrics import batch_probiou
 
-class SizeAwareOBBValidator(BaseValidator):
+SIZE_CATEGORIES = {
+    "small": (0, 32**2),
+    "medium": (32**2, 96**2),
+    "large": (96**2, float("inf")),
+}
+REC_THRESHOLDS = torch.linspace(0, 1, 101)
+
+
+def obb_area(xywhr):
+    """[cx, cy, w, h, r] (N,5) 회전 박스의 shoelace 면적 (N,)"""
+    corners = ops.xywhr2xyxyxyxy(xywhr[:, :5])  # (N,4,2)
+    x, y = corners[..., 0], corners[..., 1]
+    return 0.5 * torch.abs(
+        (x * torch.roll(y, -1, dims=-1)).sum(-1) - (torch.roll(x, -1, dims=-1) * y).sum(-1)
+    )
+
+
+def size_bucket(areas, categories=SIZE_CATEGORIES):
+    """면적 → 크기 구간 번호 (SIZE_CATEGORIES 순서, 하한 포함/상한 미포함)"""
+    upper = torch.tensor([hi for _, hi in list(categories.values())[:-1]], dtype=areas.dtype, device=areas.device)
+    return torch.bucketize(areas, upper, right=True)
+
+
+def match_with_targets(pred_classes, true_classes, iou, thresholds):
+    """
+    BaseValidator.match_predictions(greedy)와 같은 매칭을 하면서 예측마다 매칭된 GT 번호도 돌려준다.
+    iou (M,N), 예측은 점수 내림차순 → correct (N,T) bool, target_idx (N,T) int (매칭 없으면 -1)
+    """
+    iou = (iou * (true_classes[:, None] == pred_classes)).cpu().numpy()
+    thresholds = thresholds.cpu().numpy()
+    num_thresholds = len(thresholds)
+    correct = np.zeros((iou.shape[1], num_thresholds), dtype=bool)
+    target_idx = np.full((iou.shape[1], num_thresholds), -1, dtype=np.int64)
+    matched = np.zeros((iou.shape[0], num_thresholds), dtype=bool)  # 임계값마다 이미 매칭된 GT
+    for j in np.flatnonzero((iou >= thresholds.min()).any(0)):
+        available = np.where(matched, 0, iou[:, j, None])
+        k = available.argmax(0)
+        correct[j] = available[k, range(num_thresholds)] >= thresholds
+        target_idx[j, correct[j]] = k[correct[j]]
+        matched[k, range(num_thresholds)] |= correct[j]
+    return correct, target_idx
+
+
+def interpolated_ap(hits, num_targets, rec_thresholds=REC_THRESHOLDS):
+    """점수 내림차순 TP 여부 (N,)와 GT 수로 COCO식 101점 보간 AP"""
+    tpc = torch.cumsum(hits, 0)
+    recall = tpc / num_targets
+    precision = tpc / torch.arange(1, len(hits) + 1, dtype=hits.dtype)
+    # 오른쪽에서부터 누적 최대 (precision envelope)
+    precision = torch.flip(torch.cummax(torch.flip(precision, [0]), dim=0).values, [0])
+    precision = torch.cat([precision, torch.zeros(1, dtype=hits.dtype)])
+    idx = torch.searchsorted(recall.contiguous(), rec_thresholds.to(hits.dtype), side="left")
+    return precision[idx].mean()
+
+
+def bucket_ap(tp, conf, pred_key, target_key, num_keys, rec_thresholds=REC_THRESHOLDS):
+    """
+    키(클래스 × 크기 구간)별 AP를 계산한다. COCO식 101점 보간을 쓴다.
+    tp (N,T) bool, conf (N,), pred_key (N,T) (TP는 매칭된 GT의 키라 임계값마다 다를 수 있다), target_key (M,)
+    → ap (K,T), GT가 없는 키는 nan
+    임계값마다 키로 안정 정렬해 키별 연속 구간(점수순 유지)에서만 누적하므로 메모리는 O(N·T)이다.
+    """
+    order = torch.argsort(conf, descending=True, stable=True)
+    tp, pred_key = tp[order].double(), pred_key[order]
+    n_gt = torch.bincount(target_key, minlength=num_keys)
+    ap = torch.full((num_keys, tp.shape[1]), float("nan"), dtype=torch.float64)
+    for t in range(tp.shape[1]):
+        by_key = torch.argsort(pred_key[:, t], stable=True)
+        counts = torch.bincount(pred_key[by_key, t], minlength=num_keys).tolist()
+        for k, hits in enumerate(torch.split(tp[by_key, t], counts)):
+            if n_gt[k] > 0:
+                ap[k, t] = interpolated_ap(hits, int(n_gt[k]), rec_thresholds)
+    return ap
+
+
+class SizeAwareOBBValidator(OBBValidator):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.size_categories = {
-            "small": (0, 32**2),
-            "medium": (32**2, 96**2),
-            "large": (96**2, float("inf"))
-        }
-
-    def _calculate_obb_area(self, boxes):
-        x = boxes[..., ::2]  # x1, x2, x3, x4
-        y = boxes[..., 1::2]  # y1, y2, y3, y4
-        return 0.5 * torch.abs(
-            (x[..., 0] * y[..., 1] + x[..., 1] * y[..., 2] + x[..., 2] * y[..., 3] + x[..., 3] * y[..., 0]) -
-            (x[..., 1] * y[..., 0] + x[..., 2] * y[..., 1] + x[..., 3] * y[..., 2] + x[..., 0] * y[..., 3])
-        )
+        self.size_categories = SIZE_CATEGORIES
+        self.size_results = {}
+        # DetMetrics.update_stats는 stats에 있는 키만 모으므로 크기 구간 키를 추가해 둔다
+        self.metrics.stats.update({"pred_size": [], "target_size": []})
+
+    def _process_batch(self, preds, batch):
+        """OBBValidator._process_batch와 같은 tp에 예측별 크기 구간 (N,T)과 GT 크기 구간 (M,)을 더한다."""
+        pred_size = size_bucket(obb_area(preds["bboxes"])).cpu().numpy()
+        target_size = size_bucket(obb_area(batch["bboxes"])).cpu().numpy()
+        if batch["cls"].shape[0] == 0 or preds["cls"].shape[0] == 0:
+            tp = np.zeros((preds["cls"].shape[0], self.niou), dtype=bool)
+            return {"tp": tp, "pred_size": np.repeat(pred_size[:, None], self.niou, 1), "target_size": target_size}
+        iou = batch_probiou(batch["bboxes"], preds["bboxes"])
+        tp, target_idx = match_with_targets(preds["cls"], batch["cls"], iou, self.iouv)
+        # TP는 매칭된 GT의 구간, FP는 예측 자신의 구간 (구간별 recall의 분자와 분모가 같은 GT를 센다)
+        pred_size = np.where(tp, target_size[np.maximum(target_idx, 0)], pred_size[:, None])
+        return {"tp": tp, "pred_size": pred_size, "target_size": target_size}
+
+    def size_metrics(self):
+        """모은 stats로 크기 구간별 mAP50, mAP50-95 를 계산한다 (클래스 평균)."""
+        stats = {k: np.concatenate(v, 0) for k, v in self.metrics.stats.items() if v}
+        if "target_cls" not in stats:
+            return {}
+        num_sizes = len(self.size_categories)
+        num_classes = max(len(self.names), 1)
+        pred_cls = torch.as_tensor(stats["pred_cls"], dtype=torch.long)
+        target_cls = torch.as_tensor(stats["target_cls"], dtype=torch.long)
+        ap = bucket_ap(
+            torch.as_tensor(stats["tp"], dtype=torch.bool),
+            torch.as_tensor(stats["conf"], dtype=torch.float32),
+            pred_cls[:, None] * num_sizes + torch.as_tensor(stats["pred_size"], dtype=torch.long),
+            target_cls * num_sizes + torch.as_tensor(stats["target_size"], dtype=torch.long),
+            num_classes * num_sizes,
+        ).view(num_classes, num_sizes, -1)
+
+        results = {}
+        for s, size_name in enumerate(self.size_categories):
+            ap_size = ap[:, s]                                   # (C,T)
+            valid = ~torch.isnan(ap_size[:, 0])
+            results[f"metrics/mAP50_{size_name}(B)"] = float(ap_size[valid, 0].mean()) if valid.any() else 0.0
+            results[f"metrics/mAP50-95_{size_name}(B)"] = float(ap_size[valid].mean()) if valid.any() else 0.0
+        return results
 
-    def get_metrics(self):
-        metrics = super().get_metrics()
-        for size_name, (min_area, max_area) in self.size_categories.items():
-            pred_areas = self._calculate_obb_area(self.pred[:, :8])
-            gt_areas = self._calculate_obb_area(self.gt[:, :8])
-            mask = (gt_areas >= min_area) & (gt_areas < max_area)
-            _, _, _, map50, map = ap_per_class(self.tp, self.conf, self.pred_cls, self.target_cls, plot=False, names=self.names)[:5]
-            metrics[f'mAP50_{size_name}'] = map50[mask].mean()
-            metrics[f'mAP_{size_name}'] = map[mask].mean()
-        return metrics
\ No newline at end of file
+    def get_stats(self):
+        # super().get_stats()가 stats를 비우므로 먼저 계산한다
+        self.size_results = self.size_metrics()
+        stats = super().get_stats()
+        stats.update(self.size_results)
+        return stats
+
+    def print_results(self):
+        super().print_results()
+        for size_name in self.size_categories:
+            LOGGER.info(
+                f"{size_name:>22s}  mAP50={self.size_results.get(f'metrics/mAP50_{size_name}(B)', 0.0):.3g}"
+                f"  mAP50-95={self.size_results.get(f'metrics/mAP50-95_{size_name}(B)', 0.0):.3g}"
+            )
+
+
+class SizeAwareOBBTrainer(OBBTrainer):
+    """검증 때마다 SizeAwareOBBValidator로 크기별 mAP를 함께 기록하는 OBB 트레이너"""
+
+    def get_validator(self):
+        return SizeAwareOBBValidator(
+            self.test_loader, save_dir=self.save_dir, args=copy(self.args), _callbacks=self.callbacks
+        )
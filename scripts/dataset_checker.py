@@ -0,0 +1,213 @@
+# scripts/dataset_checker.py
+# 이미지/라벨 데이터셋 일관성 검사 (디렉터리당 os.scandir 한 번)
+# - 이미지와 라벨 이름(확장자 제외) 매칭
+# - 라벨 txt 전체를 한 번에 읽어 배열로 만든 뒤 벡터 연산으로 행 단위 검사:
+#   parse(숫자가 아닌 값), coord_count(형식과 다른 좌표 개수), unknown_class(범위 밖/정수가 아닌 클래스),
+#   out_of_range(좌표가 [0,1] 밖 또는 nan/inf), degenerate(넓이 0 이하), duplicate(같은 파일의 중복 행)
+# 222.py 평가 시점에야 보이던 "좌표 개수 불일치" 같은 문제를 학습 전에 찾는다.
+import os
+import re
+import json
+import warnings
+import numpy as np
+
+from label_store import open_label_store
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+LABEL_EXTENSION = '.txt'
+ISSUE_TYPES = ("parse", "coord_count", "unknown_class", "out_of_range", "degenerate", "duplicate")
+# 정규화 좌표 기준 넓이가 이 값 이하이면 degenerate
+MIN_AREA = 1e-12
+# 숫자 표기에 쓰이지 않는 문자 (이런 문자가 있는 줄만 따로 확인한다)
+NON_NUMERIC = re.compile(r"[^0-9eE+\-.\s]")
+# 중복 행 탐색용 고정 가중치 (클래스 + 좌표 최대 8개)
+DUPLICATE_WEIGHTS = np.random.default_rng(0).random(9)
+# 문제 종류마다 출력할 예시 수 (보고서 JSON에는 전부 들어간다)
+MAX_EXAMPLES = 10
+
+
+def scan_files(directory, extensions):
+    """directory를 os.scandir로 한 번 훑어 확장자(대소문자 무시)가 맞는 파일 경로 목록"""
+    with os.scandir(directory) as entries:
+        return [entry.path for entry in entries
+                if os.path.splitext(entry.name)[1].lower() in extensions and entry.is_file()]
+
+
+def scan_stems(directory, extensions):
+    """{확장자 제외 이름: 경로} (이름이 같은 파일이 여럿이면 하나만 남는다)"""
+    return {os.path.splitext(os.path.basename(path))[0]: path for path in scan_files(directory, extensions)}
+
+
+def _fromstring(text):
+    """공백 구분 숫자 문자열 → float64 배열 (C 파싱, 끝까지 읽지 못하면 None)"""
+    try:
+        # numpy 버전에 따라 읽을 수 없는 값에서 멈추거나(경고) ValueError를 낸다
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            return np.fromstring(text, sep=" ") if text.strip() else np.zeros(0)
+    except ValueError:
+        return None
+
+
+def _parse_values(lines, counts):
+    """줄 목록 → (숫자 배열, 숫자로 읽을 수 없는 줄 mask). 보통은 한 번의 C 파싱으로 끝난다."""
+    bad = np.zeros(len(lines), dtype=bool)
+    text = "\n".join(lines)
+    values = _fromstring(text)
+    if values is not None and len(values) == counts.sum():
+        return values, bad
+
+    # 숫자에 쓰이지 않는 문자가 있는 줄만 float()로 다시 확인해 빼고 나머지를 다시 한 번에 읽는다
+    # (nan/inf는 숫자로 읽히고 범위 검사에서 걸린다)
+    line_starts = np.cumsum([0] + [len(line) + 1 for line in lines[:-1]])
+    positions = [m.start() for m in NON_NUMERIC.finditer(text)]
+    for i in np.unique(np.searchsorted(line_starts, positions, "right") - 1).tolist():
+        try:
+            [float(token) for token in lines[i].split()]
+        except ValueError:
+            bad[i] = True
+    values = _fromstring("\n".join(line for line, is_bad in zip(lines, bad) if not is_bad))
+    if values is not None and len(values) == counts[~bad].sum():
+        return values, bad
+
+    # "1.2.3"처럼 문자 검사를 통과했지만 읽을 수 없는 값이 있으면 줄 단위로 읽는다
+    parsed = []
+    for i, line in enumerate(lines):
+        try:
+            parsed.extend([float(token) for token in line.split()])
+        except ValueError:
+            bad[i] = True
+    return np.asarray(parsed, dtype=np.float64), bad
+
+
+def parse_label_texts(texts, width):
+    """
+    라벨 파일 내용 목록을 한 번에 파싱한다 (빈 줄은 무시).
+    반환: file_idx (L,), line_no (L,), 줄 문제 {"parse", "coord_count"} (L,) bool,
+          rows (R, width) 좌표 개수가 맞는 줄, row_line (R,) 각 행의 줄 번호(L 기준)
+    """
+    file_idx, line_no, lines, counts = [], [], [], []
+    for i, text in enumerate(texts):
+        for n, line in enumerate(text.splitlines(), 1):
+            count = len(line.split())
+            if count:
+                file_idx.append(i)
+                line_no.append(n)
+                lines.append(line)
+                counts.append(count)
+    counts = np.asarray(counts, dtype=np.int64)
+    values, bad = _parse_values(lines, counts)
+
+    counts_ok = np.where(bad, 0, counts)
+    starts = np.cumsum(counts_ok) - counts_ok
+    valid = (counts == width) & ~bad
+    row_line = np.flatnonzero(valid)
+    rows = values[starts[valid][:, None] + np.arange(width)].reshape(-1, width)
+    line_issues = {"parse": bad, "coord_count": (counts != width) & ~bad}
+    return np.asarray(file_idx, dtype=np.int64), np.asarray(line_no, dtype=np.int64), line_issues, rows, row_line
+
+
+def row_issues(file_idx, class_ids, coords, num_classes):
+    """행 단위 문제 mask {"unknown_class", "out_of_range", "degenerate", "duplicate"} (R,) bool"""
+    class_ids = np.asarray(class_ids, dtype=np.float64)
+    coords = np.asarray(coords, dtype=np.float64)
+    if coords.shape[1] == 8:
+        # OBB 4점 polygon 넓이 (shoelace)
+        x, y = coords[:, 0::2], coords[:, 1::2]
+        area = 0.5 * np.abs((x * np.roll(y, -1, axis=1) - np.roll(x, -1, axis=1) * y).sum(axis=1))
+    else:
+        area = np.where((coords[:, 2] > 0) & (coords[:, 3] > 0), coords[:, 2] * coords[:, 3], 0.0)
+
+    # 같은 파일 안에서 완전히 같은 행은 처음 것만 두고 나머지를 중복으로 본다.
+    # 행 전체를 정렬하는 대신 (파일, 행의 임의 가중합)으로 안정 정렬해 같은 행끼리 붙여 놓고 이웃끼리만 비교한다.
+    keys = np.column_stack([class_ids, coords])
+    order = np.lexsort((keys @ DUPLICATE_WEIGHTS[:keys.shape[1]], file_idx))
+    same = (file_idx[order][1:] == file_idx[order][:-1]) & (keys[order][1:] == keys[order][:-1]).all(axis=1)
+    duplicate = np.zeros(len(keys), dtype=bool)
+    duplicate[order[1:][same]] = True
+
+    return {
+        "unknown_class": (class_ids != np.floor(class_ids)) | (class_ids < 0) | (class_ids >= num_classes),
+        "out_of_range": ((coords < 0) | (coords > 1) | ~np.isfinite(coords)).any(axis=1),
+        "degenerate": area <= MIN_AREA,
+        "duplicate": duplicate,
+    }
+
+
+def _issue_list(names, file_idx, line_no, selected):
+    """selected(줄 mask 또는 줄 번호 배열) → [{"file", "line"}]"""
+    return [{"file": names[f] + LABEL_EXTENSION, "line": n}
+            for f, n in zip(file_idx[selected].tolist(), line_no[selected].tolist())]
+
+
+def check_dataset(image_dir, label_dir, num_coords, num_classes, label_store=None):
+    """
+    image_dir/label_dir(또는 패킹 라벨 저장소)를 검사해 보고서 dict를 반환한다.
+    num_coords: 8(OBB) 또는 4(x_center y_center w h), num_classes: 클래스 수 (0 ~ num_classes-1만 허용)
+    """
+    store = open_label_store(label_store)
+    images = scan_stems(image_dir, IMAGE_EXTENSIONS)
+    width = num_coords + 1
+
+    if store is not None:
+        names = list(store.names)
+        offsets = np.asarray(store.offsets)
+        file_idx = np.repeat(np.arange(len(names)), np.diff(offsets))
+        line_no = np.arange(len(file_idx)) - offsets[file_idx] + 1
+        class_ids, coords = np.asarray(store.classes), np.asarray(store.coords, dtype=np.float64)
+        # 저장소는 좌표 개수가 고정이므로 형식이 다르면 모든 행이 불일치다
+        mismatch = np.full(len(file_idx), store.num_coords != num_coords)
+        line_issues = {"parse": np.zeros(len(file_idx), dtype=bool), "coord_count": mismatch}
+        row_line = np.flatnonzero(~mismatch)
+        class_ids, coords = class_ids[row_line], coords[row_line]
+    else:
+        label_paths = scan_stems(label_dir, (LABEL_EXTENSION,))
+        names = sorted(label_paths)
+        texts = []
+        for name in names:
+            with open(label_paths[name], 'r') as f:
+                texts.append(f.read())
+        file_idx, line_no, line_issues, rows, row_line = parse_label_texts(texts, width)
+        class_ids, coords = rows[:, 0], rows[:, 1:]
+
+    issues = {key: _issue_list(names, file_idx, line_no, mask) for key, mask in line_issues.items()}
+    for key, mask in row_issues(file_idx[row_line], class_ids, coords, num_classes).items():
+        issues[key] = _issue_list(names, file_idx, line_no, row_line[mask])
+
+    label_set = set(names)
+    return {
+        "images": len(images),
+        "labels": len(names),
+        "rows": len(file_idx),
+        "empty_labels": len(names) - len(np.unique(file_idx)),
+        "missing_labels": sorted(set(images) - label_set),
+        "missing_images": sorted(label_set - set(images)),
+        "issues": {key: issues[key] for key in ISSUE_TYPES},
+    }
+
+
+def print_report(report, max_examples=MAX_EXAMPLES):
+    print(f"🔍 총 이미지 파일 수: {report['images']}")
+    print(f"🔍 총 라벨 파일 수: {report['labels']} (라벨 {report['rows']}줄, 빈 라벨 파일 {report['empty_labels']}개)")
+    ok = True
+    for key, title in (("missing_labels", "라벨이 없는 이미지"), ("missing_images", "이미지가 없는 라벨")):
+        if report[key]:
+            ok = False
+            print(f"⚠️ {title}: {len(report[key])}")
+            for name in report[key][:max_examples]:
+                print(f" - {name}")
+    for key, items in report["issues"].items():
+        if items:
+            ok = False
+            print(f"⚠️ 라벨 오류 [{key}]: {len(items)}줄")
+            for item in items[:max_examples]:
+                print(f" - {item['file']}:{item['line']}")
+    if ok:
+        print("✅ 모든 이미지와 라벨 파일이 정확히 일치하고 라벨 행에 문제가 없습니다.")
+    return ok
+
+
+def write_report(report, report_path):
+    os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1, ensure_ascii=False)
@@ -0,0 +1,124 @@
+# scripts/dataset_manifest.py
+# 증분 빌드용 매니페스트
+# 입력 파일(JSON, 이미지)의 내용 해시와 변환 파라미터, 파생 산출물 경로를 기록해 두고
+# 다음 실행에서는 바뀐 파일만 다시 처리하고, 사라진 입력의 산출물은 삭제한다.
+import os
+import json
+import hashlib
+
+MANIFEST_VERSION = 1
+
+
+def manifest_path_for(output_dir):
+    """출력 디렉토리 옆에 두는 매니페스트 경로 (예: 4_800labels → 4_800labels.manifest.json)"""
+    return os.path.normpath(output_dir) + ".manifest.json"
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """파일 내용의 SHA-1 해시"""
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _normalize_params(params):
+    # set 등 JSON으로 저장할 수 없는 값을 비교 가능한 형태로 바꾼다
+    if isinstance(params, dict):
+        return {str(k): _normalize_params(v) for k, v in sorted(params.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(params, (set, frozenset)):
+        return sorted(_normalize_params(v) for v in params)
+    if isinstance(params, (list, tuple)):
+        return [_normalize_params(v) for v in params]
+    return params
+
+
+class DatasetManifest:
+    """
+    key(보통 파일 이름) 단위로 입력 해시와 산출물 목록을 기록한다.
+    params가 이전 실행과 다르면 모든 항목을 다시 처리해야 하므로 기록을 비운다.
+    """
+
+    def __init__(self, path, params=None):
+        self.path = path
+        self.params = _normalize_params(params or {})
+        self.entries = {}
+
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    stored = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                print(f"⚠️ 매니페스트를 읽을 수 없어 전체를 다시 처리합니다: {path}")
+                stored = {}
+            if stored.get("version") == MANIFEST_VERSION and stored.get("params") == self.params:
+                self.entries = stored.get("entries", {})
+            elif stored:
+                print(f"ℹ️ 변환 파라미터가 바뀌어 전체를 다시 처리합니다: {path}")
+
+    def _input_state(self, path, previous=None):
+        # 크기와 수정 시각이 같으면 이전 해시를 재사용해 매번 전체를 읽지 않는다
+        st = os.stat(path)
+        if previous and previous.get("size") == st.st_size and previous.get("mtime_ns") == st.st_mtime_ns:
+            return previous
+        return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha1": file_digest(path)}
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def is_fresh(self, key, inputs, outputs):
+        """입력 내용과 산출물 목록이 기록과 같고 산출물이 모두 존재하면 True"""
+        entry = self.entries.get(key)
+        if entry is None or entry.get("outputs") != list(outputs):
+            return False
+        if not all(os.path.exists(p) for p in outputs):
+            return False
+
+        recorded = entry.get("inputs", {})
+        if set(recorded) != set(inputs):
+            return False
+        for path in inputs:
+            if not os.path.exists(path):
+                return False
+            state = self._input_state(path, recorded[path])
+            if state["sha1"] != recorded[path]["sha1"]:
+                return False
+            # touch만 된 파일은 stat 정보만 갱신해 다음 실행에서 해시를 생략한다
+            recorded[path] = state
+        return True
+
+    def record(self, key, inputs, outputs, **extra):
+        """처리가 끝난 항목을 기록한다 (입력 해시는 기록 시점의 내용으로 계산)"""
+        previous = (self.entries.get(key) or {}).get("inputs", {})
+        entry = {
+            "inputs": {p: self._input_state(p, previous.get(p)) for p in inputs},
+            "outputs": list(outputs),
+        }
+        entry.update(extra)
+        self.entries[key] = entry
+
+    def discard(self, key):
+        """기록만 지운다 (다음 실행에서 다시 처리됨)"""
+        self.entries.pop(key, None)
+
+    def prune(self, keys):
+        """keys에 없는 항목의 산출물을 삭제하고 기록에서 제거한다. 제거된 key 목록을 반환한다."""
+        keys = set(keys)
+        removed = [key for key in self.entries if key not in keys]
+        for key in removed:
+            for output in self.entries[key].get("outputs", []):
+                if os.path.exists(output):
+                    os.remove(output)
+            del self.entries[key]
+        return removed
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "version": MANIFEST_VERSION,
+                "params": self.params,
+                "entries": self.entries,
+            }, f, indent=1, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
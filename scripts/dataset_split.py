@@ -0,0 +1,166 @@
+# scripts/dataset_split.py
+# train/val 분할 공통 함수 (복사 없이)
+# - 파일 이름을 정렬한 뒤 고정 seed로 섞어 같은 입력이면 항상 같은 분할이 나온다
+# - k-fold 교차 검증용 분할도 같은 순서에서 잘라 만든다
+# - 배치 방식: "copy"(복사), "hardlink", "symlink", "list"
+#   "list"는 파일을 만들지 않고 ultralytics 이미지 목록 txt(train.txt/val.txt)만 쓴다.
+#   ultralytics는 이미지 경로의 마지막 /images/를 /labels/로 바꿔 라벨을 찾으므로
+#   <분할>/images, <분할>/labels를 원본 이미지/라벨 디렉터리로 가는 디렉터리 심볼릭 링크로 만들고 목록은 그 경로를 가리킨다.
+# 분할마다 data.yaml(train/val/nc/names)을 함께 써서 학습에 바로 넘길 수 있다.
+import os
+import json
+import random
+import shutil
+
+SPLIT_MODES = ("copy", "hardlink", "symlink", "list")
+SEED = 0
+IMAGE_EXT = ".jpg"
+LABEL_EXT = ".txt"
+
+
+def seeded_order(names, seed=SEED):
+    """정렬 후 seed로 섞은 목록 (디렉터리 나열 순서와 무관하게 재현된다)"""
+    order = sorted(names)
+    random.Random(seed).shuffle(order)
+    return order
+
+
+def train_val_split(names, train_ratio, seed=SEED):
+    order = seeded_order(names, seed)
+    train_count = int(len(order) * train_ratio)
+    return order[:train_count], order[train_count:]
+
+
+def incremental_split(names, manifest, train_ratio, seed=SEED):
+    """
+    manifest에 기록된 train/val 배정은 그대로 두고, 배정이 없는 파일만 seed 순서로 나눠 비율을 맞춘다.
+    반환: (train, val, 새로 배정한 파일 목록)
+    """
+    assigned = {name: (manifest.get(name) or {}).get("split") for name in names}
+    train_files = [name for name, split in assigned.items() if split == "train"]
+    val_files = [name for name, split in assigned.items() if split == "val"]
+    new_files = seeded_order([name for name, split in assigned.items() if split not in ("train", "val")], seed)
+    need_train = min(max(int(len(assigned) * train_ratio) - len(train_files), 0), len(new_files))
+    return train_files + new_files[:need_train], val_files + new_files[need_train:], new_files
+
+
+def kfold_splits(names, k, seed=SEED):
+    """k개 fold의 (train, val) 목록. 섞은 순서를 k개 연속 구간으로 나눠 차례로 val로 쓴다."""
+    if k < 2:
+        raise ValueError(f"k-fold는 2 이상이어야 합니다: {k}")
+    order = seeded_order(names, seed)
+    bounds = [len(order) * i // k for i in range(k + 1)]
+    return [
+        (order[:bounds[i]] + order[bounds[i + 1]:], order[bounds[i]:bounds[i + 1]])
+        for i in range(k)
+    ]
+
+
+def place_file(src, dst, mode):
+    """src를 dst에 mode("copy", "hardlink", "symlink")로 둔다. dst가 이미 있으면 바꾼다."""
+    if os.path.lexists(dst):
+        if mode == "hardlink" and os.path.samefile(src, dst):
+            return
+        if mode == "symlink" and os.path.islink(dst) and os.readlink(dst) == os.path.abspath(src):
+            return
+        os.remove(dst)
+    if mode == "copy":
+        shutil.copy2(src, dst)
+    elif mode == "hardlink":
+        os.link(src, dst)
+    elif mode == "symlink":
+        os.symlink(os.path.abspath(src), dst)
+    else:
+        raise ValueError(f"알 수 없는 분할 방식: {mode} (가능: {', '.join(SPLIT_MODES)})")
+
+
+def link_dir(target, link):
+    """link를 target 디렉터리로 가는 심볼릭 링크로 만든다 (실제 디렉터리가 있으면 지우지 않고 오류)."""
+    target = os.path.abspath(target)
+    if os.path.islink(link):
+        if os.readlink(link) == target:
+            return
+        os.remove(link)
+    elif os.path.exists(link):
+        raise FileExistsError(f"링크 자리에 실제 디렉터리가 있습니다: {link}")
+    os.makedirs(os.path.dirname(os.path.abspath(link)), exist_ok=True)
+    os.symlink(target, link, target_is_directory=True)
+
+
+def remove_stale(directory, keep, ext):
+    """directory에서 keep(확장자 제외 이름)에 없는 ext 파일/링크를 지운다. 지운 개수를 반환한다."""
+    keep = set(keep)
+    removed = 0
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            name, file_ext = os.path.splitext(entry.name)
+            if file_ext == ext and name not in keep:
+                os.remove(entry.path)
+                removed += 1
+    return removed
+
+
+def write_image_list(path, image_dir, names, ext=IMAGE_EXT):
+    """ultralytics 이미지 목록 txt (한 줄에 절대 경로 하나)"""
+    image_dir = os.path.abspath(image_dir)
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(os.path.join(image_dir, name + ext) + "\n" for name in names)
+
+
+def write_data_yaml(path, train, val, class_names):
+    """학습용 data.yaml (names는 JSON 배열 = YAML flow 형식으로 쓴다)"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"train: {os.path.abspath(train)}\n")
+        f.write(f"val: {os.path.abspath(val)}\n")
+        f.write(f"nc: {len(class_names)}\n")
+        f.write(f"names: {json.dumps(list(class_names), ensure_ascii=False)}\n")
+
+
+def write_split(train_files, val_files, images_dir, labels_dir, output_dir, mode, class_names,
+                image_ext=IMAGE_EXT, label_ext=LABEL_EXT, manifest=None):
+    """
+    output_dir에 train/val 분할을 만들고 data.yaml 경로를 반환한다.
+    list: output_dir/{train,val}.txt + {train,val}/{images,labels} 디렉터리 링크 (파일 수와 무관하게 링크 4개)
+    copy/hardlink/symlink: output_dir/{train,val}/{images,labels}/ 에 파일을 두고, 분할에서 빠진 파일은 지운다.
+    manifest가 있으면 입력과 산출물이 기록과 같은 파일은 다시 두지 않고, 둔 파일은 split과 함께 기록한다.
+    """
+    if mode not in SPLIT_MODES:
+        raise ValueError(f"알 수 없는 분할 방식: {mode} (가능: {', '.join(SPLIT_MODES)})")
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {}
+    for split, files in (("train", train_files), ("val", val_files)):
+        split_dir = os.path.join(output_dir, split)
+        image_dst, label_dst = os.path.join(split_dir, "images"), os.path.join(split_dir, "labels")
+        if mode == "list":
+            link_dir(images_dir, image_dst)
+            link_dir(labels_dir, label_dst)
+            paths[split] = os.path.join(output_dir, split + ".txt")
+            write_image_list(paths[split], image_dst, files, image_ext)
+            continue
+        os.makedirs(image_dst, exist_ok=True)
+        os.makedirs(label_dst, exist_ok=True)
+        remove_stale(image_dst, files, image_ext)
+        remove_stale(label_dst, files, label_ext)
+        for name in files:
+            inputs = [os.path.join(images_dir, name + image_ext), os.path.join(labels_dir, name + label_ext)]
+            outputs = [os.path.join(image_dst, name + image_ext), os.path.join(label_dst, name + label_ext)]
+            if manifest and manifest.is_fresh(name, inputs, outputs):
+                continue
+            for src, dst in zip(inputs, outputs):
+                place_file(src, dst, mode)
+            if manifest:
+                manifest.record(name, inputs, outputs, split=split)
+        paths[split] = split_dir
+
+    yaml_path = os.path.join(output_dir, "data.yaml")
+    write_data_yaml(yaml_path, paths["train"], paths["val"], class_names)
+    return yaml_path
+
+
+def write_kfold(names, images_dir, labels_dir, output_dir, k, mode, class_names, seed=SEED):
+    """output_dir/fold_<i>/ 마다 write_split으로 k-fold 분할을 만들고 data.yaml 경로 목록을 반환한다."""
+    return [
+        write_split(train_files, val_files, images_dir, labels_dir,
+                    os.path.join(output_dir, f"fold_{i}"), mode, class_names)
+        for i, (train_files, val_files) in enumerate(kfold_splits(names, k, seed))
+    ]
@@ -0,0 +1,140 @@
+# scripts/eval_cache.py
+# 이미지별 매칭 결과 캐시 (fast_coco_eval 용)
+# 이미지 하나의 GT/예측 배열 내용과 매칭 파라미터의 해시를 키로 match_image 결과를 <cache_dir>/<키>.npz 에 저장한다.
+# 다시 평가할 때는 내용이 바뀐 이미지만 새로 매칭하고 나머지는 캐시에서 읽은 뒤 accumulate/summarize만 다시 한다.
+# score 임계값 스윕은 매칭을 다시 하지 않고 accumulate(score_threshold=...)만 반복한다.
+# 면적 구간(AREA_RANGES)은 COCO 규칙상 매칭 자체(무시 GT 우선순위)를 바꾸므로 키에 포함되어, 바꾸면 전체를 다시 매칭한다.
+# 캐시는 기본으로 이번 평가의 키만 남기고 정리한다 (예측을 바꿔 가며 평가해도 파일이 쌓이지 않는다).
+import os
+import json
+import hashlib
+import numpy as np
+
+from fast_coco_eval import (
+    MAX_DETS, NUM_WORKERS, IOU_THRESHOLDS, AREA_RANGES,
+    prepare_images, run_matching, accumulate, summarize,
+)
+
+CACHE_VERSION = 1
+
+
+def match_params(max_det, obb=False, iou_thresholds=IOU_THRESHOLDS, area_ranges=AREA_RANGES):
+    """매칭 결과를 바꾸는 파라미터 (바뀌면 모든 이미지를 다시 매칭한다)"""
+    return {
+        "version": CACHE_VERSION,
+        "max_det": int(max_det),
+        "obb": bool(obb),
+        "iou_thresholds": [float(t) for t in iou_thresholds],
+        "area_ranges": {name: [float(lo), float(hi)] for name, (lo, hi) in area_ranges.items()},
+    }
+
+
+def image_key(image, params):
+    """prepare_images 항목 하나(image_id 제외한 배열 내용)와 파라미터의 SHA-1"""
+    h = hashlib.sha1(json.dumps(params, sort_keys=True).encode())
+    for array in image[1:]:
+        array = np.ascontiguousarray(array, dtype=np.float64)
+        h.update(str(array.shape).encode())
+        h.update(array.tobytes())
+    return h.hexdigest()
+
+
+class MatchCache:
+    """<cache_dir>/<키>.npz 로 이미지별 매칭 결과를 저장/조회한다."""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".npz")
+
+    def load(self, key):
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                return data["scores"], data["tps"], data["fps"], data["num_gt"]
+        except (OSError, ValueError, KeyError):
+            print(f"⚠️ 캐시 파일을 읽을 수 없어 다시 매칭합니다: {path}")
+            return None
+
+    def store(self, key, result):
+        scores, tps, fps, num_gt = result
+        tmp_path = self._path(key) + ".tmp.npz"
+        np.savez(tmp_path, scores=scores, tps=tps, fps=fps, num_gt=num_gt)
+        os.replace(tmp_path, self._path(key))
+
+    def prune(self, keep_keys):
+        """keep_keys에 없는 캐시 파일을 지운다. 지운 개수를 반환한다."""
+        keep = set(keep_keys)
+        removed = 0
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".npz") and name[:-len(".npz")] not in keep:
+                os.remove(os.path.join(self.cache_dir, name))
+                removed += 1
+        return removed
+
+
+def cached_matching(images, cache_dir, max_det, obb=False, num_workers=NUM_WORKERS, prune=True):
+    """
+    images(prepare_images 결과)를 매칭하되, 캐시에 있는 이미지는 건너뛴다.
+    prune=True이면 이번 평가에 쓰지 않은 캐시 파일을 지운다
+    (같은 cache_dir를 다른 예측/max_det 평가와 함께 쓰려면 False로 둔다).
+    반환: image_id 순의 match_image 결과 목록
+    """
+    cache = MatchCache(cache_dir)
+    params = match_params(max_det, obb)
+    keys = [image_key(image, params) for image in images]
+
+    per_image = [cache.load(key) for key in keys]
+    stale = [i for i, result in enumerate(per_image) if result is None]
+    if stale:
+        fresh = run_matching([images[i] for i in stale], max_det, obb, num_workers)
+        for i, result in zip(stale, fresh):
+            cache.store(keys[i], result)
+            per_image[i] = result
+    print(f"ℹ️ 매칭 캐시: 재사용 {len(images) - len(stale)}개, 다시 매칭 {len(stale)}개")
+
+    if prune:
+        removed = cache.prune(keys)
+        if removed:
+            print(f"ℹ️ 사용하지 않는 캐시 {removed}개 삭제")
+    return per_image
+
+
+def cached_coco_evaluation(gt_file, dt_file, cache_dir, max_dets=MAX_DETS, score_threshold=0.0,
+                           num_workers=NUM_WORKERS, obb=False, verbose=True, prune=True):
+    """fast_coco_evaluation과 같은 stats를 캐시를 이용해 계산한다 (prune은 cached_matching 참고)."""
+    images = prepare_images(gt_file, dt_file, obb)
+    per_image = cached_matching(images, cache_dir, max(max_dets), obb, num_workers, prune)
+    precision, recall = accumulate(per_image, max_dets, score_threshold=score_threshold)
+    return summarize(precision, recall, max_dets, verbose=verbose)
+
+
+def score_threshold_sweep(gt_file, dt_file, cache_dir, thresholds, max_dets=MAX_DETS,
+                          num_workers=NUM_WORKERS, obb=False, prune=True):
+    """
+    score 임계값별 stats를 {임계값: stats}로 반환한다. 매칭은 (캐시를 통해) 한 번만 한다.
+    점수 내림차순 탐욕 매칭이므로 낮은 점수의 예측을 빼도 나머지의 매칭 결과는 그대로이다.
+    """
+    images = prepare_images(gt_file, dt_file, obb)
+    per_image = cached_matching(images, cache_dir, max(max_dets), obb, num_workers, prune)
+    results = {}
+    for threshold in thresholds:
+        precision, recall = accumulate(per_image, max_dets, score_threshold=threshold)
+        results[threshold] = summarize(precision, recall, max_dets, verbose=False)
+        print(f"score ≥ {threshold:.2f}: AP={results[threshold][0]:.3f} AP50={results[threshold][1]:.3f} "
+              f"AR={results[threshold][8]:.3f}")
+    return results
+
+
+if __name__ == "__main__":
+    gt_path = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset/ground_truth.json"
+    dt_path = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/outputs_800yolo/run3/coco_predictions.json"
+    cache_path = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/outputs_800yolo/run3/eval_cache"
+
+    results = cached_coco_evaluation(gt_path, dt_path, cache_path)
+    print("COCO Evaluation Results:", results)
+    score_threshold_sweep(gt_path, dt_path, cache_path, [0.1, 0.25, 0.5, 0.75])
@@ -0,0 +1,214 @@
+# scripts/eval_gallery.py
+# GT/예측 비교 결과를 화면 없이(headless) 파일로 내보내는 갤러리
+# - 이미지마다 GT(파랑)/예측(빨강) 박스를 OpenCV로 직접 그려 overlays/<이름>.jpg 로 저장하고
+# - 썸네일(thumbs/)이 columns × rows장 모일 때마다 저장된 파일을 읽어 격자 contact sheet(sheets/sheet_000.jpg ...)를 쓰고
+# - 썸네일을 지연 로딩하는 정적 HTML 갤러리(index.html)를 쓴다.
+# 이미지는 한 장씩 프로세스 풀에서 그리고 워커는 썸네일 경로만 돌려주므로, 메모리에는 sheet 한 장 분량만 남는다.
+import os
+import html
+
+import cv2
+import numpy as np
+
+from batch_runner import run_ordered
+from render_engine import draw_polygon_groups, init_opencv_worker, text_mask, write_jpeg, JPEG_QUALITY
+from size_buckets import size_index, SIZE_NAMES
+from box_matching import group_by_image, empty_group, match_summary
+
+NUM_WORKERS = os.cpu_count() or 1
+# 썸네일 한 변 길이 (px, 비율을 유지해 이 정사각형 안에 맞춘다)
+THUMB_SIZE = 400
+# contact sheet 한 장의 격자 (열 × 행)
+SHEET_COLUMNS = 4
+SHEET_ROWS = 4
+# 썸네일/overlay 위쪽 제목 띠 높이 (px)
+TITLE_HEIGHT = 22
+
+GT_COLOR = (255, 0, 0)      # BGR 파랑
+PRED_COLOR = (0, 0, 255)    # BGR 빨강
+PRED_TEXT_SIZE = (70, 12)
+
+
+def xywh_to_polygons(boxes):
+    """[x, y, w, h] (N,4) → 정수 4점 polygon (N,4,2)"""
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    x1, y1 = boxes[:, 0], boxes[:, 1]
+    x2, y2 = x1 + boxes[:, 2], y1 + boxes[:, 3]
+    points = np.stack([np.stack([x1, y1], 1), np.stack([x2, y1], 1),
+                       np.stack([x2, y2], 1), np.stack([x1, y2], 1)], 1)
+    return np.round(points).astype(np.int32)
+
+
+def add_title(image, title, height=TITLE_HEIGHT):
+    """이미지 위에 검은 제목 띠를 붙인다 (OpenCV 글꼴은 ASCII만 그린다)."""
+    bar = np.zeros((height, image.shape[1], 3), dtype=np.uint8)
+    cv2.putText(bar, title, (4, height - 7), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1, cv2.LINE_AA)
+    return np.vstack([bar, image])
+
+
+def fit_thumbnail(image, size=THUMB_SIZE):
+    """비율을 유지해 size×size 안에 맞추고 남는 곳은 검게 채운다."""
+    height, width = image.shape[:2]
+    scale = size / max(height, width)
+    resized = cv2.resize(image, (max(int(width * scale), 1), max(int(height * scale), 1)),
+                         interpolation=cv2.INTER_AREA)
+    thumb = np.zeros((size, size, 3), dtype=np.uint8)
+    thumb[:resized.shape[0], :resized.shape[1]] = resized
+    return thumb
+
+
+def draw_comparison(image, gt_boxes, pred_boxes, thickness=2, pred_sizes=False):
+    """
+    픽셀 [x, y, w, h] GT(파랑)/예측(빨강) 박스를 한 번씩의 polylines로 그린다.
+    pred_sizes=True이면 예측 박스에 COCO 크기 구간(small/medium/large)을 겹치지 않는 위치에만 적는다.
+    """
+    gt_polygons, pred_polygons = xywh_to_polygons(gt_boxes), xywh_to_polygons(pred_boxes)
+    draw_polygon_groups(image, gt_polygons, np.zeros(len(gt_polygons), dtype=int), [GT_COLOR], thickness)
+    draw_polygon_groups(image, pred_polygons, np.zeros(len(pred_polygons), dtype=int), [PRED_COLOR], thickness)
+    if pred_sizes and len(pred_polygons):
+        pred_boxes = np.asarray(pred_boxes, dtype=np.float64).reshape(-1, 4)
+        sizes = size_index(pred_boxes[:, 2] * pred_boxes[:, 3])
+        anchors = pred_polygons[:, 0] + [1, 10]
+        for i in np.flatnonzero(text_mask(anchors, PRED_TEXT_SIZE)):
+            cv2.putText(image, f"pred: {SIZE_NAMES[sizes[i]]}", (int(anchors[i, 0]), int(anchors[i, 1])),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.35, PRED_COLOR, 1)
+    return image
+
+
+def comparison_entries(gt_data, pred_data, image_dir, image_ids=None, iou_threshold=0.5,
+                       normalized=False, pred_sizes=False):
+    """
+    COCO GT dict와 예측 목록으로 render_gallery 항목을 만든다 (image_ids가 None이면 GT의 모든 이미지).
+    제목/설명에는 1:1 매칭 요약을 넣는다. 축별 배율은 IoU를 바꾸지 않으므로 정규화 좌표 그대로 매칭한다.
+    """
+    image_id_to_file = {img["id"]: img["file_name"] for img in gt_data["images"]}
+    gt_by_image = group_by_image(gt_data["annotations"])
+    pred_by_image = group_by_image(pred_data)
+
+    entries = []
+    for image_id in (image_id_to_file if image_ids is None else image_ids):
+        file_name = image_id_to_file[image_id]
+        gt_boxes = gt_by_image.get(image_id, empty_group())["boxes"]
+        pred_boxes = pred_by_image.get(image_id, empty_group())["boxes"]
+        summary = match_summary(gt_boxes, pred_boxes, iou_threshold)
+        entries.append({
+            "name": os.path.splitext(os.path.basename(file_name))[0],
+            "image_path": os.path.join(image_dir, file_name),
+            "gt_boxes": gt_boxes, "pred_boxes": pred_boxes,
+            "normalized": normalized, "pred_sizes": pred_sizes,
+            "title": (f"{file_name}  IoU {summary['mean_iou']:.3f}  matched {summary['matched']}  "
+                      f"missed {summary['missed_gt']}  false {summary['false_pred']}"),
+            "caption": (f"{file_name} - 매칭 IoU: {summary['mean_iou']:.3f} (매칭 {summary['matched']}, "
+                        f"미검출 {summary['missed_gt']}, 오검출 {summary['false_pred']})"),
+        })
+    return entries
+
+
+def render_entry(entry, output_dir, thumb_size=THUMB_SIZE, quality=JPEG_QUALITY):
+    """
+    갤러리 항목 하나를 그려 overlay와 썸네일을 저장하고 썸네일 경로를 반환한다 (실패하면 None).
+    entry: {"name", "image_path", "gt_boxes", "pred_boxes", "title", "normalized", "pred_sizes"}
+    normalized=True이면 박스가 정규화 좌표이므로 이미지 크기를 곱해 픽셀로 바꾼다.
+    """
+    image = cv2.imread(entry["image_path"])
+    if image is None:
+        print(f"⚠ Warning: {entry['image_path']} 로드 실패. 스킵합니다.")
+        return None
+    gt_boxes = np.asarray(entry["gt_boxes"], dtype=np.float64).reshape(-1, 4)
+    pred_boxes = np.asarray(entry["pred_boxes"], dtype=np.float64).reshape(-1, 4)
+    if entry.get("normalized"):
+        scale = [image.shape[1], image.shape[0], image.shape[1], image.shape[0]]
+        gt_boxes, pred_boxes = gt_boxes * scale, pred_boxes * scale
+
+    thickness = max(1, round(max(image.shape[:2]) / 800))
+    draw_comparison(image, gt_boxes, pred_boxes, thickness, entry.get("pred_sizes", False))
+    write_jpeg(os.path.join(output_dir, "overlays", entry["name"] + ".jpg"), add_title(image, entry["title"]), quality)
+
+    thumb_path = os.path.join(output_dir, "thumbs", entry["name"] + ".jpg")
+    write_jpeg(thumb_path, add_title(fit_thumbnail(image, thumb_size), entry["name"]), quality)
+    return thumb_path
+
+
+def _render_task(task):
+    # run_ordered는 작업 하나를 인자 하나로 넘긴다
+    return render_entry(*task)
+
+
+def write_contact_sheet(thumb_paths, path, columns=SHEET_COLUMNS, quality=JPEG_QUALITY):
+    """
+    저장된 같은 크기의 썸네일 파일들을 columns 열 격자 한 장으로 저장한다.
+    썸네일은 이 sheet를 만드는 동안에만 읽으므로 전체 갤러리 크기와 무관하게 sheet 한 장 분량만 메모리에 둔다.
+    """
+    thumbs = [cv2.imread(thumb_path) for thumb_path in thumb_paths]
+    cell_h, cell_w = thumbs[0].shape[:2]
+    used_rows = (len(thumbs) + columns - 1) // columns
+    sheet = np.zeros((used_rows * cell_h, columns * cell_w, 3), dtype=np.uint8)
+    for k, thumb in enumerate(thumbs):
+        r, c = divmod(k, columns)
+        sheet[r * cell_h:(r + 1) * cell_h, c * cell_w:(c + 1) * cell_w] = thumb
+    write_jpeg(path, sheet, quality)
+    return path
+
+
+def sheet_path(output_dir, index):
+    """index번째 contact sheet 경로"""
+    return os.path.join(output_dir, "sheets", f"sheet_{index:03d}.jpg")
+
+
+def write_gallery_html(entries, output_dir, title="GT / Prediction gallery"):
+    """썸네일을 지연 로딩(loading="lazy")하고 클릭하면 원본 크기 overlay를 여는 정적 HTML을 쓴다."""
+    cards = []
+    for entry in entries:
+        name = html.escape(entry["name"])
+        caption = html.escape(entry.get("caption", entry["title"]))
+        cards.append(
+            f'<figure><a href="overlays/{name}.jpg"><img loading="lazy" src="thumbs/{name}.jpg" alt="{name}"></a>'
+            f'<figcaption>{caption}</figcaption></figure>'
+        )
+    page = (
+        "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+        f"<title>{html.escape(title)}</title>"
+        "<style>body{font-family:sans-serif;background:#222;color:#ddd}"
+        "main{display:flex;flex-wrap:wrap;gap:8px}figure{margin:0;width:" + str(THUMB_SIZE) + "px}"
+        "img{width:100%}figcaption{font-size:12px}</style></head>\n"
+        f"<body><h1>{html.escape(title)}</h1><p>파랑: GT, 빨강: 예측 ({len(entries)}장)</p>\n<main>\n"
+        + "\n".join(cards) + "\n</main></body></html>\n"
+    )
+    path = os.path.join(output_dir, "index.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(page)
+    return path
+
+
+def render_gallery(entries, output_dir, num_workers=NUM_WORKERS, thumb_size=THUMB_SIZE,
+                   columns=SHEET_COLUMNS, rows=SHEET_ROWS, quality=JPEG_QUALITY, title="GT / Prediction gallery"):
+    """
+    entries(render_entry 형식, "caption"은 HTML 설명)를 모두 그려 overlay, 썸네일, contact sheet, index.html을 만든다.
+    반환: index.html 경로
+    """
+    for sub in ("overlays", "thumbs", "sheets"):
+        os.makedirs(os.path.join(output_dir, sub), exist_ok=True)
+
+    tasks = [(entry, output_dir, thumb_size, quality) for entry in entries]
+    print(f"🚀 {len(tasks)}개 이미지 렌더링 시작 (워커 {max(num_workers, 1)}개)")
+    # 썸네일 경로가 입력 순서대로 columns × rows개 모이면 바로 sheet로 쓰고 비운다
+    per_sheet = columns * rows
+    pending, rendered, sheets = [], [], []
+    results = run_ordered(_render_task, tasks, num_workers, initializer=init_opencv_worker)
+    for i, (task, ok, thumb_path, log, _) in enumerate(results, 1):
+        entry = task[0]
+        if log:
+            print(f"[{i}/{len(tasks)}] {'' if ok else entry['name'] + ': '}{log}", end="" if log.endswith("\n") else "\n")
+        if not thumb_path:
+            continue
+        pending.append(thumb_path)
+        rendered.append({"name": entry["name"], "title": entry["title"], "caption": entry.get("caption", entry["title"])})
+        if len(pending) == per_sheet:
+            sheets.append(write_contact_sheet(pending, sheet_path(output_dir, len(sheets)), columns, quality))
+            pending = []
+    if pending:
+        sheets.append(write_contact_sheet(pending, sheet_path(output_dir, len(sheets)), columns, quality))
+
+    index_path = write_gallery_html(rendered, output_dir, title)
+    print(f"✅ 갤러리 저장: {index_path} (이미지 {len(rendered)}장, contact sheet {len(sheets)}장)")
+    return index_path
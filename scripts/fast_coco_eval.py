@@ -0,0 +1,272 @@
+# scripts/fast_coco_eval.py
+# 단일 클래스 검출용 고속 COCO AP/AR 평가 (pycocotools COCOeval 대체)
+# - 이미지별 IoU 행렬을 한 번에 계산하고, 탐욕 매칭은 검출 하나당 (면적 구간 × IoU 임계값) 전체를
+#   NumPy로 한 번에 처리한다 (COCOeval은 검출 × 임계값 × GT 를 파이썬 루프로 돈다).
+# - maxDets를 조절할 수 있다 (COCOeval 기본 100은 수백 개 부품이 있는 PCB에서 recall이 잘린다).
+# - 이미지를 청크로 나눠 프로세스 풀에서 병렬로 매칭한다.
+# stats(12개)의 의미와 순서는 COCOeval.summarize()와 같다. iscrowd GT는 지원하지 않는다.
+# 단, stats[0](AP@[.5:.95])은 COCOeval처럼 maxDets=100 고정이 아니라 max_dets[2] 기준이다 (기본값에서는 같다).
+import os
+import json
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+from box_matching import iou_matrix
+from obb_geometry import coords_to_polygon, polygon_area, polygon_iou_matrix
+
+# COCOeval 기본값과 같은 의미 (AP는 MAX_DETS[2], AR은 MAX_DETS[0..2] 기준)
+MAX_DETS = (1, 10, 100)
+# 부품이 많은 PCB 보드용 권장값
+DENSE_MAX_DETS = (100, 500, 2000)
+
+IOU_THRESHOLDS = np.linspace(0.5, 0.95, 10)
+REC_THRESHOLDS = np.linspace(0.0, 1.00, 101)
+AREA_RANGES = {
+    "all": (0, 1e10),
+    "small": (0, 32 ** 2),
+    "medium": (32 ** 2, 96 ** 2),
+    "large": (96 ** 2, 1e10),
+}
+
+NUM_WORKERS = os.cpu_count() or 1
+# 워커 하나에 한 번에 넘기는 이미지 수
+IMAGES_PER_CHUNK = 16
+
+OBB_KEY = "obb"
+
+
+def _load_json(data):
+    if isinstance(data, str):
+        with open(data, "r") as f:
+            return json.load(f)
+    return data
+
+
+def _boxes_and_areas(anns, obb):
+    """annotation 목록 → (박스 배열, 면적). obb면 (N,4,2) polygon과 polygon 면적."""
+    if obb:
+        polygons = coords_to_polygon([ann[OBB_KEY] for ann in anns])
+        return polygons, polygon_area(polygons)
+    boxes = np.asarray([ann["bbox"] for ann in anns], dtype=np.float64).reshape(-1, 4)
+    return boxes, boxes[:, 2] * boxes[:, 3]
+
+
+def prepare_images(gt, dt, obb=False):
+    """
+    GT(COCO dict 또는 경로)와 예측(목록 또는 경로)을 이미지별 배열로 묶는다.
+    반환: [(image_id, gt_boxes, gt_areas, dt_boxes, dt_scores, dt_areas), ...] (image_id 순)
+    GT area는 annotation의 "area"를, 예측 area는 loadRes와 같이 w*h(obb면 polygon 면적)를 쓴다.
+    """
+    gt, dt = _load_json(gt), _load_json(dt)
+    image_ids = sorted(img["id"] for img in gt["images"])
+    gts = {image_id: [] for image_id in image_ids}
+    dts = {image_id: [] for image_id in image_ids}
+    for ann in gt["annotations"]:
+        if ann.get("iscrowd", 0):
+            raise ValueError(f"iscrowd GT는 지원하지 않습니다: annotation id {ann.get('id')}")
+        gts[ann["image_id"]].append(ann)
+    skipped = 0
+    for ann in dt:
+        if ann["image_id"] in dts:
+            dts[ann["image_id"]].append(ann)
+        else:
+            skipped += 1
+    if skipped:
+        print(f"⚠ Warning: GT에 없는 이미지의 예측 {skipped}개 제외.")
+
+    images = []
+    for image_id in image_ids:
+        gt_anns, dt_anns = gts[image_id], dts[image_id]
+        gt_boxes, _ = _boxes_and_areas(gt_anns, obb)
+        gt_areas = np.asarray([ann["area"] for ann in gt_anns], dtype=np.float64)
+        dt_boxes, dt_areas = _boxes_and_areas(dt_anns, obb)
+        dt_scores = np.asarray([ann["score"] for ann in dt_anns], dtype=np.float64)
+        images.append((image_id, gt_boxes, gt_areas, dt_boxes, dt_scores, dt_areas))
+    return images
+
+
+def match_image(gt_boxes, gt_areas, dt_boxes, dt_scores, dt_areas,
+                max_det, iou_thresholds=IOU_THRESHOLDS, area_ranges=tuple(AREA_RANGES.values()), obb=False):
+    """
+    이미지 하나를 COCOeval.evaluateImg와 같은 규칙으로 매칭한다 (모든 면적 구간 × IoU 임계값을 함께).
+    반환: (scores (D,), tps (A,T,D), fps (A,T,D), num_gt (A,)) — 검출은 점수 내림차순, max_det개까지
+    """
+    order = np.argsort(-dt_scores, kind="mergesort")[:max_det]
+    dt_boxes, dt_scores, dt_areas = dt_boxes[order], dt_scores[order], dt_areas[order]
+
+    ranges = np.asarray(area_ranges, dtype=np.float64)                               # (A,2)
+    thresholds = np.minimum(np.asarray(iou_thresholds, dtype=np.float64), 1 - 1e-10)  # (T,)
+    A, T, D, G = len(ranges), len(thresholds), len(dt_scores), len(gt_areas)
+
+    # 면적 구간 밖이라 무시하는 GT (A,G), 구간 밖 검출 (A,D)
+    gt_out = (gt_areas[None, :] < ranges[:, :1]) | (gt_areas[None, :] > ranges[:, 1:])
+    dt_out = (dt_areas[None, :] < ranges[:, :1]) | (dt_areas[None, :] > ranges[:, 1:])
+
+    matched = np.zeros((A, T, D), dtype=bool)
+    matched_ignored = np.zeros((A, T, D), dtype=bool)
+    if D and G:
+        ious = (polygon_iou_matrix if obb else iou_matrix)(dt_boxes, gt_boxes)
+        gt_taken = np.zeros((A, T, G), dtype=bool)
+        # 같은 IoU면 COCOeval처럼 (ignore 정렬 후) 뒤쪽 GT가 선택되도록 순서를 맞춘다
+        gt_rank = np.empty((A, G), dtype=np.float64)
+        for a in range(A):
+            gt_rank[a, np.argsort(gt_out[a], kind="mergesort")] = np.arange(G)
+        for d in np.nonzero(ious.max(axis=1) >= thresholds[0])[0]:
+            cand = np.nonzero(ious[d] >= thresholds[0])[0]
+            cand_iou = ious[d, cand]                                                  # (C,)
+            ok = (cand_iou[None, None, :] >= thresholds[None, :, None]) & ~gt_taken[:, :, cand]  # (A,T,C)
+            if not ok.any():
+                continue
+            # 일반 GT를 무시 GT보다 우선, 그 안에서는 IoU가 큰 것, 같으면 정렬상 뒤쪽
+            key = np.where(gt_out[:, cand], 0.0, 2.0)[:, None, :] + cand_iou[None, None, :]
+            key = np.where(ok, key, -np.inf)                                          # (A,T,C)
+            tie = ok & (key == key.max(axis=2, keepdims=True))
+            best = np.argmax(np.where(tie, gt_rank[:, None, cand], -1.0), axis=2)     # (A,T)
+            hit = ok.any(axis=2)
+            a_idx, t_idx = np.nonzero(hit)
+            g_idx = cand[best[a_idx, t_idx]]
+            gt_taken[a_idx, t_idx, g_idx] = True
+            matched[a_idx, t_idx, d] = True
+            matched_ignored[a_idx, t_idx, d] = gt_out[a_idx, g_idx]
+
+    dt_ignored = matched_ignored | (~matched & dt_out[:, None, :])
+    tps = matched & ~dt_ignored
+    fps = ~matched & ~dt_ignored
+    num_gt = np.count_nonzero(~gt_out, axis=1)
+    return dt_scores, tps, fps, num_gt
+
+
+def _match_chunk(args):
+    images, max_det, obb = args
+    return [match_image(*image[1:], max_det=max_det, obb=obb) for image in images]
+
+
+def run_matching(images, max_det, obb, num_workers):
+    chunks = [(images[i:i + IMAGES_PER_CHUNK], max_det, obb) for i in range(0, len(images), IMAGES_PER_CHUNK)]
+    if num_workers <= 1 or len(chunks) <= 1:
+        results = map(_match_chunk, chunks)
+    else:
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            results = list(executor.map(_match_chunk, chunks))
+    return [result for chunk in results for result in chunk]
+
+
+def accumulate(per_image, max_dets, rec_thresholds=REC_THRESHOLDS, score_threshold=0.0):
+    """
+    match_image 결과를 모아 COCOeval.accumulate와 같은 precision (T,R,A,M), recall (T,A,M)을 계산한다.
+    score_threshold가 있으면 점수가 그보다 낮은 예측은 뺀다 (다시 매칭할 필요 없음).
+    """
+    A, T = per_image[0][1].shape[:2] if per_image else (len(AREA_RANGES), len(IOU_THRESHOLDS))
+    R, M = len(rec_thresholds), len(max_dets)
+    precision = -np.ones((T, R, A, M))
+    recall = -np.ones((T, A, M))
+    if not per_image:
+        return precision, recall
+
+    num_gt = np.sum([result[3] for result in per_image], axis=0)                  # (A,)
+    # 이미지별 예측은 점수 내림차순이므로 임계값 이상인 예측은 앞쪽 kept개
+    kept = [int(np.count_nonzero(result[0] >= score_threshold)) for result in per_image]
+    for m, max_det in enumerate(max_dets):
+        ends = [min(n, max_det) for n in kept]
+        scores = np.concatenate([result[0][:end] for result, end in zip(per_image, ends)])
+        order = np.argsort(-scores, kind="mergesort")
+        tps = np.concatenate([result[1][:, :, :end] for result, end in zip(per_image, ends)], axis=2)[:, :, order]
+        fps = np.concatenate([result[2][:, :, :end] for result, end in zip(per_image, ends)], axis=2)[:, :, order]
+        tp_sum = np.cumsum(tps, axis=2, dtype=np.float64)
+        fp_sum = np.cumsum(fps, axis=2, dtype=np.float64)
+        nd = len(scores)
+        for a in range(A):
+            if num_gt[a] == 0:
+                continue
+            for t in range(T):
+                tp, fp = tp_sum[a, t], fp_sum[a, t]
+                rc = tp / num_gt[a]
+                recall[t, a, m] = rc[-1] if nd else 0
+                pr = tp / (fp + tp + np.spacing(1))
+                # 오른쪽에서부터 누적 최대 (precision envelope)
+                pr = np.maximum.accumulate(pr[::-1])[::-1]
+                inds = np.searchsorted(rc, rec_thresholds, side="left")
+                q = np.zeros(R)
+                valid = inds < nd
+                q[valid] = pr[inds[valid]]
+                precision[t, :, a, m] = q
+    return precision, recall
+
+
+def summarize(precision, recall, max_dets, iou_thresholds=IOU_THRESHOLDS, verbose=True):
+    """COCOeval.summarize()와 같은 순서의 stats(12개)를 계산해 출력한다."""
+    area_names = list(AREA_RANGES)
+
+    def _summarize(ap=1, iou_thr=None, area="all", max_det=max_dets[2]):
+        a, m = area_names.index(area), list(max_dets).index(max_det)
+        s = precision[..., a, m] if ap == 1 else recall[..., a, m]
+        if iou_thr is not None:
+            s = s[np.where(np.isclose(iou_thresholds, iou_thr))[0]]
+        mean_s = np.mean(s[s > -1]) if np.any(s > -1) else -1
+        if verbose:
+            title = "Average Precision" if ap == 1 else "Average Recall"
+            kind = "(AP)" if ap == 1 else "(AR)"
+            iou_str = f"{iou_thresholds[0]:0.2f}:{iou_thresholds[-1]:0.2f}" if iou_thr is None else f"{iou_thr:0.2f}"
+            print(f" {title:<18} {kind} @[ IoU={iou_str:<9} | area={area:>6s} | maxDets={max_det:>3d} ] = {mean_s:0.3f}")
+        return mean_s
+
+    return np.array([
+        _summarize(1, max_det=max_dets[2]),
+        _summarize(1, iou_thr=.5),
+        _summarize(1, iou_thr=.75),
+        _summarize(1, area="small"),
+        _summarize(1, area="medium"),
+        _summarize(1, area="large"),
+        _summarize(0, max_det=max_dets[0]),
+        _summarize(0, max_det=max_dets[1]),
+        _summarize(0, max_det=max_dets[2]),
+        _summarize(0, area="small"),
+        _summarize(0, area="medium"),
+        _summarize(0, area="large"),
+    ])
+
+
+def fast_coco_evaluation(gt_file, dt_file, max_dets=MAX_DETS, num_workers=NUM_WORKERS, obb=False, verbose=True):
+    """
+    coco_evaluation의 단일 클래스 고속 버전. 모든 예측을 같은 클래스로 보고 stats(12개)를 반환한다.
+    gt_file/dt_file은 경로 또는 이미 읽은 dict/list이다. obb=True면 "obb" polygon IoU로 평가한다.
+    """
+    images = prepare_images(gt_file, dt_file, obb)
+    per_image = run_matching(images, max(max_dets), obb, num_workers)
+    precision, recall = accumulate(per_image, max_dets)
+    return summarize(precision, recall, max_dets, verbose=verbose)
+
+
+def compare_with_pycocotools(gt_file, dt_file, max_dets=MAX_DETS, num_workers=NUM_WORKERS, atol=1e-6):
+    """같은 입력을 pycocotools COCOeval로도 평가해 stats가 atol 이내로 같은지 확인한다 (회귀 확인용)."""
+    from pycocotools.coco import COCO
+    from pycocotools.cocoeval import COCOeval
+
+    coco_gt = COCO(gt_file)
+    coco_dt = coco_gt.loadRes(dt_file)
+    coco_eval = COCOeval(coco_gt, coco_dt, "bbox")
+    coco_eval.params.iouThrs = IOU_THRESHOLDS
+    coco_eval.params.maxDets = list(max_dets)
+    coco_eval.params.useCats = 0
+    coco_eval.evaluate()
+    coco_eval.accumulate()
+    coco_eval.summarize()
+
+    fast_stats = fast_coco_evaluation(gt_file, dt_file, max_dets, num_workers, verbose=False)
+    diff = np.abs(fast_stats - coco_eval.stats)
+    if max_dets[2] != 100:
+        diff[0] = 0  # COCOeval의 stats[0]은 maxDets=100 고정
+    if np.any(diff > atol):
+        raise AssertionError(f"❌ stats 불일치 (최대 차이 {diff.max():.3g}):\n{fast_stats}\n{coco_eval.stats}")
+    print(f"✅ pycocotools와 stats 일치 (최대 차이 {diff.max():.3g})")
+    return fast_stats
+
+
+if __name__ == "__main__":
+    gt_path = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset/ground_truth.json"
+    dt_path = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/outputs_800yolo/run3/coco_predictions.json"
+
+    # 회귀 확인: COCOeval 기본 maxDets에서 pycocotools와 결과가 같은지 확인한 뒤 고밀도 설정으로 평가한다
+    compare_with_pycocotools(gt_path, dt_path, MAX_DETS)
+    results = fast_coco_evaluation(gt_path, dt_path, DENSE_MAX_DETS)
+    print("COCO Evaluation Results:", results)
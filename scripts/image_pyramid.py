@@ -0,0 +1,168 @@
+# scripts/image_pyramid.py
+# 원본(3904x3904) 한 번 디코딩 → 여러 학습 해상도(피라미드) 이미지 + 라벨을 한 번에 만든다
+# 해상도 실험마다 TARGET_WIDTH를 바꿔 convert_and_resize를 다시 돌리면 원본을 매번 새로 디코딩하므로,
+# 원본을 한 번 읽어 PYRAMID_SIZES의 모든 해상도를 만든다.
+# 출력: <pyramid_dir>/<size>/images, <pyramid_dir>/<size>/labels (ultralytics 구조 그대로)
+# 해상도마다 매니페스트(<pyramid_dir>/<size>.manifest.json)를 두어 이미 만든 해상도는 건너뛰고,
+# 새로 추가한 해상도나 바뀐 파일만 만든다 (그때도 원본은 한 번만 디코딩).
+import os
+
+from PIL import Image
+
+from batch_runner import find_image_file, run_tasks
+from dataset_manifest import DatasetManifest, manifest_path_for
+from labelme_io import load_labelme, SHAPE_FIELDS
+from yolo_labels import obb_label_text, aabb_label_text
+
+PYRAMID_SIZES = (640, 800, 1280, 1952)
+LABEL_FORMATS = ("obb", "aabb")
+NUM_WORKERS = os.cpu_count() or 1
+
+
+def level_dirs(pyramid_dir, size):
+    """해상도 size의 (이미지 디렉토리, 라벨 디렉토리)"""
+    level_dir = os.path.join(pyramid_dir, str(size))
+    return os.path.join(level_dir, "images"), os.path.join(level_dir, "labels")
+
+
+def level_outputs(pyramid_dir, size, base_name, image_path):
+    """해상도 size에서 이미지와 라벨 파일의 출력 경로"""
+    image_dir, label_dir = level_dirs(pyramid_dir, size)
+    return [
+        os.path.join(image_dir, os.path.basename(image_path)),
+        os.path.join(label_dir, base_name + ".txt"),
+    ]
+
+
+def label_text(shapes, label_format, class_names, image_size, size, source=""):
+    """해상도 size의 라벨 파일 내용 (정규화 좌표이므로 OBB는 해상도와 무관하다)"""
+    if label_format == "obb":
+        return obb_label_text(shapes, class_names, image_size[0], image_size[1], source)
+    return aabb_label_text(shapes, class_names, image_size, (size, size), source)
+
+
+def open_pyramid(image_path, sizes, fast=False, oversample=1, resample=Image.LANCZOS):
+    """
+    이미지를 한 번만 디코딩해 {size: (size, size)로 리사이즈한 이미지}를 반환한다.
+    각 해상도는 디코딩한 원본에서 직접 리사이즈하므로 fast=False이면
+    image_resize.open_resized(fast=False)로 해상도마다 따로 만든 결과와 같다.
+    fast=True이면 가장 큰 해상도 × oversample 이상인 가장 작은 DCT 축소 해상도로만 디코딩한다.
+    """
+    img = Image.open(image_path)
+    if fast:
+        largest = max(sizes) * oversample
+        img.draft(None, (largest, largest))
+    img.load()
+    return {size: img.resize((size, size), resample) for size in sizes}
+
+
+def build_pyramid_entry(json_path, image_path, pyramid_dir, sizes, label_format, class_names,
+                        original_size, fast=False, oversample=1):
+    """JSON/이미지 쌍 하나를 sizes 해상도로 만든다 (원본 디코딩 1회)."""
+    data = load_labelme(json_path, fields=SHAPE_FIELDS)
+    base_name = os.path.splitext(os.path.basename(json_path))[0]
+    shapes = data.get('shapes', [])
+    image_size = (data.get('imageWidth', original_size[0]), data.get('imageHeight', original_size[1]))
+
+    images = open_pyramid(image_path, sizes, fast=fast, oversample=oversample)
+    for size in sizes:
+        image_out, label_out = level_outputs(pyramid_dir, size, base_name, image_path)
+        images[size].save(image_out)
+        with open(label_out, 'w', encoding='utf-8') as f:
+            f.write(label_text(shapes, label_format, class_names, image_size, size, source=json_path))
+    print(f"✅ 피라미드 완료: {base_name} → {', '.join(map(str, sizes))}")
+
+
+def _build_task(task):
+    # run_tasks는 작업 하나를 인자 하나로 넘긴다
+    build_pyramid_entry(*task)
+
+
+def pyramid_params(size, label_format, class_names, original_size, fast, oversample):
+    # 해상도별 매니페스트 파라미터 (바뀌면 그 해상도만 전체를 다시 만든다)
+    return {
+        "SIZE": size,
+        "LABEL_FORMAT": label_format,
+        "CLASS_NAMES": class_names,
+        "ORIGINAL_SIZE": list(original_size),
+        "FAST_DOWNSCALE": fast,
+        "DOWNSCALE_OVERSAMPLE": oversample if fast else 1,
+    }
+
+
+def build_pyramid(json_dir, image_dir, pyramid_dir, sizes=PYRAMID_SIZES, label_format="obb",
+                  class_names=None, original_size=(3904, 3904), fast=False, oversample=1,
+                  num_workers=NUM_WORKERS):
+    """
+    json_dir/image_dir의 쌍을 pyramid_dir/<size>/{images,labels}로 만든다.
+    해상도마다 바뀌지 않은 쌍은 건너뛰고, 한 쌍에서 만들어야 할 해상도는 원본 한 번 디코딩으로 모두 만든다.
+    반환: {"built": {size: 만든 수}, "skipped": {size: 건너뛴 수}, "names": 성공한 쌍 이름 목록,
+          "failures": [{"json", "error"}]}
+    """
+    if label_format not in LABEL_FORMATS:
+        raise ValueError(f"알 수 없는 라벨 형식: {label_format} (가능: {', '.join(LABEL_FORMATS)})")
+    class_names = class_names or {'component': 0}
+    sizes = sorted(set(sizes))
+    for size in sizes:
+        for directory in level_dirs(pyramid_dir, size):
+            os.makedirs(directory, exist_ok=True)
+
+    pairs = {}
+    for json_file in sorted(os.listdir(json_dir)):
+        if json_file.endswith(".json"):
+            base_name = os.path.splitext(json_file)[0]
+            image_path = find_image_file(image_dir, base_name)
+            if image_path:
+                pairs[base_name] = (os.path.join(json_dir, json_file), image_path)
+            else:
+                print(f"⚠️ 이미지가 없습니다: {base_name}")
+
+    manifests = {
+        size: DatasetManifest(
+            manifest_path_for(os.path.join(pyramid_dir, str(size))),
+            params=pyramid_params(size, label_format, class_names, original_size, fast, oversample),
+        )
+        for size in sizes
+    }
+
+    # 쌍마다 아직 만들지 않은(또는 입력이 바뀐) 해상도만 모은다
+    tasks, records = [], []
+    skipped = {size: 0 for size in sizes}
+    for base_name, (json_path, image_path) in pairs.items():
+        todo = []
+        for size in sizes:
+            outputs = level_outputs(pyramid_dir, size, base_name, image_path)
+            if manifests[size].is_fresh(base_name, [json_path, image_path], outputs):
+                skipped[size] += 1
+            else:
+                todo.append(size)
+        if todo:
+            tasks.append((json_path, image_path, pyramid_dir, todo, label_format, class_names,
+                          original_size, fast, oversample))
+            records.append([
+                (manifests[size], base_name, [json_path, image_path],
+                 level_outputs(pyramid_dir, size, base_name, image_path))
+                for size in todo
+            ])
+    for manifest in manifests.values():
+        manifest.prune(pairs)
+
+    print(f"🚀 {len(tasks)}개 원본 디코딩 (해상도 {', '.join(map(str, sizes))}, 워커 {max(num_workers, 1)}개)")
+    failures = run_tasks(_build_task, tasks, num_workers, records, manifests.values())
+
+    built = {size: 0 for size in sizes}
+    for task in tasks:
+        for size in task[3]:
+            built[size] += 1
+    failed = set()
+    for failure in failures:
+        json_path, _, _, todo = failure["task"][:4]
+        failed.add(os.path.splitext(os.path.basename(json_path))[0])
+        for size in todo:
+            built[size] -= 1
+    return {
+        "built": built,
+        "skipped": skipped,
+        "names": sorted(set(pairs) - failed),
+        "failures": [{"json": f["task"][0], "error": f["error"]} for f in failures],
+    }
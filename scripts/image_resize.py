@@ -0,0 +1,17 @@
+# scripts/image_resize.py
+# 원본(3904x3904) → 학습 해상도 축소 공통 함수
+from PIL import Image
+
+
+def open_resized(image_path, size, fast=False, oversample=1, resample=Image.LANCZOS):
+    """
+    이미지를 열어 size=(width, height)로 리사이즈한다.
+    fast=True이면 JPEG 디코더에 DCT 축소(1/2, 1/4, 1/8) 디코딩을 먼저 요청해
+    목표 크기 이상인 가장 작은 해상도만 디코딩한 뒤 resample로 마무리한다.
+    oversample은 DCT 축소 후에 남겨 둘 최소 배율이다 (2이면 목표의 2배 이상에서 멈춤).
+    JPEG가 아닌 이미지는 fast 여부와 관계없이 전체 해상도로 디코딩된다.
+    """
+    img = Image.open(image_path)
+    if fast:
+        img.draft(None, (size[0] * oversample, size[1] * oversample))
+    return img.resize(size, resample)
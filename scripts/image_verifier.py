@@ -0,0 +1,134 @@
+# scripts/image_verifier.py
+# 이미지 무결성 검사 (병렬 + 캐시)
+# - "header": Pillow로 헤더만 읽고(크기/형식) 파일 끝 TAIL_WINDOW 안에 끝 마커가 있는지 확인한다 (JPEG EOI FFD9, PNG IEND).
+#   카메라/편집기가 EOI 뒤에 0 패딩이나 메타데이터를 붙이는 경우가 있으므로 마지막 바이트만 비교하지 않는다.
+# - "full": Image.load()로 전체를 디코딩하고 그 결과로만 판정한다 (잘린 파일은 디코딩에서 실패한다).
+# 결과는 (경로, 크기, 수정 시각) → 판정으로 캐시 파일에 남겨 두고, 바뀌지 않은 파일은 다음 실행에서 건너뛴다.
+# "full"로 통과한 파일은 "header" 검사도 통과한 것으로 본다.
+import os
+import json
+
+from PIL import Image
+
+from batch_runner import run_ordered
+
+VERIFY_LEVELS = ("header", "full")
+NUM_WORKERS = os.cpu_count() or 1
+CACHE_VERSION = 2
+# 작업이 작으므로 워커에 여러 개씩 묶어 보낸다
+CHUNK_SIZE = 16
+
+# 끝 마커를 찾는 파일 끝 구간 (bytes)
+TAIL_WINDOW = 4096
+JPEG_EOI = b"\xff\xd9"
+PNG_IEND = b"IEND\xaeB`\x82"
+
+
+def cache_path_for(image_dir):
+    """이미지 디렉토리 옆에 두는 캐시 경로 (예: images → images.verify.json)"""
+    return os.path.normpath(image_dir) + ".verify.json"
+
+
+def _tail(path, size):
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(f.tell() - size, 0))
+        return f.read()
+
+
+def check_image(path, level="header"):
+    """문제가 없으면 None, 있으면 오류 설명 문자열을 반환한다."""
+    try:
+        with Image.open(path) as img:
+            image_format = img.format
+            if level == "full":
+                img.load()
+                return None
+        if image_format == "JPEG" and JPEG_EOI not in _tail(path, TAIL_WINDOW):
+            return "JPEG EOI 마커 없음 (잘린 파일)"
+        if image_format == "PNG" and PNG_IEND not in _tail(path, TAIL_WINDOW):
+            return "PNG IEND 청크 없음 (잘린 파일)"
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+    return None
+
+
+def _check_task(task):
+    # run_ordered는 작업 하나를 인자 하나로 넘긴다
+    return check_image(*task)
+
+
+def _load_cache(cache_path):
+    if not cache_path or not os.path.exists(cache_path):
+        return {}
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        print(f"⚠️ 검사 캐시를 읽을 수 없어 전체를 다시 검사합니다: {cache_path}")
+        return {}
+    return stored.get("entries", {}) if stored.get("version") == CACHE_VERSION else {}
+
+
+def _save_cache(cache_path, entries):
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_VERSION, "entries": entries}, f, ensure_ascii=False)
+    os.replace(tmp_path, cache_path)
+
+
+def _cached_verdict(entry, st, level):
+    """
+    캐시 항목이 현재 파일 상태와 같고 요청 수준 이상으로 검사된 것이면 (hit, error).
+    "header"에서만 난 오류(끝 마커)는 "full"에서는 디코딩 결과로 다시 판정하므로 재사용하지 않는다.
+    """
+    if not entry or entry["size"] != st.st_size or entry["mtime_ns"] != st.st_mtime_ns:
+        return False, None
+    if VERIFY_LEVELS.index(entry["level"]) >= VERIFY_LEVELS.index(level):
+        return True, entry["error"]
+    return False, None
+
+
+def verify_images(paths, level="header", cache_path=None, num_workers=NUM_WORKERS):
+    """
+    paths의 이미지를 level 수준으로 검사한다. cache_path가 있으면 바뀌지 않은 파일의 판정을 재사용한다.
+    반환: {"level", "checked"(이번에 검사한 수), "cached"(캐시로 건너뛴 수), "corrupt": [{"path", "error"}]}
+    """
+    if level not in VERIFY_LEVELS:
+        raise ValueError(f"알 수 없는 검사 수준: {level} (가능: {', '.join(VERIFY_LEVELS)})")
+    entries = _load_cache(cache_path)
+
+    errors, stats, tasks = {}, {}, []
+    for path in paths:
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        hit, error = _cached_verdict(entries.get(path), st, level)
+        if hit:
+            errors[path] = error
+        else:
+            stats[path] = st
+            tasks.append((path, level))
+
+    try:
+        for (path, _), _, error, _, _ in run_ordered(_check_task, tasks, num_workers, CHUNK_SIZE):
+            errors[path] = error
+            st = stats[path]
+            entries[path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "level": level, "error": error}
+    finally:
+        # 중간에 중단되어도 끝난 파일까지는 캐시에 남긴다
+        if cache_path:
+            _save_cache(cache_path, entries)
+
+    return {
+        "level": level,
+        "checked": len(tasks),
+        "cached": len(errors) - len(tasks),
+        "corrupt": [{"path": path, "error": error} for path, error in sorted(errors.items()) if error is not None],
+    }
+
+
+def write_report(report, report_path):
+    """검사 결과를 JSON으로 저장한다 (CI 등에서 corrupt 목록을 바로 읽을 수 있게)."""
+    os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1, ensure_ascii=False)
@@ -0,0 +1,77 @@
+# scripts/inference_backends.py
+# CPU 추론 백엔드 선택
+# - pytorch: 학습 가중치(.pt)를 그대로 쓴다 (eager)
+# - torchscript / onnx / openvino: .pt를 한 번 내보내 두고 (가중치 옆에 저장) ultralytics YOLO로 불러온다.
+# 내보낸 파일이 가중치보다 새 것이고 내보내기 설정(imgsz/batch/dynamic)이 같으면 다시 내보내지 않는다.
+# 배치 축은 동적으로 내보낸다 (dynamic=True). 정적 배치 그래프는 1장 추론이나 마지막 자투리 배치에서
+# 실패하거나, (ultralytics 버전에 따라) 0으로 채운 전체 배치를 돌려 1장 지연시간에 배치 비용이 섞인다.
+# 예측 시 imgsz는 내보낸 값이 자동으로 쓰인다.
+import os
+import json
+import shutil
+
+from ultralytics import YOLO
+
+BACKENDS = ("pytorch", "torchscript", "onnx", "openvino")
+# 백엔드 → (ultralytics export format, 가중치 파일명 뒤에 붙는 접미사)
+EXPORT_FORMATS = {
+    "torchscript": ("torchscript", ".torchscript"),
+    "onnx": ("onnx", ".onnx"),
+    "openvino": ("openvino", "_openvino_model"),
+}
+
+IMGSZ = 800
+# 동적 배치로 내보낼 때 예시 입력의 배치 크기 (동적이 아니면 고정 배치)
+EXPORT_BATCH = 8
+DYNAMIC_BATCH = True
+
+
+def exported_path(weights, backend):
+    """백엔드별 내보낸 모델 경로 (pytorch는 가중치 그대로)"""
+    if backend == "pytorch":
+        return weights
+    _, suffix = EXPORT_FORMATS[backend]
+    return os.path.splitext(weights)[0] + suffix
+
+
+def _settings_path(path):
+    """내보내기 설정을 기록해 두는 파일 (예: best.onnx → best.onnx.export.json)"""
+    return os.path.normpath(path) + ".export.json"
+
+
+def _read_settings(path):
+    try:
+        with open(_settings_path(path), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def export_model(weights, backend, imgsz=IMGSZ, batch=EXPORT_BATCH, dynamic=DYNAMIC_BATCH, force=False):
+    """
+    가중치를 backend 형식으로 내보내고 경로를 반환한다.
+    이미 내보낸 파일이 가중치보다 새 것이고 같은 설정으로 내보낸 것이면 그대로 쓴다 (force=True면 다시 내보낸다).
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"알 수 없는 백엔드: {backend} (가능: {', '.join(BACKENDS)})")
+    path = exported_path(weights, backend)
+    if backend == "pytorch":
+        return path
+    settings = {"imgsz": imgsz, "batch": batch, "dynamic": dynamic}
+    if (not force and os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(weights)
+            and _read_settings(path) == settings):
+        return path
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    export_format, _ = EXPORT_FORMATS[backend]
+    print(f"📦 {backend} 내보내기: {weights} → {path} (imgsz={imgsz}, batch={batch}, dynamic={dynamic})")
+    path = str(YOLO(weights).export(format=export_format, imgsz=imgsz, batch=batch, dynamic=dynamic, device="cpu"))
+    with open(_settings_path(path), "w", encoding="utf-8") as f:
+        json.dump(settings, f)
+    return path
+
+
+def load_model(weights, backend="pytorch", task="obb", imgsz=IMGSZ, batch=EXPORT_BATCH, dynamic=DYNAMIC_BATCH):
+    """backend로 추론할 YOLO 모델을 불러온다 (필요하면 먼저 내보낸다)."""
+    path = export_model(weights, backend, imgsz=imgsz, batch=batch, dynamic=dynamic)
+    return YOLO(path, task=task)
@@ -0,0 +1,153 @@
+# scripts/inference_runner.py
+# 배치 단위 CPU 추론 실행기
+# - 이미지 디코딩은 백그라운드 스레드 풀에서 미리 해 두고 (cv2.imread는 GIL을 놓는다)
+# - 모델에는 batch_size장씩 묶어서 넣고
+# - torch intra-op 스레드 수를 지정할 수 있으며
+# - 검출 결과는 이미지당 한 줄씩 JSONL 파일 하나에 이어 쓴다 (렌더링은 기본으로 끈다).
+# - tiling을 주면 원본 해상도 이미지를 타일로 잘라 추론한다 (tiled_inference.predict_tiled).
+# - coco_gt/coco_output을 주면 같은 검출을 평가용 COCO 결과(GT image_id/category_id, 픽셀 박스)로도 저장한다.
+import os
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from tiled_inference import predict_tiled
+from coco_results import image_id_index, category_lookup, record_to_coco, write_results
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+# 기본 설정
+BATCH_SIZE = 8
+DECODE_WORKERS = 4
+# 미리 디코딩해 둘 배치 수
+PREFETCH_BATCHES = 2
+
+
+def list_images(source):
+    """디렉토리(또는 경로 목록)의 이미지 경로를 이름순으로 반환한다."""
+    if isinstance(source, (list, tuple)):
+        return list(source)
+    return sorted(
+        os.path.join(source, f) for f in os.listdir(source) if f.lower().endswith(IMAGE_EXTENSIONS)
+    )
+
+
+def set_torch_threads(num_threads):
+    """torch intra-op 스레드 수를 지정한다 (None이면 그대로 둔다)."""
+    if num_threads:
+        import torch
+        torch.set_num_threads(num_threads)
+
+
+def _decode(path):
+    return path, cv2.imread(path, cv2.IMREAD_COLOR)
+
+
+def iter_batches(paths, batch_size=BATCH_SIZE, decode_workers=DECODE_WORKERS, prefetch=PREFETCH_BATCHES):
+    """
+    (경로 목록, BGR 이미지 목록)을 batch_size씩 반환한다.
+    디코딩은 스레드 풀에서 최대 prefetch 배치만큼 앞서 진행한다. 읽지 못한 이미지는 경고 후 뺀다.
+    """
+    with ThreadPoolExecutor(max_workers=max(decode_workers, 1)) as executor:
+        pending = deque()
+        index = 0
+        while index < len(paths) or pending:
+            while index < len(paths) and len(pending) < prefetch * batch_size:
+                pending.append(executor.submit(_decode, paths[index]))
+                index += 1
+            batch_paths, batch_images = [], []
+            while pending and len(batch_paths) < batch_size:
+                path, image = pending.popleft().result()
+                if image is None:
+                    print(f"⚠️ 이미지를 불러올 수 없습니다: {path}")
+                    continue
+                batch_paths.append(path)
+                batch_images.append(image)
+            if batch_paths:
+                yield batch_paths, batch_images
+
+
+def detections_record(path, image_shape, boxes, cls, conf, obb):
+    """
+    이미지 하나의 검출을 JSON 한 줄용 dict로 바꾼다.
+    OBB 모델은 "rbox" [cx, cy, w, h, theta], 일반 모델은 "bbox" [x1, y1, x2, y2] (원본 이미지 픽셀 좌표).
+    """
+    height, width = image_shape[:2]
+    record = {"image": os.path.basename(path), "width": int(width), "height": int(height)}
+    record["rbox" if obb else "bbox"] = np.round(np.asarray(boxes, dtype=np.float64), 3).tolist()
+    record["cls"] = np.asarray(cls).astype(int).tolist()
+    record["conf"] = np.round(np.asarray(conf, dtype=np.float64), 5).tolist()
+    return record
+
+
+def result_to_record(path, result):
+    """ultralytics Results 하나를 detections_record 형식으로 바꾼다."""
+    obb = getattr(result, "obb", None) is not None
+    parts = result.obb if obb else result.boxes
+    boxes = parts.xywhr if obb else parts.xyxy
+    return detections_record(
+        path, result.orig_shape, boxes.cpu().numpy(), parts.cls.cpu().numpy(), parts.conf.cpu().numpy(), obb
+    )
+
+
+def read_detections(jsonl_path):
+    """run_inference가 쓴 JSONL을 이미지별 dict 목록으로 읽는다."""
+    with open(jsonl_path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def run_inference(model, source, output_path, batch_size=BATCH_SIZE, decode_workers=DECODE_WORKERS,
+                  torch_threads=None, render_dir=None, tiling=None,
+                  coco_gt=None, coco_output=None, coco_obb=False, **predict_kwargs):
+    """
+    source의 이미지를 배치로 추론해 output_path(JSONL)에 이어 쓴다.
+    render_dir를 주면 그 디렉토리에 결과 이미지를 그려 저장한다 (타일 추론에서는 지원하지 않음).
+    tiling은 predict_tiled 인자 dict(tile_size, overlap, batch_size, merge_iou ...)이며, 주면 이미지마다 타일 추론한다.
+    coco_gt(GT COCO JSON)와 coco_output을 주면 평가용 COCO 결과를 coco_output에 함께 저장한다 (coco_obb: "obb" polygon 포함).
+    predict_kwargs는 model.predict에 그대로 넘긴다.
+    반환: (처리한 이미지 수, 초당 이미지 수)
+    """
+    set_torch_threads(torch_threads)
+    paths = list_images(source)
+    if render_dir:
+        os.makedirs(render_dir, exist_ok=True)
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    if coco_gt is not None:
+        coco_index, coco_lookup = image_id_index(coco_gt), category_lookup(coco_gt)
+        coco_results = []
+
+    done = 0
+    start = time.perf_counter()
+    with open(output_path, 'a', encoding='utf-8') as out_f:
+        for batch_paths, batch_images in iter_batches(paths, batch_size, decode_workers):
+            records = []
+            if tiling is not None:
+                for path, image in zip(batch_paths, batch_images):
+                    det = predict_tiled(model, image, **tiling, **predict_kwargs)
+                    records.append(detections_record(path, image.shape, det["boxes"], det["cls"], det["conf"], det["obb"]))
+            else:
+                results = model.predict(batch_images, verbose=False, save=False, **predict_kwargs)
+                for path, result in zip(batch_paths, results):
+                    records.append(result_to_record(path, result))
+                    if render_dir:
+                        cv2.imwrite(os.path.join(render_dir, os.path.basename(path)), result.plot())
+            if coco_gt is not None:
+                for record in records:
+                    coco_results.extend(record_to_coco(record, coco_index, coco_lookup, coco_obb))
+            lines = [json.dumps(record, ensure_ascii=False) for record in records]
+            out_f.write("\n".join(lines) + "\n")
+            done += len(batch_paths)
+            elapsed = time.perf_counter() - start
+            print(f"[{done}/{len(paths)}] {done / elapsed:.2f} images/s")
+
+    elapsed = time.perf_counter() - start
+    throughput = done / elapsed if elapsed > 0 else 0.0
+    print(f"✅ 추론 완료: {done}장, {elapsed:.1f}s, {throughput:.2f} images/s → {output_path}")
+    if coco_gt is not None and coco_output:
+        write_results(coco_results, coco_output)
+        print(f"✅ COCO 결과 저장: {coco_output} ({len(coco_results)}개)")
+    return done, throughput
@@ -0,0 +1,150 @@
+# scripts/label_store.py
+# YOLO txt 라벨 디렉토리 전체를 하나로 묶은 패킹 라벨 저장소
+# 수천 개의 작은 txt를 매번 readlines()/split() 하는 대신, 데이터셋 전체를
+#   classes.npy (R,)   int32    클래스 id
+#   coords.npy  (R, K) float32  정규화 좌표 (K=4: x_center y_center w h, K=8: OBB 4점)
+#   offsets.npy (M+1,) int64    이미지 i의 라벨은 [offsets[i], offsets[i+1]) 행
+#   names.json                  이미지 이름(확장자 제외) 목록
+# 으로 저장하고, 읽을 때는 memmap으로 열어 이미지 하나를 O(1) 슬라이스로 꺼낸다.
+# float32로 저장해도 %.6f 로 내보내면 원래 txt 값과 같다.
+import os
+import json
+import numpy as np
+
+STORE_SUFFIX = ".pack"
+STORE_VERSION = 1
+
+
+def store_path_for(labels_dir):
+    """라벨 디렉토리 옆에 두는 저장소 경로 (예: 4_800labels → 4_800labels.pack)"""
+    return os.path.normpath(labels_dir) + STORE_SUFFIX
+
+
+def read_label_file(label_path, num_coords=None):
+    """
+    YOLO txt 라벨 파일 하나를 (class_ids (N,) int32, coords (N,K) float64)로 읽는다.
+    num_coords를 주지 않으면 첫 줄의 좌표 개수를 기준으로 하며, 개수가 다른 줄은 경고 후 건너뛴다.
+    """
+    with open(label_path, 'r') as f:
+        rows = [line.split() for line in f]
+    rows = [parts for parts in rows if parts]
+
+    if num_coords is None:
+        num_coords = len(rows[0]) - 1 if rows else 0
+    width = num_coords + 1
+    if any(len(parts) != width for parts in rows):
+        print(f"⚠ Warning: {label_path} 라벨 데이터 오류 (좌표 개수 불일치). 건너뜀.")
+        rows = [parts for parts in rows if len(parts) == width]
+
+    values = np.asarray(rows, dtype=np.float64).reshape(-1, width)
+    return values[:, 0].astype(np.int32), values[:, 1:]
+
+
+def build_label_store(labels_dir, store_path=None, num_coords=8):
+    """
+    labels_dir의 *.txt 전체를 저장소 하나로 묶는다. num_coords는 4(AABB) 또는 8(OBB).
+    빈 라벨 파일도 (행 0개인) 이미지로 기록한다. 만든 LabelStore를 반환한다.
+    """
+    store_path = store_path or store_path_for(labels_dir)
+    names = sorted(os.path.splitext(f)[0] for f in os.listdir(labels_dir) if f.endswith('.txt'))
+
+    all_classes, all_coords = [], []
+    offsets = np.zeros(len(names) + 1, dtype=np.int64)
+    for i, name in enumerate(names):
+        class_ids, coords = read_label_file(os.path.join(labels_dir, name + ".txt"), num_coords)
+        all_classes.append(class_ids)
+        all_coords.append(coords.astype(np.float32))
+        offsets[i + 1] = offsets[i] + len(class_ids)
+
+    os.makedirs(store_path, exist_ok=True)
+    classes = np.concatenate(all_classes) if all_classes else np.zeros(0, dtype=np.int32)
+    coords = np.concatenate(all_coords) if all_coords else np.zeros((0, num_coords), dtype=np.float32)
+    np.save(os.path.join(store_path, "classes.npy"), classes.astype(np.int32))
+    np.save(os.path.join(store_path, "coords.npy"), coords.reshape(-1, num_coords))
+    np.save(os.path.join(store_path, "offsets.npy"), offsets)
+    with open(os.path.join(store_path, "names.json"), 'w', encoding='utf-8') as f:
+        json.dump({"version": STORE_VERSION, "num_coords": num_coords, "names": names}, f, ensure_ascii=False)
+
+    print(f"✅ 라벨 저장소 생성 완료: {store_path} (이미지 {len(names)}개, 라벨 {len(classes)}개)")
+    return LabelStore(store_path)
+
+
+class LabelStore:
+    """build_label_store로 만든 저장소를 memmap으로 연다."""
+
+    def __init__(self, store_path):
+        self.path = store_path
+        with open(os.path.join(store_path, "names.json"), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.num_coords = meta["num_coords"]
+        self.names = meta["names"]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.classes = np.load(os.path.join(store_path, "classes.npy"), mmap_mode='r')
+        self.coords = np.load(os.path.join(store_path, "coords.npy"), mmap_mode='r')
+        self.offsets = np.load(os.path.join(store_path, "offsets.npy"))
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __getitem__(self, name):
+        return self.get_by_index(self.index[name])
+
+    def get(self, name, default=None):
+        """이미지 이름(확장자 제외)의 (class_ids, coords). 없으면 default."""
+        i = self.index.get(name)
+        return default if i is None else self.get_by_index(i)
+
+    def get_by_index(self, i):
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return self.classes[start:end], self.coords[start:end]
+
+    def items(self):
+        for i, name in enumerate(self.names):
+            yield name, self.get_by_index(i)
+
+    def export(self, labels_dir):
+        """YOLO txt 디렉토리로 되돌린다 (%.6f)."""
+        os.makedirs(labels_dir, exist_ok=True)
+        row_fmt = "%d" + " %.6f" * self.num_coords + "\n"
+        for name, (class_ids, coords) in self.items():
+            rows = np.column_stack([class_ids.astype(np.float64), coords.astype(np.float64)])
+            with open(os.path.join(labels_dir, name + ".txt"), 'w', encoding='utf-8') as f:
+                f.write((row_fmt * len(rows)) % tuple(rows.ravel().tolist()))
+        print(f"✅ 라벨 txt 내보내기 완료: {labels_dir} (이미지 {len(self.names)}개)")
+
+
+def open_label_store(label_store):
+    """경로(str) 또는 LabelStore를 받아 LabelStore로 반환한다 (None은 그대로)."""
+    if label_store is None or isinstance(label_store, LabelStore):
+        return label_store
+    return LabelStore(label_store)
+
+
+def load_labels(label_dir, name, store=None, num_coords=None):
+    """
+    이미지 하나의 라벨을 (class_ids, coords)로 읽는다.
+    store가 있으면 저장소에서, 없으면 label_dir/name.txt 에서 읽는다. 라벨이 없으면 None.
+    """
+    if store is not None:
+        return store.get(name)
+    label_path = os.path.join(label_dir, name + ".txt")
+    if not os.path.exists(label_path):
+        return None
+    return read_label_file(label_path, num_coords)
+
+
+def label_names(label_dir, store=None):
+    """라벨이 있는 이미지 이름(확장자 제외) 목록"""
+    if store is not None:
+        return list(store.names)
+    return [os.path.splitext(f)[0] for f in os.listdir(label_dir) if f.endswith('.txt')]
+
+
+if __name__ == "__main__":
+    LABELS_DIR = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset2/4_800labels"
+    NUM_COORDS = 8  # OBB: 8, 일반 YOLO(AABB): 4
+
+    build_label_store(LABELS_DIR, store_path_for(LABELS_DIR), NUM_COORDS)
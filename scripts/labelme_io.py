@@ -0,0 +1,134 @@
+# scripts/labelme_io.py
+# labelme JSON 스트리밍 리더
+# 파일을 조금씩 읽으면서 최상위 필드만 파싱하고, imageData(base64 이미지)는 디코딩 없이 건너뛴다.
+# 메모리 사용량과 파싱 시간이 이미지 크기가 아니라 shapes 개수에 비례한다.
+import json
+
+# 기본으로 건너뛰는 필드
+SKIP_FIELDS = ("imageData",)
+
+# 라벨 변환에 필요한 필드
+SHAPE_FIELDS = ("shapes", "imageWidth", "imageHeight")
+
+_WHITESPACE = b" \t\n\r"
+
+
+class _StreamParser:
+    """
+    바이너리로 읽어 건너뛸 문자열은 UTF-8 디코딩조차 하지 않는다.
+    필요한 값만 그 부분을 디코딩해 json.JSONDecoder.raw_decode로 파싱한다.
+    """
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = b""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        # 이미 처리한 앞부분은 버리고, 버퍼 크기만큼 더 읽는다 (큰 값도 재파싱 비용이 선형으로 유지됨)
+        if self.eof:
+            return False
+        chunk = self.f.read(max(self.chunk_size, len(self.buf) - self.pos))
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        if not chunk:
+            self.eof = True
+        return bool(chunk)
+
+    def _error(self, msg):
+        return json.JSONDecodeError(msg, self.buf.decode('utf-8', 'replace'), self.pos)
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos:self.pos + 1]
+            if not self._fill():
+                raise self._error("Unexpected end of JSON input")
+
+    def expect(self, ch):
+        if self.peek() != ch:
+            raise self._error(f"Expecting '{ch.decode()}'")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            # 버퍼 끝에서 잘린 멀티바이트 문자는 surrogateescape로 보존해 위치 계산이 어긋나지 않게 한다
+            text = self.buf[self.pos:].decode('utf-8', 'surrogateescape')
+            try:
+                value, end = self.decoder.raw_decode(text)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # 숫자 등이 버퍼 끝에서 잘렸을 수 있으므로 뒤에 문자가 더 있어야 확정한다
+            if end < len(text) or not self._fill():
+                if len(text) == len(self.buf) - self.pos:  # ASCII만 있는 경우
+                    self.pos += end
+                else:
+                    self.pos += len(text[:end].encode('utf-8', 'surrogateescape'))
+                return value
+
+    def skip_string(self):
+        """문자열 값을 디코딩하지 않고 닫는 따옴표까지 건너뛴다"""
+        self.expect(b'"')
+        while True:
+            quote = self.buf.find(b'"', self.pos)
+            backslash = self.buf.find(b'\\', self.pos, len(self.buf) if quote < 0 else quote)
+            if backslash >= 0:
+                # 이스케이프 문자: 다음 한 바이트까지 건너뛴다
+                if backslash + 1 >= len(self.buf):
+                    self.pos = backslash
+                    if not self._fill():
+                        raise self._error("Unterminated string")
+                    continue
+                self.pos = backslash + 2
+                continue
+            if quote >= 0:
+                self.pos = quote + 1
+                return
+            self.pos = len(self.buf)
+            if not self._fill():
+                raise self._error("Unterminated string")
+
+
+def load_labelme(json_path, fields=None, skip_fields=SKIP_FIELDS, chunk_size=1 << 16):
+    """
+    labelme JSON 파일을 스트리밍으로 읽어 dict로 반환한다.
+    fields를 주면 해당 최상위 필드만 담는다 (예: SHAPE_FIELDS).
+    skip_fields의 값은 디코딩하지 않고 건너뛰며, 결과 dict에도 포함되지 않는다.
+    형식이 잘못된 파일은 json.load와 마찬가지로 json.JSONDecodeError를 발생시킨다.
+    """
+    wanted = set(fields) if fields is not None else None
+    skip = set(skip_fields or ())
+    data = {}
+
+    with open(json_path, 'rb') as f:
+        parser = _StreamParser(f, chunk_size)
+        parser.expect(b'{')
+        if parser.peek() == b'}':
+            return data
+        while True:
+            key = parser.value()
+            if not isinstance(key, str):
+                raise parser._error("Expecting property name")
+            parser.expect(b':')
+
+            keep = key not in skip and (wanted is None or key in wanted)
+            if not keep and parser.peek() == b'"':
+                parser.skip_string()
+            else:
+                value = parser.value()
+                if keep:
+                    data[key] = value
+
+            if parser.peek() == b',':
+                parser.pos += 1
+                continue
+            parser.expect(b'}')
+            return data
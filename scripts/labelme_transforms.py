@@ -0,0 +1,60 @@
+# scripts/labelme_transforms.py
+# labelme JSON(dict)에 대한 메모리 내 변환 함수
+# 0_linecolor_issue / 1_1_convert_to_one_class / t1_poly_to_rect 가 파일 단위로 하던 작업을
+# 한 번 파싱한 데이터에 이어서 적용할 수 있도록 함수로 분리했다. 모두 data를 직접 수정하고 그대로 반환한다.
+
+# 1_1_convert_to_one_class 기본 설정
+COMPONENT_CLASSES = {"AL-Capacitor", "BGA", "C-chip", "Crystal", "DPAK", "Inductor",
+    "L-chip", "LED", "MELF", "PLCC(Square)", "QFN(Rectangular)", "QFN(Square)",
+    "QFP(Square)", "R-chip", "ResistorsChipArray", "SOD", "SOIC", "SON", "SOP",
+    "SOT", "TSOP", "Tantalum", "CMounting","Chip","Array","4sideIC","2sideIC","Circle"}
+COMPONENT_CLASS_NAME = "component"
+
+
+def strip_colors(data):
+    """lineColor, fillColor, imageData 및 shape별 lineColor, fillColor, flags 제거 (0_linecolor_issue)"""
+    data.pop('lineColor', None)
+    data.pop('fillColor', None)
+    data.pop('imageData', None)
+    for shape in data.get('shapes', []):
+        shape.pop('lineColor', None)
+        shape.pop('fillColor', None)
+        shape.pop('flags', None)
+    return data
+
+
+def to_one_class(data, classes_to_keep=COMPONENT_CLASSES, new_class_name=COMPONENT_CLASS_NAME):
+    """classes_to_keep에 속한 shape만 남기고 라벨을 new_class_name 하나로 통일 (1_1_convert_to_one_class)"""
+    new_shapes = []
+    for shape in data.get("shapes", []):
+        if shape["label"] in classes_to_keep:
+            shape["label"] = new_class_name
+            new_shapes.append(shape)
+    data["shapes"] = new_shapes
+    return data
+
+
+def calculate_slope(points):
+    """첫 번째 변의 기울기 (수직이면 inf)"""
+    if len(points) < 2:
+        return 0
+    x1, y1 = points[0]
+    x2, y2 = points[1]
+    if x2 - x1 == 0:
+        return float('inf')
+    return abs((y2 - y1) / (x2 - x1))
+
+
+def polygons_to_rectangles(data, max_slope=10):
+    """기울기가 max_slope 미만인 polygon을 2점 rectangle(AABB)로 변환 (t1_poly_to_rect)"""
+    for shape in data.get("shapes", []):
+        if shape.get("shape_type") == "polygon":
+            slope = calculate_slope(shape["points"])
+            if slope < max_slope:
+                x_coords = [point[0] for point in shape["points"]]
+                y_coords = [point[1] for point in shape["points"]]
+                xmin, xmax = min(x_coords), max(x_coords)
+                ymin, ymax = min(y_coords), max(y_coords)
+                shape["points"] = [[xmin, ymin], [xmax, ymax]]
+                shape["shape_type"] = "rectangle"
+    return data
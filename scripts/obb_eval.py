@@ -0,0 +1,63 @@
+# scripts/obb_eval.py
+# 회전 박스(OBB) COCO 스타일 평가
+# GT/예측 annotation에 "obb": [x1, y1, x2, y2, x3, y3, x4, y4] (픽셀) 를 함께 저장해 두면
+# pycocotools COCOeval의 IoU 계산만 polygon IoU로 바꿔, AP/AR 요약(small/medium/large 포함)은 그대로 쓴다.
+# "bbox"는 loadRes 호환을 위한 외접 사각형이고, "area"는 polygon 면적으로 다시 채운다.
+import numpy as np
+from pycocotools.coco import COCO
+from pycocotools.cocoeval import COCOeval
+
+from obb_geometry import coords_to_polygon, polygon_area, polygon_iou_matrix
+
+OBB_KEY = "obb"
+
+
+class OBBCOCOeval(COCOeval):
+    """computeIoU를 회전 박스 polygon IoU로 바꾼 COCOeval (iouType은 'bbox'로 둔다)"""
+
+    def __init__(self, coco_gt=None, coco_dt=None):
+        super().__init__(coco_gt, coco_dt, "bbox")
+
+    def computeIoU(self, imgId, catId):
+        p = self.params
+        if p.useCats:
+            gt = self._gts[imgId, catId]
+            dt = self._dts[imgId, catId]
+        else:
+            gt = [_ for cId in p.catIds for _ in self._gts[imgId, cId]]
+            dt = [_ for cId in p.catIds for _ in self._dts[imgId, cId]]
+        if len(gt) == 0 and len(dt) == 0:
+            return []
+        inds = np.argsort([-d['score'] for d in dt], kind='mergesort')
+        dt = [dt[i] for i in inds]
+        if len(dt) > p.maxDets[-1]:
+            dt = dt[0:p.maxDets[-1]]
+
+        # iscrowd GT는 사용하지 않는다 (YOLO 라벨에는 crowd가 없음)
+        g = coords_to_polygon([o[OBB_KEY] for o in gt])
+        d = coords_to_polygon([o[OBB_KEY] for o in dt])
+        return polygon_iou_matrix(d, g)
+
+
+def load_obb_results(coco_gt, results):
+    """loadRes 후 예측 area를 외접 사각형 면적 대신 polygon 면적으로 바꾼다."""
+    coco_dt = coco_gt.loadRes(results)
+    for ann in coco_dt.anns.values():
+        ann["area"] = float(polygon_area(coords_to_polygon(ann[OBB_KEY]))[0])
+    return coco_dt
+
+
+def obb_coco_evaluation(gt_file, dt_file, max_dets=(1, 10, 100)):
+    """
+    coco_evaluation의 OBB 버전. stats(12개)를 반환한다.
+    gt_file은 경로 또는 이미 만든 COCO 객체, dt_file은 경로 또는 결과 dict 목록이다.
+    """
+    coco_gt = gt_file if isinstance(gt_file, COCO) else COCO(gt_file)
+    coco_dt = load_obb_results(coco_gt, dt_file)
+    coco_eval = OBBCOCOeval(coco_gt, coco_dt)
+    coco_eval.params.iouThrs = np.linspace(0.5, 0.95, 10)
+    coco_eval.params.maxDets = list(max_dets)
+    coco_eval.evaluate()
+    coco_eval.accumulate()
+    coco_eval.summarize()
+    return coco_eval.stats
@@ -0,0 +1,194 @@
+# scripts/obb_geometry.py
+# 회전 박스(OBB) 기하 계산 공통 함수 (NumPy, CPU)
+# - rbox [x_center, y_center, w, h, theta] ↔ 4점 polygon (N,4,2)
+# - 볼록 사각형 쌍의 교집합 면적/IoU를 후보 쌍 배열 단위로 한 번에 계산한다.
+#   교집합 polygon의 꼭짓점 후보(A 안의 B 꼭짓점, B 안의 A 꼭짓점, 변-변 교점 16개)를 모아
+#   중심 기준 각도로 정렬한 뒤 신발끈 공식으로 면적을 구한다.
+# - GT 수천 개 × 예측 수천 개도 다룰 수 있도록 AABB가 겹치는 쌍만 골라 청크 단위로 계산한다.
+import numpy as np
+
+# 한 번에 계산할 후보 쌍 수 (메모리 사용량 조절)
+PAIR_CHUNK = 1 << 16
+
+_EPS = 1e-9
+
+
+def rbox_to_polygon(rboxes):
+    """[x_center, y_center, w, h, theta(라디안)] (N,5) → 4점 polygon (N,4,2)"""
+    rboxes = np.asarray(rboxes, dtype=np.float64).reshape(-1, 5)
+    cx, cy, w, h, theta = rboxes.T
+    cos, sin = np.cos(theta), np.sin(theta)
+    # 박스 좌표계의 네 꼭짓점 (반시계/시계 방향 순서 유지)
+    dx = np.stack([-w, w, w, -w], axis=1) / 2
+    dy = np.stack([-h, -h, h, h], axis=1) / 2
+    xs = cx[:, None] + dx * cos[:, None] - dy * sin[:, None]
+    ys = cy[:, None] + dx * sin[:, None] + dy * cos[:, None]
+    return np.stack([xs, ys], axis=2)
+
+
+def coords_to_polygon(coords):
+    """[x1, y1, ..., x4, y4] (N,8) → (N,4,2)"""
+    return np.asarray(coords, dtype=np.float64).reshape(-1, 4, 2)
+
+
+def polygon_area(polygons):
+    """4점 polygon (N,4,2)의 면적 (N,)"""
+    polygons = np.asarray(polygons, dtype=np.float64).reshape(-1, 4, 2)
+    x, y = polygons[..., 0], polygons[..., 1]
+    return 0.5 * np.abs(np.sum(x * np.roll(y, -1, axis=1) - np.roll(x, -1, axis=1) * y, axis=1))
+
+
+def polygon_bounds(polygons):
+    """4점 polygon (N,4,2)의 외접 사각형 [x_min, y_min, x_max, y_max] (N,4)"""
+    polygons = np.asarray(polygons, dtype=np.float64).reshape(-1, 4, 2)
+    return np.concatenate([polygons.min(axis=1), polygons.max(axis=1)], axis=1)
+
+
+def _cross(o, a, b):
+    return (a[..., 0] - o[..., 0]) * (b[..., 1] - o[..., 1]) - (a[..., 1] - o[..., 1]) * (b[..., 0] - o[..., 0])
+
+
+def _points_in_quads(points, quads):
+    """points (P,K,2)가 같은 행의 볼록 사각형 quads (P,4,2) 안(경계 포함)에 있는지 (P,K)"""
+    start = quads[:, None, :, :]                       # (P,1,4,2)
+    end = np.roll(quads, -1, axis=1)[:, None, :, :]    # (P,1,4,2)
+    side = _cross(start, end, points[:, :, None, :])   # (P,K,4)
+    return np.all(side >= -_EPS, axis=2) | np.all(side <= _EPS, axis=2)
+
+
+def _edge_intersections(quads_a, quads_b):
+    """두 사각형의 변-변 교점 (P,16,2)와 유효 여부 (P,16)"""
+    a1 = quads_a[:, :, None, :]
+    a2 = np.roll(quads_a, -1, axis=1)[:, :, None, :]
+    b1 = quads_b[:, None, :, :]
+    b2 = np.roll(quads_b, -1, axis=1)[:, None, :, :]
+    da = a2 - a1                                       # (P,4,1,2)
+    db = b2 - b1                                       # (P,1,4,2)
+    denom = da[..., 0] * db[..., 1] - da[..., 1] * db[..., 0]          # (P,4,4)
+    diff = b1 - a1
+    parallel = np.abs(denom) < _EPS
+    safe = np.where(parallel, 1.0, denom)
+    t = (diff[..., 0] * db[..., 1] - diff[..., 1] * db[..., 0]) / safe
+    u = (diff[..., 0] * da[..., 1] - diff[..., 1] * da[..., 0]) / safe
+    valid = ~parallel & (t >= -_EPS) & (t <= 1 + _EPS) & (u >= -_EPS) & (u <= 1 + _EPS)
+    points = a1 + t[..., None] * da
+    return points.reshape(len(quads_a), 16, 2), valid.reshape(len(quads_a), 16)
+
+
+def intersection_area(quads_a, quads_b):
+    """같은 행끼리 짝지은 볼록 사각형 (P,4,2), (P,4,2)의 교집합 면적 (P,)"""
+    quads_a = np.asarray(quads_a, dtype=np.float64)
+    quads_b = np.asarray(quads_b, dtype=np.float64)
+    if len(quads_a) == 0:
+        return np.zeros(0, dtype=np.float64)
+
+    cross_points, cross_valid = _edge_intersections(quads_a, quads_b)
+    points = np.concatenate([quads_a, quads_b, cross_points], axis=1)              # (P,24,2)
+    valid = np.concatenate([
+        _points_in_quads(quads_a, quads_b),
+        _points_in_quads(quads_b, quads_a),
+        cross_valid,
+    ], axis=1)                                                                     # (P,24)
+
+    count = valid.sum(axis=1)
+    center = np.sum(points * valid[..., None], axis=1) / np.maximum(count, 1)[:, None]
+    angle = np.arctan2(points[..., 1] - center[:, None, 1], points[..., 0] - center[:, None, 0])
+    angle = np.where(valid, angle, np.inf)  # 유효하지 않은 점은 뒤로 보낸다
+    order = np.argsort(angle, axis=1)
+    points = np.take_along_axis(points, order[..., None], axis=1)
+    valid = np.take_along_axis(valid, order, axis=1)
+    # 뒤쪽 무효 점은 첫 점으로 채워 닫힌 다각형의 면적에 영향이 없게 한다
+    points = np.where(valid[..., None], points, points[:, :1, :])
+
+    x, y = points[..., 0], points[..., 1]
+    area = 0.5 * np.abs(np.sum(x * np.roll(y, -1, axis=1) - np.roll(x, -1, axis=1) * y, axis=1))
+    return np.where(count >= 3, area, 0.0)
+
+
+def polygon_iou_matrix(polys_a, polys_b, chunk=PAIR_CHUNK):
+    """
+    4점 polygon (A,4,2), (B,4,2)의 IoU 행렬 (A,B).
+    외접 사각형이 겹치는 쌍만 후보로 골라 chunk 단위로 교집합을 계산한다.
+    """
+    polys_a = np.asarray(polys_a, dtype=np.float64).reshape(-1, 4, 2)
+    polys_b = np.asarray(polys_b, dtype=np.float64).reshape(-1, 4, 2)
+    ious = np.zeros((len(polys_a), len(polys_b)), dtype=np.float64)
+    if len(polys_a) == 0 or len(polys_b) == 0:
+        return ious
+
+    bounds_a, bounds_b = polygon_bounds(polys_a), polygon_bounds(polys_b)
+    overlap = (
+        (bounds_a[:, None, 0] < bounds_b[None, :, 2]) & (bounds_b[None, :, 0] < bounds_a[:, None, 2]) &
+        (bounds_a[:, None, 1] < bounds_b[None, :, 3]) & (bounds_b[None, :, 1] < bounds_a[:, None, 3])
+    )
+    idx_a, idx_b = np.nonzero(overlap)
+    area_a, area_b = polygon_area(polys_a), polygon_area(polys_b)
+
+    for start in range(0, len(idx_a), chunk):
+        ia, ib = idx_a[start:start + chunk], idx_b[start:start + chunk]
+        inter = intersection_area(polys_a[ia], polys_b[ib])
+        union = area_a[ia] + area_b[ib] - inter
+        ious[ia, ib] = np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+    return ious
+
+
+def xyxy_to_polygon(boxes):
+    """[x1, y1, x2, y2] (N,4) → 축 정렬 4점 polygon (N,4,2)"""
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    x1, y1, x2, y2 = boxes.T
+    return np.stack([np.stack([x1, y1], 1), np.stack([x2, y1], 1), np.stack([x2, y2], 1), np.stack([x1, y2], 1)], 1)
+
+
+def overlapping_pairs(bounds, chunk=1024):
+    """외접 사각형 (N,4)끼리 겹치는 쌍 (i < j) 의 인덱스 배열 두 개"""
+    pairs_i, pairs_j = [], []
+    for start in range(0, len(bounds), chunk):
+        rows = bounds[start:start + chunk]
+        overlap = (
+            (rows[:, None, 0] < bounds[None, :, 2]) & (bounds[None, :, 0] < rows[:, None, 2]) &
+            (rows[:, None, 1] < bounds[None, :, 3]) & (bounds[None, :, 1] < rows[:, None, 3])
+        )
+        i, j = np.nonzero(overlap)
+        i += start
+        keep = i < j
+        pairs_i.append(i[keep])
+        pairs_j.append(j[keep])
+    if not pairs_i:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(pairs_i), np.concatenate(pairs_j)
+
+
+def nms_polygons(polygons, scores, iou_threshold=0.5, classes=None):
+    """
+    4점 polygon (N,4,2)의 NMS. 남길 인덱스를 점수 내림차순으로 반환한다.
+    외접 사각형이 겹치는 쌍만 IoU를 (한 번에) 계산하고, 점수순으로 억제한다.
+    classes를 주면 같은 클래스끼리만 억제한다.
+    """
+    polygons = np.asarray(polygons, dtype=np.float64).reshape(-1, 4, 2)
+    scores = np.asarray(scores, dtype=np.float64)
+    order = np.argsort(-scores, kind="stable")
+    polygons = polygons[order]
+    if len(order) == 0:
+        return order
+
+    # 정렬된 순서 기준 i < j 이므로 i가 점수가 더 높다
+    i, j = overlapping_pairs(polygon_bounds(polygons))
+    if classes is not None:
+        classes = np.asarray(classes)[order]
+        same = classes[i] == classes[j]
+        i, j = i[same], j[same]
+    areas = polygon_area(polygons)
+    inter = intersection_area(polygons[i], polygons[j])
+    union = areas[i] + areas[j] - inter
+    iou = np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+    i, j = i[iou > iou_threshold], j[iou > iou_threshold]
+
+    # 억제 관계를 i 기준으로 묶어 두고 점수순으로 한 번 훑는다
+    by_i = np.argsort(i, kind="stable")
+    i, j = i[by_i], j[by_i]
+    starts = np.searchsorted(i, np.arange(len(order) + 1))
+    suppressed = np.zeros(len(order), dtype=bool)
+    for k in range(len(order)):
+        if not suppressed[k] and starts[k] != starts[k + 1]:
+            suppressed[j[starts[k]:starts[k + 1]]] = True
+    return order[~suppressed]
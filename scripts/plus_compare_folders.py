@@ -1,11 +1,14 @@
 import os
 
+from dataset_checker import scan_files
+
 def compare_folders(folder1, folder2):
-    folder1_files = set(os.listdir(folder1))
-    folder2_files = set(os.listdir(folder2))
-    
     image_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.bmp'}
     json_extension = '.json'
+
+    # 폴더마다 os.scandir 한 번 (이미지와 JSON만)
+    folder1_files = {os.path.basename(p) for p in scan_files(folder1, image_extensions | {json_extension})}
+    folder2_files = {os.path.basename(p) for p in scan_files(folder2, image_extensions | {json_extension})}
     
     folder1_images = {f for f in folder1_files if os.path.splitext(f)[1].lower() in image_extensions}
     folder2_images = {f for f in folder2_files if os.path.splitext(f)[1].lower() in image_extensions}
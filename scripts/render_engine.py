@@ -0,0 +1,209 @@
+# scripts/render_engine.py
+# 라벨 시각화 스크립트 공통 렌더링 엔진
+# - 이미지 한 장을 작업 하나로 프로세스 풀에서 그린다 (워커 안에서는 OpenCV 내부 스레드를 꺼서 코어를 겹쳐 쓰지 않게 한다)
+# - 이미지 내용 해시와 라벨 내용 해시를 매니페스트에 기록해 두고, 둘 다 그대로인 이미지는 다시 그리지 않는다
+# - JPEG 품질과 출력 축소 비율을 지정할 수 있다.
+# 그리는 방법은 스크립트마다 다르므로 draw(image, class_ids, coords, **draw_kwargs) -> image 함수를 넘겨받는다.
+# (draw는 워커로 넘길 수 있도록 모듈 최상위 함수여야 한다)
+# draw 함수용 공통 도구: 라벨 배열 → 픽셀 polygon 변환,
+# 같은 색 polygon을 한 번의 polylines/fillPoly 호출로 그리기, 밀도에 맞춰 겹치지 않는 텍스트만 고르기.
+import os
+import sys
+import hashlib
+
+import cv2
+import numpy as np
+
+from batch_runner import run_ordered
+from dataset_manifest import DatasetManifest, manifest_path_for
+from label_store import open_label_store, label_names, load_labels
+
+IMAGE_EXTENSIONS = ('.jpg', '.png', '.jpeg')
+NUM_WORKERS = os.cpu_count() or 1
+JPEG_QUALITY = 95
+# 출력 이미지 축소 비율 (1.0이면 원본 크기)
+OUTPUT_SCALE = 1.0
+OUTPUT_SUFFIX = "_visualized.jpg"
+
+# 렌더링 결과를 바꾸는 변경을 소스 해시로 잡을 수 없을 때 (예: OpenCV 버전 변경) 올려서 전체를 다시 그린다
+RENDER_VERSION = 1
+# 텍스트 표시 방식: "auto"(겹치지 않게 격자 칸마다 하나), "all"(모두), "none"(표시 안 함)
+TEXT_MODES = ("auto", "all", "none")
+
+
+def find_image(image_dir, base_name):
+    for ext in IMAGE_EXTENSIONS:
+        image_path = os.path.join(image_dir, base_name + ext)
+        if os.path.exists(image_path):
+            return image_path
+    return None
+
+
+def labels_digest(class_ids, coords):
+    """라벨 배열 내용의 SHA-1 (txt 파일이든 저장소든 같은 값)"""
+    h = hashlib.sha1()
+    h.update(np.ascontiguousarray(class_ids, dtype=np.int64).tobytes())
+    h.update(np.ascontiguousarray(coords, dtype=np.float32).tobytes())
+    return h.hexdigest()
+
+
+def draw_fingerprint(draw):
+    """
+    draw 함수를 정의한 모듈과 이 모듈의 소스 SHA-1.
+    draw 안의 색/투명도/텍스트나 모듈 상수, 공통 그리기 도구가 바뀌면 값이 달라져 매니페스트가 무효화된다.
+    """
+    h = hashlib.sha1()
+    for module_file in (getattr(sys.modules.get(draw.__module__), "__file__", None), __file__):
+        if module_file and os.path.exists(module_file):
+            with open(module_file, "rb") as f:
+                h.update(f.read())
+    return h.hexdigest()
+
+
+def write_jpeg(path, image, quality=JPEG_QUALITY, scale=OUTPUT_SCALE):
+    """scale < 1이면 INTER_AREA로 줄인 뒤 지정한 품질로 JPEG 저장한다."""
+    if scale != 1.0:
+        height, width = image.shape[:2]
+        size = (max(int(round(width * scale)), 1), max(int(round(height * scale)), 1))
+        image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+    return cv2.imwrite(path, image, [cv2.IMWRITE_JPEG_QUALITY, int(quality)])
+
+
+def label_polygons(coords, width, height, is_obb=True):
+    """
+    정규화 라벨 좌표 (N,8) 또는 (N,4) [x_center, y_center, w, h] → 정수 픽셀 polygon (N,4,2) int32.
+    좌표는 기존 시각화와 같이 0 방향으로 버림한다.
+    """
+    if is_obb:
+        points = np.asarray(coords, dtype=np.float32).reshape(-1, 4, 2) * np.float32([width, height])
+    else:
+        coords = np.asarray(coords, dtype=np.float64).reshape(-1, 4)
+        xc, yc = coords[:, 0] * width, coords[:, 1] * height
+        w, h = coords[:, 2] * width, coords[:, 3] * height
+        x1, y1, x2, y2 = xc - w / 2, yc - h / 2, xc + w / 2, yc + h / 2
+        points = np.stack([np.stack([x1, y1], 1), np.stack([x2, y1], 1),
+                           np.stack([x2, y2], 1), np.stack([x1, y2], 1)], 1)
+    return points.astype(np.int32)
+
+
+def polygon_extent(polygons):
+    """정수 polygon (N,4,2)의 외접 사각형 폭, 높이 (N,), (N,)"""
+    extent = polygons.max(axis=1) - polygons.min(axis=1)
+    return extent[:, 0], extent[:, 1]
+
+
+def draw_polygon_groups(image, polygons, groups, colors, thickness=2, fill=False):
+    """
+    groups (N,) 값마다 해당 polygon 전체를 cv2.polylines(fill=True면 fillPoly) 한 번으로 그린다.
+    colors는 그룹 값 → BGR 색 (dict 또는 시퀀스).
+    """
+    for group in np.unique(groups):
+        selected = list(polygons[groups == group])
+        if fill:
+            cv2.fillPoly(image, selected, colors[group])
+        else:
+            cv2.polylines(image, selected, True, colors[group], thickness)
+    return image
+
+
+def text_mask(anchors, text_size, mode="auto"):
+    """
+    텍스트를 그릴 라벨 (N,) bool.
+    "auto"이면 이미지를 텍스트 크기(text_size = (폭, 높이)) 격자로 나눠 칸마다 첫 라벨 하나만 남겨
+    부품이 빽빽한 곳에서 글자가 겹쳐 읽을 수 없게 되는 것을 막는다.
+    """
+    if mode not in TEXT_MODES:
+        raise ValueError(f"알 수 없는 텍스트 방식: {mode} (가능: {', '.join(TEXT_MODES)})")
+    mask = np.zeros(len(anchors), dtype=bool)
+    if mode == "none" or len(anchors) == 0:
+        return mask
+    if mode == "all":
+        mask[:] = True
+        return mask
+    cells = np.floor_divide(np.asarray(anchors), np.maximum(np.asarray(text_size), 1)).astype(np.int64)
+    _, first = np.unique(cells, axis=0, return_index=True)
+    mask[first] = True
+    return mask
+
+
+def init_opencv_worker():
+    """워커 프로세스 initializer: 프로세스 수만큼 이미 병렬이므로 OpenCV 내부 스레드 풀은 끈다."""
+    cv2.setNumThreads(0)
+
+
+def render_one(task):
+    """작업 하나 (base_name, image_path, output_path, class_ids, coords, draw, draw_kwargs, quality, scale)를 그린다."""
+    base_name, image_path, output_path, class_ids, coords, draw, draw_kwargs, quality, scale = task
+    image = cv2.imread(image_path)
+    if image is None:
+        print(f"이미지를 불러올 수 없습니다: {image_path}")
+        return False
+    image = draw(image, class_ids, coords, **draw_kwargs)
+    if not write_jpeg(output_path, image, quality, scale):
+        print(f"이미지를 저장할 수 없습니다: {output_path}")
+        return False
+    print(f"시각화된 이미지 저장 완료: {output_path}")
+    return True
+
+
+def render_labels(label_dir, image_dir, output_dir, draw, draw_kwargs=None, label_store=None,
+                  num_workers=NUM_WORKERS, incremental=True, quality=JPEG_QUALITY, scale=OUTPUT_SCALE):
+    """
+    label_dir(또는 패킹 라벨 저장소)의 이미지마다 draw로 그린 결과를 output_dir/<이름>_visualized.jpg 로 저장한다.
+    incremental=True이면 이미지와 라벨이 지난 렌더링 이후 바뀌지 않은 항목은 건너뛰고,
+    라벨이 사라진 항목의 결과 이미지는 지운다. draw 함수(또는 그 소스)/draw_kwargs/품질/축소 비율/RENDER_VERSION이
+    바뀌면 전체를 다시 그린다.
+    반환: 실패한 이미지 이름 목록
+    """
+    draw_kwargs = draw_kwargs or {}
+    os.makedirs(output_dir, exist_ok=True)
+    store = open_label_store(label_store)
+    manifest = DatasetManifest(manifest_path_for(output_dir), params={
+        "draw": f"{draw.__module__}.{draw.__qualname__}",
+        "draw_source": draw_fingerprint(draw),
+        "version": RENDER_VERSION,
+        "draw_kwargs": draw_kwargs, "quality": quality, "scale": scale,
+    }) if incremental else None
+
+    tasks, digests, names = [], {}, []
+    for base_name in label_names(label_dir, store):
+        image_path = find_image(image_dir, base_name)
+        if image_path is None:
+            print(f"이미지가 없습니다: {base_name}")
+            continue
+        names.append(base_name)
+        class_ids, coords = load_labels(label_dir, base_name, store)
+        class_ids, coords = np.array(class_ids), np.array(coords)
+        output_path = os.path.join(output_dir, base_name + OUTPUT_SUFFIX)
+        if manifest:
+            digests[base_name] = labels_digest(class_ids, coords)
+            entry = manifest.get(base_name)
+            if (entry and entry.get("labels") == digests[base_name]
+                    and manifest.is_fresh(base_name, [image_path], [output_path])):
+                continue
+        tasks.append((base_name, image_path, output_path, class_ids, coords, draw, draw_kwargs, quality, scale))
+
+    if manifest:
+        removed = manifest.prune(names)
+        print(f"ℹ️ 변경 없음 {len(names) - len(tasks)}개 건너뜀, 삭제된 항목 {len(removed)}개 정리")
+    total = len(tasks)
+    print(f"🚀 {total}개 이미지 렌더링 시작 (워커 {max(num_workers, 1)}개)")
+
+    failures = []
+    try:
+        results = run_ordered(render_one, tasks, num_workers, initializer=init_opencv_worker)
+        for i, (task, ok, _, log, _) in enumerate(results, 1):
+            base_name, image_path, output_path = task[:3]
+            # 실패한 항목은 어느 이미지인지 알 수 있게 이름을 붙인다
+            print(f"[{i}/{total}] {'' if ok else base_name + ': '}{log}", end="" if log.endswith("\n") else "\n")
+            if not ok:
+                failures.append(base_name)
+                if manifest:
+                    manifest.discard(base_name)
+            elif manifest:
+                manifest.record(base_name, [image_path], [output_path], labels=digests[base_name])
+    finally:
+        # 중간에 중단되어도 끝난 항목까지는 기록을 남긴다
+        if manifest:
+            manifest.save()
+    return failures
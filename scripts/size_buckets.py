@@ -0,0 +1,12 @@
+# scripts/size_buckets.py
+# COCO 면적 기준 부품 크기 구간 (Small < 32² ≤ Medium < 96² ≤ Large)
+# 라벨 통계, 평가, 벤치마크, 시각화가 같은 경계를 쓰도록 한 곳에 둔다 (OpenCV 등 렌더링 의존성 없음).
+import numpy as np
+
+SIZE_BOUNDS = (32 ** 2, 96 ** 2)
+SIZE_NAMES = ("small", "medium", "large")
+
+
+def size_index(areas, bounds=SIZE_BOUNDS):
+    """면적 → 크기 구간 번호 (0: Small, 1: Medium, 2: Large)"""
+    return np.searchsorted(np.asarray(bounds), np.asarray(areas), side="right")
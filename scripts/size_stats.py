@@ -0,0 +1,132 @@
+# scripts/size_stats.py
+# 학습 해상도(imgsz) 후보별 부품 크기 분포
+# 라벨 전체를 한 번에 배열로 읽어 (그리지 않고) 해상도마다
+#   - 최소 변 길이(px) 분포 (최소, 하위 1%/5%, 중앙값)
+#   - 면적(px²) 히스토그램
+#   - COCO small/medium/large 비율
+#   - 최소 변이 MIN_SIDE_PX 미만이라 검출이 어려운 부품 비율
+# 을 표로 보여 주고, 작은 부품을 MAX_LOST_SHARE 이하로만 잃는 가장 작은 imgsz를 고른다.
+# ultralytics처럼 긴 변을 imgsz로 맞춘다고 보고, 원본 가로세로 비율은 IMAGE_SIZE로 준다.
+import json
+import numpy as np
+
+from obb_geometry import coords_to_polygon, polygon_area
+from size_buckets import size_index, SIZE_BOUNDS, SIZE_NAMES
+from label_store import open_label_store
+from dataset_checker import scan_stems, parse_label_texts, LABEL_EXTENSION
+
+RESOLUTIONS = (640, 800, 1024, 1280, 1600, 3904)
+# 면적 히스토그램 경계 (px²)
+AREA_BINS = (0, 8 ** 2, 16 ** 2, 32 ** 2, 64 ** 2, 96 ** 2, 128 ** 2, 256 ** 2, np.inf)
+# 최소 변이 이보다 짧으면 검출이 어렵다고 본다 (가장 촘촘한 특징 맵의 stride)
+MIN_SIDE_PX = 8
+# imgsz 추천 기준: MIN_SIDE_PX 미만인 부품 비율 상한
+MAX_LOST_SHARE = 0.01
+
+
+def load_all_labels(label_dir, num_coords, label_store=None):
+    """라벨 전체를 (class_ids (R,), coords (R,K)) 로 한 번에 읽는다. 좌표 개수가 맞지 않는 줄은 뺀다."""
+    store = open_label_store(label_store)
+    if store is not None:
+        return np.asarray(store.classes), np.asarray(store.coords, dtype=np.float64)
+    label_paths = scan_stems(label_dir, (LABEL_EXTENSION,))
+    texts = []
+    for name in sorted(label_paths):
+        with open(label_paths[name], 'r') as f:
+            texts.append(f.read())
+    _, _, _, rows, _ = parse_label_texts(texts, num_coords + 1)
+    return rows[:, 0].astype(np.int32), rows[:, 1:]
+
+
+def object_sizes(coords, image_size=None):
+    """
+    정규화 라벨 좌표 → 긴 변을 1로 맞춘 이미지에서의 (최소 변 길이 (R,), 면적 (R,)).
+    해상도 imgsz에서는 최소 변 × imgsz, 면적 × imgsz² 이다.
+    coords는 (R,8) OBB 4점 또는 (R,4) [x_center, y_center, w, h], image_size는 원본 (폭, 높이) (None이면 정사각형)
+    """
+    width, height = image_size or (1, 1)
+    scale = np.array([width, height], dtype=np.float64) / max(width, height)
+    coords = np.asarray(coords, dtype=np.float64)
+    if coords.shape[1] == 8:
+        polygons = coords_to_polygon(coords) * scale
+        edges = np.linalg.norm(polygons - np.roll(polygons, -1, axis=1), axis=2)
+        return edges.min(axis=1), polygon_area(polygons)
+    sides = coords[:, 2:4] * scale
+    return sides.min(axis=1), sides.prod(axis=1)
+
+
+def resolution_stats(min_side, area, resolution):
+    """해상도 하나의 크기 분포 요약 dict"""
+    min_side = min_side * resolution
+    area = area * resolution ** 2
+    count = max(len(area), 1)
+    hist, _ = np.histogram(area, bins=AREA_BINS)
+    coco = np.bincount(size_index(area), minlength=len(SIZE_NAMES))
+    percentiles = np.percentile(min_side, [1, 5, 50]) if len(min_side) else np.zeros(3)
+    return {
+        "resolution": resolution,
+        "objects": len(area),
+        "min_side": {
+            "min": float(min_side.min()) if len(min_side) else 0.0,
+            "p1": float(percentiles[0]), "p5": float(percentiles[1]), "p50": float(percentiles[2]),
+        },
+        "area_hist": [
+            {"from": float(lo), "to": float(hi), "share": float(n / count)}
+            for lo, hi, n in zip(AREA_BINS[:-1], AREA_BINS[1:], hist)
+        ],
+        "coco": {name: float(n / count) for name, n in zip(SIZE_NAMES, coco)},
+        "below_min_side": float(np.count_nonzero(min_side < MIN_SIDE_PX) / count),
+    }
+
+
+def size_stats(label_dir, num_coords, resolutions=RESOLUTIONS, image_size=None, label_store=None):
+    """라벨 전체를 읽어 해상도 후보마다 resolution_stats 목록을 반환한다."""
+    _, coords = load_all_labels(label_dir, num_coords, label_store)
+    min_side, area = object_sizes(coords, image_size)
+    return [resolution_stats(min_side, area, resolution) for resolution in sorted(resolutions)]
+
+
+def pick_imgsz(stats, max_lost_share=MAX_LOST_SHARE):
+    """최소 변이 MIN_SIDE_PX 미만인 부품 비율이 max_lost_share 이하인 가장 작은 해상도 (없으면 None)"""
+    for item in sorted(stats, key=lambda s: s["resolution"]):
+        if item["below_min_side"] <= max_lost_share:
+            return item["resolution"]
+    return None
+
+
+def print_stats(stats):
+    if not stats:
+        return
+    print(f"부품 {stats[0]['objects']}개, COCO 경계 {SIZE_BOUNDS[0]}/{SIZE_BOUNDS[1]} px², 최소 변 기준 {MIN_SIDE_PX} px")
+    print(f"{'imgsz':>6} {'min':>6} {'p1':>6} {'p5':>6} {'p50':>7} {'small':>7} {'medium':>7} {'large':>7} "
+          f"{'<' + str(MIN_SIDE_PX) + 'px':>7}")
+    for item in stats:
+        side, coco = item["min_side"], item["coco"]
+        print(f"{item['resolution']:>6} {side['min']:6.1f} {side['p1']:6.1f} {side['p5']:6.1f} {side['p50']:7.1f} "
+              f"{coco['small']:7.1%} {coco['medium']:7.1%} {coco['large']:7.1%} {item['below_min_side']:7.1%}")
+
+    labels = [f"<{int(np.sqrt(hi))}²" if np.isfinite(hi) else f"≥{int(np.sqrt(lo))}²"
+              for lo, hi in zip(AREA_BINS[:-1], AREA_BINS[1:])]
+    print("\n면적 히스토그램 (px²)")
+    print(f"{'imgsz':>6} " + " ".join(f"{label:>7}" for label in labels))
+    for item in stats:
+        print(f"{item['resolution']:>6} " + " ".join(f"{b['share']:7.1%}" for b in item["area_hist"]))
+
+
+if __name__ == "__main__":
+    LABELS_DIR = "/home/a/A_2024_selfcode/NEW-PCB_Yolo/dataset2/4_800labels"
+    NUM_COORDS = 8  # OBB: 8, 일반 YOLO(AABB): 4
+    LABEL_STORE = None  # 패킹 라벨 저장소 경로 (None이면 LABELS_DIR의 txt)
+    IMAGE_SIZE = (3904, 3904)  # 원본 (폭, 높이) - 가로세로 비율만 쓰인다
+    REPORT_PATH = None  # JSON으로 저장할 경로
+
+    stats = size_stats(LABELS_DIR, NUM_COORDS, RESOLUTIONS, IMAGE_SIZE, LABEL_STORE)
+    print_stats(stats)
+    best = pick_imgsz(stats)
+    if best is None:
+        print(f"\n⚠️ 모든 후보에서 최소 변 {MIN_SIDE_PX}px 미만 부품이 {MAX_LOST_SHARE:.0%}를 넘습니다.")
+    else:
+        print(f"\n✅ 추천 imgsz: {best} (최소 변 {MIN_SIDE_PX}px 미만 부품 {MAX_LOST_SHARE:.0%} 이하)")
+    if REPORT_PATH:
+        with open(REPORT_PATH, "w", encoding="utf-8") as f:
+            json.dump({"stats": stats, "recommended_imgsz": best}, f, indent=1, ensure_ascii=False)
@@ -1,32 +1,8 @@
 import os
 import shutil
 import json
-import math
-
-# Function to calculate the slope of a polygon
-def calculate_slope(points):
-    if len(points) < 2:
-        return 0
-    x1, y1 = points[0]
-    x2, y2 = points[1]
-    if x2 - x1 == 0:  # Avoid division by zero
-        return float('inf')
-    return abs((y2 - y1) / (x2 - x1))
-
-# Function to convert polygons to rectangles
-def convert_polygons_to_rectangles(json_data):
-    for shape in json_data.get("shapes", []):
-        if shape.get("shape_type") == "polygon":
-            slope = calculate_slope(shape["points"])
-            if slope < 10:
-                # Convert polygon to rectangle
-                x_coords = [point[0] for point in shape["points"]]
-                y_coords = [point[1] for point in shape["points"]]
-                xmin, xmax = min(x_coords), max(x_coords)
-                ymin, ymax = min(y_coords), max(y_coords)
-                shape["points"] = [[xmin, ymin], [xmax, ymax]]
-                shape["shape_type"] = "rectangle"
-    return json_data
+from labelme_io import load_labelme
+from labelme_transforms import polygons_to_rectangles as convert_polygons_to_rectangles
 
 # Function to process all files in a directory
 def process_files_in_directory(input_dir, output_dir):
@@ -39,8 +15,8 @@ def process_files_in_directory(input_dir, output_dir):
                 json_path = os.path.join(root, file)
                 image_path = os.path.splitext(json_path)[0] + ".jpg"  # Assuming image extension is .jpg
 
-                with open(json_path, "r") as json_file:
-                    data = json.load(json_file)
+                # imageData is skipped; the image file is copied next to the JSON below
+                data = load_labelme(json_path)
 
                 # Modify the JSON data
                 modified_data = convert_polygons_to_rectangles(data)
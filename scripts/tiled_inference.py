@@ -0,0 +1,173 @@
+# scripts/tiled_inference.py
+# 원본 해상도(3904px) 보드를 모델 입력 크기 타일로 잘라 추론하는 슬라이딩 윈도우 추론
+# - 겹치는 타일로 자르고 (마지막 타일은 이미지 끝에 맞춘다)
+# - 타일을 배치로 추론한 뒤 검출 좌표를 원본 좌표로 옮기고
+# - 타일 안쪽 경계에 걸린(잘린) 검출은 잘린 범위가 다른 타일 안쪽에 온전히 들어가는 경우에만 버린다
+#   (그 타일이 같은 부품을 더 넓게 본다).
+#   겹침보다 큰 부품은 어느 타일에서도 온전히 보이지 않으므로, 이미지 전체를 tile_size로 줄여 한 번 더 추론하고
+#   그 검출이 덮는 잘린 조각만 버린다. 아무도 덮지 않는 잘린 조각은 그대로 남긴다 (부품을 통째로 잃지 않게).
+# - 타일 경계의 중복 검출은 polygon NMS(obb_geometry.nms_polygons)로 합친다.
+import numpy as np
+
+from obb_geometry import rbox_to_polygon, xyxy_to_polygon, polygon_bounds, polygon_area, nms_polygons
+from obb_geometry import intersection_area, overlapping_pairs
+
+TILE_SIZE = 800
+TILE_OVERLAP = 0.2
+TILE_BATCH_SIZE = 8
+MERGE_IOU = 0.5
+# 타일 안쪽 경계에서 이 거리(px) 안에 닿은 검출은 잘린 것으로 보고 버린다
+EDGE_MARGIN = 2
+# 타일과 함께 이미지 전체를 tile_size로 줄여 한 번 더 추론한다 (겹침보다 큰 부품용)
+FULL_IMAGE_PASS = True
+# 전체 이미지 검출이 잘린 조각 면적의 이 비율 이상을 덮으면 조각을 버린다
+FRAGMENT_COVER = 0.5
+
+
+def tile_origins(length, tile_size, overlap):
+    """한 축의 타일 시작 좌표 목록. 마지막 타일은 끝에 맞춘다."""
+    if length <= tile_size:
+        return [0]
+    stride = max(int(round(tile_size * (1 - overlap))), 1)
+    origins = list(range(0, length - tile_size, stride))
+    origins.append(length - tile_size)
+    return origins
+
+
+def make_tiles(image, tile_size=TILE_SIZE, overlap=TILE_OVERLAP):
+    """이미지를 (타일 목록, 타일 원점 (T,2) [x0, y0])로 자른다. 타일은 원본의 view이다."""
+    height, width = image.shape[:2]
+    origins = [(x0, y0) for y0 in tile_origins(height, tile_size, overlap)
+               for x0 in tile_origins(width, tile_size, overlap)]
+    tiles = [image[y0:y0 + tile_size, x0:x0 + tile_size] for x0, y0 in origins]
+    return tiles, np.asarray(origins, dtype=np.float64).reshape(-1, 2)
+
+
+def _result_arrays(result):
+    """ultralytics Results 하나 → (polygon (N,4,2), rbox 또는 xyxy 배열, cls, conf, obb 여부)"""
+    if getattr(result, "obb", None) is not None:
+        boxes = result.obb.xywhr.cpu().numpy().astype(np.float64)
+        polygons = rbox_to_polygon(boxes)
+        parts = result.obb
+        obb = True
+    else:
+        boxes = result.boxes.xyxy.cpu().numpy().astype(np.float64)
+        polygons = xyxy_to_polygon(boxes)
+        parts = result.boxes
+        obb = False
+    return boxes, polygons, parts.cls.cpu().numpy().astype(int), parts.conf.cpu().numpy().astype(np.float64), obb
+
+
+def _inner_margins(origins, tile_shapes, image_shape, margin):
+    """타일마다 [왼, 위, 오른, 아래] 여백 (T,4). 이미지 경계에 붙은 변은 잘리지 않으므로 0이다."""
+    image_h, image_w = image_shape
+    x0, y0 = origins[:, 0], origins[:, 1]
+    tile_h, tile_w = tile_shapes[:, 0], tile_shapes[:, 1]
+    return margin * np.stack([x0 > 0, y0 > 0, x0 + tile_w < image_w, y0 + tile_h < image_h], axis=1)
+
+
+def _touches_inner_edge(polygons, tile_shape, margins):
+    """타일 좌표계 polygon이 (이미지 경계가 아닌) 타일 안쪽 경계에 닿았는지 (N,)"""
+    tile_h, tile_w = tile_shape
+    left, top, right, bottom = margins
+    x_min, y_min, x_max, y_max = polygon_bounds(polygons).T
+    return ((x_min <= left) & (left > 0)) | ((y_min <= top) & (top > 0)) | \
+        ((x_max >= tile_w - right) & (right > 0)) | ((y_max >= tile_h - bottom) & (bottom > 0))
+
+
+def _seen_whole_elsewhere(polygons, tile_idx, origins, tile_shapes, margins):
+    """
+    원본 좌표 잘린 검출 (N,4,2)이 자기 타일(tile_idx)이 아닌 다른 타일의 안쪽 경계에 닿지 않고
+    온전히 들어가는지 (N,). 그런 타일은 같은 부품을 이 조각보다 넓게 (겹침보다 작으면 온전히) 본다.
+    """
+    bounds = polygon_bounds(polygons)                                                # (N,4)
+    # 여백이 있는 변은 여백에 닿기만 해도 잘린 것이므로 여백보다 조금이라도 안쪽이어야 한다
+    strict = np.where(margins > 0, 1e-9, 0.0)
+    lo = origins + margins[:, :2] + strict[:, :2]                                    # (T,2)
+    hi = origins + tile_shapes[:, ::-1] - margins[:, 2:] - strict[:, 2:]             # (T,2)
+    inside = np.all(bounds[:, None, :2] >= lo[None], axis=2) & np.all(bounds[:, None, 2:] <= hi[None], axis=2)
+    inside[np.arange(len(polygons)), tile_idx] = False
+    return inside.any(axis=1)
+
+
+def _covered(fragments, polygons, cover):
+    """잘린 조각 (F,4,2) 면적의 cover 이상을 polygons (P,4,2) 중 하나가 덮는지 (F,)"""
+    covered = np.zeros(len(fragments), dtype=bool)
+    if len(fragments) == 0 or len(polygons) == 0:
+        return covered
+    i, j = overlapping_pairs(polygon_bounds(np.concatenate([fragments, polygons])))
+    # i < j 이므로 조각(앞쪽 F개)과 전체 이미지 검출(뒤쪽) 쌍만 남긴다
+    pair = (i < len(fragments)) & (j >= len(fragments))
+    i, j = i[pair], j[pair] - len(fragments)
+    inter = intersection_area(fragments[i], polygons[j])
+    covered[i[inter >= cover * polygon_area(fragments)[i]]] = True
+    return covered
+
+
+def _shift(boxes, origin, obb):
+    """타일 좌표 박스 → 원본 좌표"""
+    boxes = boxes.copy()
+    if obb:
+        boxes[:, :2] += origin
+    else:
+        boxes[:, :4] += np.tile(origin, 2)
+    return boxes
+
+
+def predict_tiled(model, image, tile_size=TILE_SIZE, overlap=TILE_OVERLAP, batch_size=TILE_BATCH_SIZE,
+                  merge_iou=MERGE_IOU, edge_margin=EDGE_MARGIN, full_image_pass=FULL_IMAGE_PASS,
+                  fragment_cover=FRAGMENT_COVER, **predict_kwargs):
+    """
+    원본 이미지 하나를 타일 추론해 원본 좌표 검출을 반환한다.
+    full_image_pass이면 이미지 전체도 tile_size로 한 번 추론해 (같은 배치로) 겹침보다 큰 부품을 잡는다.
+    반환: {"boxes": rbox (N,5) 또는 xyxy (N,4), "cls": (N,), "conf": (N,), "obb": bool}
+    """
+    tiles, origins = make_tiles(image, tile_size, overlap)
+    tile_shapes = np.asarray([tile.shape[:2] for tile in tiles], dtype=np.float64).reshape(-1, 2)
+    margins = _inner_margins(origins, tile_shapes, image.shape[:2], edge_margin)
+    # 마지막 항목은 이미지 전체 (ultralytics가 원본 좌표로 돌려준다)
+    sources = tiles + [image] if full_image_pass and len(tiles) > 1 else tiles
+
+    all_boxes, all_polygons, all_cls, all_conf, all_tile, all_cut = [], [], [], [], [], []
+    obb = False
+    for start in range(0, len(sources), batch_size):
+        results = model.predict(sources[start:start + batch_size], imgsz=tile_size, verbose=False, save=False,
+                                **predict_kwargs)
+        for k, result in enumerate(results):
+            t = start + k
+            boxes, polygons, cls, conf, obb = _result_arrays(result)
+            if t < len(tiles):
+                cut = _touches_inner_edge(polygons, tiles[t].shape[:2], margins[t])
+                # 타일 좌표 → 원본 좌표
+                polygons = polygons + origins[t]
+                boxes = _shift(boxes, origins[t], obb)
+            else:
+                cut = np.zeros(len(conf), dtype=bool)
+                t = -1
+            all_boxes.append(boxes)
+            all_polygons.append(polygons)
+            all_cls.append(cls)
+            all_conf.append(conf)
+            all_tile.append(np.full(len(conf), t))
+            all_cut.append(cut)
+
+    width = 5 if obb else 4
+    boxes = np.concatenate(all_boxes) if all_boxes else np.zeros((0, width))
+    polygons = np.concatenate(all_polygons) if all_polygons else np.zeros((0, 4, 2))
+    cls = np.concatenate(all_cls) if all_cls else np.zeros(0, dtype=int)
+    conf = np.concatenate(all_conf) if all_conf else np.zeros(0)
+    tile_idx = np.concatenate(all_tile) if all_tile else np.zeros(0, dtype=int)
+    cut = np.concatenate(all_cut) if all_cut else np.zeros(0, dtype=bool)
+
+    # 잘린 검출: 다른 타일이 온전히 보거나, 전체 이미지 검출이 덮으면 버리고 나머지는 NMS에 맡긴다
+    drop = np.zeros(len(conf), dtype=bool)
+    cut_idx = np.flatnonzero(cut)
+    if len(cut_idx):
+        whole = _seen_whole_elsewhere(polygons[cut_idx], tile_idx[cut_idx], origins, tile_shapes, margins)
+        drop[cut_idx[whole]] = True
+        rest = cut_idx[~whole]
+        drop[rest[_covered(polygons[rest], polygons[tile_idx == -1], fragment_cover)]] = True
+    keep = np.flatnonzero(~drop)
+
+    keep = keep[nms_polygons(polygons[keep], conf[keep], merge_iou, classes=cls[keep])]
+    return {"boxes": boxes[keep], "cls": cls[keep], "conf": conf[keep], "obb": obb}
@@ -0,0 +1,111 @@
+# scripts/yolo_labels.py
+# labelme shapes → YOLO 라벨(txt) 변환 공통 함수
+# 파일 하나의 shape를 한 번에 NumPy 배열로 모아 정규화/AABB·OBB 변환을 일괄 처리하고,
+# 라벨 파일은 문자열 하나로 만들어 한 번에 쓴다. 결과는 shape별 f"{x:.6f}" 출력과 동일하다.
+import numpy as np
+
+
+def collect_shapes(shapes, class_names, source=""):
+    """
+    shapes에서 알려진 라벨의 2점/4점 도형만 골라 (class_ids (N,), points (N,4,2) 픽셀 좌표)로 반환한다.
+    2점(rectangle)은 좌상단 → 우상단 → 우하단 → 좌하단 4점으로 펼친다.
+    source는 경고 메시지에 표시할 원본 JSON 경로이다.
+    """
+    class_ids = []
+    npoints = []
+    rect_points = []
+    quad_points = []
+    for shape in shapes:
+        label = shape.get('label', 'unknown')
+        points = shape.get('points', [])
+
+        if label not in class_names:
+            print(f"⚠️ 알 수 없는 라벨: '{label}' → {source}, 스킵")
+            continue
+        if len(points) == 4:  # 꼭짓점 4개 → OBB
+            quad_points.append(points)
+        elif len(points) == 2:  # 두 점만 있는 경우 → 사각형
+            rect_points.append(points)
+        else:
+            print(f"❌ 지원하지 않는 도형 (points = {len(points)}개): {source}, 스킵")
+            continue
+        class_ids.append(class_names[label])
+        npoints.append(len(points))
+
+    class_ids = np.asarray(class_ids, dtype=np.int64)
+    npoints = np.asarray(npoints, dtype=np.int64)
+    quads = np.empty((len(class_ids), 4, 2), dtype=np.float64)
+    if quad_points:
+        quads[npoints == 4] = np.asarray(quad_points, dtype=np.float64)
+    if rect_points:
+        rects = np.asarray(rect_points, dtype=np.float64)
+        x1, y1 = rects[:, 0, 0], rects[:, 0, 1]
+        x2, y2 = rects[:, 1, 0], rects[:, 1, 1]
+        quads[npoints == 2] = np.stack([
+            np.stack([x1, y1], axis=1),  # 좌상단
+            np.stack([x2, y1], axis=1),  # 우상단
+            np.stack([x2, y2], axis=1),  # 우하단
+            np.stack([x1, y2], axis=1),  # 좌하단
+        ], axis=1)
+    return class_ids, npoints, quads
+
+
+def format_label_rows(class_ids, values):
+    """(N,) 클래스와 (N,K) 좌표를 'class v1 ... vK' 줄로 만든 문자열 하나로 반환한다."""
+    if len(class_ids) == 0:
+        return ""
+    row_fmt = "%d" + " %.6f" * values.shape[1] + "\n"
+    rows = np.column_stack([class_ids.astype(np.float64), values])
+    return (row_fmt * len(rows)) % tuple(rows.ravel().tolist())
+
+
+def obb_label_text(shapes, class_names, image_width, image_height, source=""):
+    """YOLO OBB 라벨(class x1 y1 x2 y2 x3 y3 x4 y4, 0..1 정규화) 파일 내용"""
+    class_ids, _, quads = collect_shapes(shapes, class_names, source)
+    quads[..., 0] /= image_width
+    quads[..., 1] /= image_height
+    return format_label_rows(class_ids, quads.reshape(len(quads), 8))
+
+
+def aabb_label_text(shapes, class_names, original_size, target_size, source=""):
+    """
+    YOLO 라벨(class x_center y_center width height, 0..1 정규화) 파일 내용.
+    2점은 그대로, 4점은 축 방향 외접 사각형(AABB)으로 바꾼 뒤 원본 → 목표 해상도로 변환한다.
+    """
+    class_ids, npoints, quads = collect_shapes(shapes, class_names, source)
+    original_width, original_height = original_size
+    target_width, target_height = target_size
+
+    # 2점은 입력 순서 그대로 (x1, y1, x2, y2), 4점은 (min, min, max, max)
+    boxes = np.concatenate([quads[:, 0], quads[:, 2]], axis=1)
+    is_quad = npoints == 4
+    boxes[is_quad, :2] = quads[is_quad].min(axis=1)
+    boxes[is_quad, 2:] = quads[is_quad].max(axis=1)
+
+    # 해상도 조정 (원본 → 목표 기준 변환)
+    boxes[:, [0, 2]] = (boxes[:, [0, 2]] / original_width) * target_width
+    boxes[:, [1, 3]] = (boxes[:, [1, 3]] / original_height) * target_height
+    x1, y1, x2, y2 = boxes.T
+
+    # 중심 좌표 및 너비/높이 계산 (YOLO 형식으로 변환)
+    values = np.stack([
+        ((x1 + x2) / 2) / target_width,
+        ((y1 + y2) / 2) / target_height,
+        np.abs(x2 - x1) / target_width,
+        np.abs(y2 - y1) / target_height,
+    ], axis=1)
+    return format_label_rows(class_ids, values)
+
+
+def write_obb_labels(label_path, shapes, class_names, image_width, image_height, source=""):
+    """obb_label_text 결과를 라벨 파일 하나로 저장한다."""
+    text = obb_label_text(shapes, class_names, image_width, image_height, source)
+    with open(label_path, 'w', encoding='utf-8') as out_f:
+        out_f.write(text)
+
+
+def write_aabb_labels(label_path, shapes, class_names, original_size, target_size, source=""):
+    """aabb_label_text 결과를 라벨 파일 하나로 저장한다."""
+    text = aabb_label_text(shapes, class_names, original_size, target_size, source)
+    with open(label_path, 'w', encoding='utf-8') as out_f:
+        out_f.write(text)
@@ -0,0 +1,72 @@
+# tests/test_dataset_split.py
+# dataset_split 회귀 테스트
+# 분할 파라미터(seed)를 바꿔 다시 나눠도 이전 분할의 파일이 남아 train과 val에 동시에 들어가면 안 된다.
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+from dataset_manifest import DatasetManifest  # noqa: E402
+from dataset_split import incremental_split, train_val_split, write_split  # noqa: E402
+
+PAIRS = 20
+TRAIN_RATIO = 0.8
+CLASS_NAMES = ["component"]
+
+
+@pytest.fixture
+def source(tmp_path):
+    images_dir, labels_dir = tmp_path / "images", tmp_path / "labels"
+    images_dir.mkdir()
+    labels_dir.mkdir()
+    names = [f"board_{i:02d}" for i in range(PAIRS)]
+    for name in names:
+        (images_dir / (name + ".jpg")).write_bytes(name.encode())
+        (labels_dir / (name + ".txt")).write_text("0 0.5 0.5 0.1 0.1\n")
+    return str(images_dir), str(labels_dir), names
+
+
+def _placed(output_dir, split):
+    images = {os.path.splitext(f)[0] for f in os.listdir(os.path.join(output_dir, split, "images"))}
+    labels = {os.path.splitext(f)[0] for f in os.listdir(os.path.join(output_dir, split, "labels"))}
+    assert images == labels
+    return images
+
+
+def _split(names, images_dir, labels_dir, output_dir, seed, mode, incremental):
+    # 0_for_obb/1_6_split.py와 같은 순서 (매니페스트 파라미터가 바뀌면 배정을 처음부터 다시 한다)
+    if not incremental:
+        train_files, val_files = train_val_split(names, TRAIN_RATIO, seed)
+        write_split(train_files, val_files, images_dir, labels_dir, output_dir, mode, CLASS_NAMES)
+        return train_files, val_files
+    manifest = DatasetManifest(os.path.join(output_dir, "split.manifest.json"),
+                               params={"TRAIN_RATIO": TRAIN_RATIO, "SEED": seed, "SPLIT_MODE": mode})
+    train_files, val_files, _ = incremental_split(names, manifest, TRAIN_RATIO, seed)
+    manifest.prune(names)
+    write_split(train_files, val_files, images_dir, labels_dir, output_dir, mode, CLASS_NAMES, manifest=manifest)
+    manifest.save()
+    return train_files, val_files
+
+
+@pytest.mark.parametrize("incremental", [True, False], ids=["manifest", "plain"])
+@pytest.mark.parametrize("mode", ["copy", "hardlink", "symlink"])
+def test_seed_change_keeps_splits_disjoint(tmp_path, source, mode, incremental):
+    images_dir, labels_dir, names = source
+    output_dir = str(tmp_path / "out")
+    for seed in (0, 1):
+        train_files, val_files = _split(names, images_dir, labels_dir, output_dir, seed, mode, incremental)
+        train, val = _placed(output_dir, "train"), _placed(output_dir, "val")
+        assert train & val == set()
+        assert (train, val) == (set(train_files), set(val_files))
+        assert train | val == set(names)
+
+
+def test_incremental_keeps_assignment(tmp_path, source):
+    images_dir, labels_dir, names = source
+    output_dir = str(tmp_path / "out")
+    first = _split(names[:-4], images_dir, labels_dir, output_dir, 0, "copy", True)
+    second = _split(names, images_dir, labels_dir, output_dir, 0, "copy", True)
+    # 이미 배정된 파일은 같은 분할에 남고 새 파일만 나뉜다
+    assert set(first[0]) <= set(second[0]) and set(first[1]) <= set(second[1])
+    assert _placed(output_dir, "train") & _placed(output_dir, "val") == set()
@@ -0,0 +1,152 @@
+# tests/test_fast_coco_eval.py
+# fast_coco_eval / eval_cache 가 pycocotools COCOeval과 같은 stats를 내는지 확인하는 회귀 테스트
+# 고정 seed로 만든 합성 GT/예측(COCO dict)을 bbox, OBB 두 방식과 여러 maxDets(100 초과 포함)로 평가해 비교한다.
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+from fast_coco_eval import fast_coco_evaluation, MAX_DETS, DENSE_MAX_DETS, IOU_THRESHOLDS  # noqa: E402
+from eval_cache import cached_coco_evaluation  # noqa: E402
+
+pytest.importorskip("pycocotools")
+from pycocotools.coco import COCO  # noqa: E402
+from pycocotools.cocoeval import COCOeval  # noqa: E402
+from obb_eval import OBBCOCOeval, load_obb_results  # noqa: E402
+
+SEED = 0
+IMAGE_SIZE = 800
+# 이미지마다 GT 개수 (maxDets 100을 넘는 이미지 포함)
+GT_COUNTS = (0, 3, 40, 150, 260)
+ATOL = 1e-9
+
+MAX_DETS_CASES = [MAX_DETS, (10, 50, 200), DENSE_MAX_DETS]
+
+
+def _random_boxes(rng, n):
+    """small/medium/large가 섞인 [x, y, w, h]"""
+    sides = rng.choice([12.0, 45.0, 140.0], size=(n, 1)) * rng.uniform(0.6, 1.4, size=(n, 2))
+    xy = rng.uniform(0, IMAGE_SIZE - sides)
+    return np.hstack([xy, sides])
+
+
+def _rotated_polygon(box, angle):
+    x, y, w, h = box
+    cx, cy = x + w / 2, y + h / 2
+    dx = np.array([-w, w, w, -w]) / 2
+    dy = np.array([-h, -h, h, h]) / 2
+    cos, sin = np.cos(angle), np.sin(angle)
+    return np.stack([cx + dx * cos - dy * sin, cy + dx * sin + dy * cos], axis=1)
+
+
+def _annotation(box, obb, angle):
+    if not obb:
+        return {"bbox": [float(v) for v in box]}
+    polygon = _rotated_polygon(box, angle)
+    (x1, y1), (x2, y2) = polygon.min(axis=0), polygon.max(axis=0)
+    return {"bbox": [float(x1), float(y1), float(x2 - x1), float(y2 - y1)],
+            "obb": [float(v) for v in polygon.ravel()]}
+
+
+def _polygon_area(points):
+    x, y = points[:, 0], points[:, 1]
+    return float(0.5 * abs(np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y)))
+
+
+def make_dataset(obb, seed=SEED):
+    """합성 GT(COCO dict)와 예측 목록. 예측은 GT를 흔든 것 + 놓친 GT + 오검출로 만든다."""
+    rng = np.random.default_rng(seed)
+    images, annotations, results = [], [], []
+    for image_id, count in enumerate(GT_COUNTS, 1):
+        images.append({"id": image_id, "width": IMAGE_SIZE, "height": IMAGE_SIZE, "file_name": f"{image_id}.jpg"})
+        boxes = _random_boxes(rng, count)
+        angles = rng.uniform(-0.6, 0.6, size=count)
+        for box, angle in zip(boxes, angles):
+            ann = _annotation(box, obb, angle)
+            area = _polygon_area(_rotated_polygon(box, angle)) if obb else float(box[2] * box[3])
+            ann.update({"id": len(annotations) + 1, "image_id": image_id, "category_id": 1,
+                        "area": area, "iscrowd": 0})
+            annotations.append(ann)
+
+        detected = boxes[rng.random(count) < 0.85]
+        jitter = rng.normal(0, 0.08, size=detected.shape) * detected[:, [2, 3, 2, 3]]
+        dt_boxes = np.vstack([detected + jitter, _random_boxes(rng, count // 4 + 2)])
+        dt_boxes[:, 2:] = np.maximum(dt_boxes[:, 2:], 1.0)
+        dt_angles = rng.uniform(-0.6, 0.6, size=len(dt_boxes))
+        for box, angle in zip(dt_boxes, dt_angles):
+            ann = _annotation(box, obb, angle)
+            ann.update({"image_id": image_id, "category_id": 1, "score": float(rng.random())})
+            results.append(ann)
+
+    gt = {"images": images, "annotations": annotations, "categories": [{"id": 1, "name": "component"}]}
+    return gt, results
+
+
+def pycocotools_stats(gt, results, max_dets, obb):
+    """
+    COCOeval stats. COCOeval은 stats[0]을 maxDets=100으로 고정하므로
+    fast_coco_eval과 같이 maxDets[2] 기준 AP@[.5:.95]를 precision에서 다시 계산해 넣는다.
+    """
+    coco_gt = COCO()
+    coco_gt.dataset = gt
+    coco_gt.createIndex()
+    if obb:
+        coco_eval = OBBCOCOeval(coco_gt, load_obb_results(coco_gt, results))
+    else:
+        coco_eval = COCOeval(coco_gt, coco_gt.loadRes(results), "bbox")
+    coco_eval.params.iouThrs = IOU_THRESHOLDS
+    coco_eval.params.maxDets = list(max_dets)
+    coco_eval.params.useCats = 0
+    coco_eval.evaluate()
+    coco_eval.accumulate()
+    coco_eval.summarize()
+
+    stats = np.array(coco_eval.stats)
+    precision = coco_eval.eval["precision"][:, :, :, 0, 2]
+    stats[0] = np.mean(precision[precision > -1])
+    return stats
+
+
+@pytest.mark.parametrize("obb", [False, True], ids=["bbox", "obb"])
+@pytest.mark.parametrize("max_dets", MAX_DETS_CASES, ids=lambda m: "-".join(map(str, m)))
+def test_matches_pycocotools(obb, max_dets):
+    gt, results = make_dataset(obb)
+    expected = pycocotools_stats(gt, results, max_dets, obb)
+    stats = fast_coco_evaluation(gt, results, max_dets, num_workers=1, obb=obb, verbose=False)
+    np.testing.assert_allclose(stats, expected, rtol=0, atol=ATOL)
+
+
+@pytest.mark.parametrize("obb", [False, True], ids=["bbox", "obb"])
+def test_parallel_matches_serial(obb):
+    gt, results = make_dataset(obb)
+    serial = fast_coco_evaluation(gt, results, DENSE_MAX_DETS, num_workers=1, obb=obb, verbose=False)
+    parallel = fast_coco_evaluation(gt, results, DENSE_MAX_DETS, num_workers=2, obb=obb, verbose=False)
+    np.testing.assert_array_equal(serial, parallel)
+
+
+@pytest.mark.parametrize("obb", [False, True], ids=["bbox", "obb"])
+@pytest.mark.parametrize("max_dets", [MAX_DETS, DENSE_MAX_DETS], ids=lambda m: "-".join(map(str, m)))
+def test_cached_evaluation_matches(tmp_path, obb, max_dets):
+    gt, results = make_dataset(obb)
+    expected = pycocotools_stats(gt, results, max_dets, obb)
+    cache_dir = str(tmp_path / "cache")
+    # 첫 실행은 캐시를 채우고, 두 번째 실행은 캐시에서만 읽는다
+    first = cached_coco_evaluation(gt, results, cache_dir, max_dets, num_workers=1, obb=obb, verbose=False)
+    second = cached_coco_evaluation(gt, results, cache_dir, max_dets, num_workers=1, obb=obb, verbose=False)
+    assert os.listdir(cache_dir)
+    np.testing.assert_allclose(first, expected, rtol=0, atol=ATOL)
+    np.testing.assert_allclose(second, expected, rtol=0, atol=ATOL)
+
+
+def test_cache_is_pruned_to_current_predictions(tmp_path):
+    gt, results = make_dataset(obb=False)
+    cache_dir = str(tmp_path / "cache")
+    for seed in range(3):
+        # 예측 점수만 바꿔 다시 평가해도 캐시는 이번 평가의 이미지 수만큼만 남는다
+        rng = np.random.default_rng(seed)
+        rescored = [dict(ann, score=float(rng.random())) for ann in results]
+        stats = cached_coco_evaluation(gt, rescored, cache_dir, MAX_DETS, num_workers=1, verbose=False)
+        assert len(os.listdir(cache_dir)) == len(GT_COUNTS)
+        np.testing.assert_allclose(stats, pycocotools_stats(gt, rescored, MAX_DETS, obb=False), rtol=0, atol=ATOL)
@@ -0,0 +1,72 @@
+# tests/test_image_verifier.py
+# image_verifier.check_image 회귀 테스트
+# EOI/IEND 뒤에 패딩이 붙은 정상 파일은 통과하고, 끝이 잘린 파일은 두 검사 수준 모두에서 실패해야 한다.
+import io
+import os
+import sys
+
+import numpy as np
+import pytest
+from PIL import Image
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+from image_verifier import check_image, verify_images, TAIL_WINDOW, VERIFY_LEVELS  # noqa: E402
+
+SEED = 0
+IMAGE_SIZE = 64
+PADDING = b"\x00" * 16
+
+
+def _encoded(image_format):
+    rng = np.random.default_rng(SEED)
+    pixels = rng.integers(0, 256, size=(IMAGE_SIZE, IMAGE_SIZE, 3), dtype=np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+def _write(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+@pytest.mark.parametrize("level", VERIFY_LEVELS)
+@pytest.mark.parametrize("image_format, name", [("JPEG", "image.jpg"), ("PNG", "image.png")], ids=["jpeg", "png"])
+def test_trailing_padding_passes(tmp_path, level, image_format, name):
+    path = _write(tmp_path, name, _encoded(image_format) + PADDING)
+    assert check_image(path, level) is None
+
+
+@pytest.mark.parametrize("level", VERIFY_LEVELS)
+@pytest.mark.parametrize("image_format, name", [("JPEG", "image.jpg"), ("PNG", "image.png")], ids=["jpeg", "png"])
+def test_truncated_fails(tmp_path, level, image_format, name):
+    data = _encoded(image_format)
+    path = _write(tmp_path, name, data[:len(data) // 2])
+    assert check_image(path, level) is not None
+
+
+def test_cached_verdicts(tmp_path):
+    good = _write(tmp_path, "good.jpg", _encoded("JPEG") + PADDING)
+    data = _encoded("JPEG")
+    bad = _write(tmp_path, "bad.jpg", data[:len(data) // 2])
+    cache_path = str(tmp_path / "images.verify.json")
+
+    first = verify_images([good, bad], "header", cache_path, num_workers=1)
+    second = verify_images([good, bad], "header", cache_path, num_workers=1)
+    assert (first["checked"], second["checked"], second["cached"]) == (2, 0, 2)
+    assert [item["path"] for item in second["corrupt"]] == [os.path.abspath(bad)]
+
+
+def test_header_error_is_rechecked_at_full(tmp_path):
+    # EOI 뒤에 TAIL_WINDOW보다 긴 trailer가 붙으면 header는 실패하지만 디코딩은 정상이다
+    path = _write(tmp_path, "trailer.jpg", _encoded("JPEG") + b"\x00" * (2 * TAIL_WINDOW))
+    cache_path = str(tmp_path / "images.verify.json")
+
+    header = verify_images([path], "header", cache_path, num_workers=1)
+    full = verify_images([path], "full", cache_path, num_workers=1)
+    again = verify_images([path], "header", cache_path, num_workers=1)
+    assert len(header["corrupt"]) == 1
+    assert (full["checked"], full["corrupt"]) == (1, [])
+    # "full"로 통과한 판정은 header 요청에서도 재사용한다
+    assert (again["cached"], again["corrupt"]) == (1, [])